@@ -45,6 +45,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "fuel_stops.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -139,5 +140,74 @@ CACHES = {
     }
 }
 
+# Fuel stop lookups: "orm" queries PostGIS per refuel, "memory" answers from a
+# per-worker spatial index built from all FuelStop rows, "corridor" fetches
+# every stop near the route in one query and plans in memory, and "grid" reads
+# the precomputed cheapest stops per geohash cell (see build_fuel_stop_grid).
+FUEL_STOP_LOOKUP_BACKEND = config("FUEL_STOP_LOOKUP_BACKEND", default="orm")
+FUEL_STOP_INDEX_CELL_DEGREES = config(
+    "FUEL_STOP_INDEX_CELL_DEGREES", default=1.0, cast=float
+)
+ROUTE_CORRIDOR_WIDTH_MILES = config(
+    "ROUTE_CORRIDOR_WIDTH_MILES", default=10, cast=float
+)
+
+# Batch trip planning: maximum trips per request and concurrent ORS fetches.
+FUEL_STOPS_BATCH_MAX_TRIPS = config("FUEL_STOPS_BATCH_MAX_TRIPS", default=500, cast=int)
+FUEL_STOPS_BATCH_CONCURRENCY = config(
+    "FUEL_STOPS_BATCH_CONCURRENCY", default=8, cast=int
+)
+
+# OpenRouteService HTTP client: keep-alive connections per worker process.
+ORS_BASE_URL = config("ORS_BASE_URL", default="https://api.openrouteservice.org")
+ORS_TIMEOUT_SECONDS = config("ORS_TIMEOUT_SECONDS", default=60, cast=int)
+ORS_HTTP_POOL_SIZE = config("ORS_HTTP_POOL_SIZE", default=20, cast=int)
+
+# Route cache shared by every worker on the host and kept across restarts.
+# Compressed entries are evicted least recently used first once MAX_BYTES is
+# exceeded. Set the backend to fuel_stops.utils.route_cache.DjangoRouteCache
+# with LOCATION naming a CACHES alias to share routes through e.g. Redis.
+# LOCATION defaults per backend: data/route_cache.sqlite3 for SQLite and the
+# "default" alias for Django caches.
+ROUTE_CACHE = {
+    "BACKEND": config(
+        "ROUTE_CACHE_BACKEND",
+        default="fuel_stops.utils.route_cache.SQLiteRouteCache",
+    ),
+    "LOCATION": config("ROUTE_CACHE_LOCATION", default=""),
+    "MAX_BYTES": config("ROUTE_CACHE_MAX_BYTES", default=256 * 1024 * 1024, cast=int),
+    # Seconds before a hit refreshes an entry's LRU time, and between
+    # flushes of each process's hit/miss counters to the shared file.
+    "TOUCH_SECONDS": config("ROUTE_CACHE_TOUCH_SECONDS", default=60, cast=float),
+    "STATS_FLUSH_SECONDS": config(
+        "ROUTE_CACHE_STATS_FLUSH_SECONDS", default=10, cast=float
+    ),
+}
+
+# Opt-in: reuse a cached route whose endpoints are both within this many
+# meters of the requested ones, splicing straight stubs onto its ends.
+ROUTE_CACHE_SNAP_METERS = config("ROUTE_CACHE_SNAP_METERS", default=0, cast=float)
+
+# Opt-in: render API responses with fuel_stops.renderers.FastJSONRenderer
+# (orjson when installed). FAST_JSON_DECIMAL_PLACES rounds prices and costs
+# to that many places; leave it empty to keep full precision.
+FAST_JSON_RENDERER = config("FAST_JSON_RENDERER", default=False, cast=bool)
+FAST_JSON_DECIMAL_PLACES = config(
+    "FAST_JSON_DECIMAL_PLACES",
+    default="",
+    cast=lambda value: int(value) if value not in (None, "") else None,
+)
+
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        (
+            "fuel_stops.renderers.FastJSONRenderer"
+            if FAST_JSON_RENDERER
+            else "rest_framework.renderers.JSONRenderer"
+        ),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ]
+}
+
 GDAL_LIBRARY_PATH = "/opt/homebrew/Cellar/gdal/3.11.0_2/lib/libgdal.dylib"
 GEOS_LIBRARY_PATH = "/opt/homebrew/Cellar/geos/3.13.1/lib/libgeos_c.dylib"
@@ -17,7 +17,10 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import include, path
 
+from fuel_stops.views import metrics
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("fuel_stops.urls")),
+    path("metrics", metrics, name="metrics"),
 ]
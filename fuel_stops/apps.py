@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FuelStopsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "fuel_stops"
+
+    def ready(self):
+        from fuel_stops import signals  # noqa: F401
@@ -1,3 +1,28 @@
 VEHICLE_RANGE_MILES = 500
 MPG = 10
 MILES_TO_METERS = 1609.34
+EARTH_RADIUS_METERS = 6371008.8
+
+FUEL_STOP_LOOKUP_BACKENDS = ("orm", "memory", "corridor", "grid")
+OPTIMIZER_MODES = ("greedy", "optimal")
+
+ROUTE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Vehicle profiles allowed in one what-if sweep request.
+MAX_SWEEP_PROFILES = 500
+
+# Intermediate stops allowed between a trip's start and end.
+MAX_TRIP_WAYPOINTS = 25
+
+GEOMETRY_FORMATS = ("geojson", "simplified", "polyline")
+POLYLINE_PRECISIONS = (5, 6)
+DEFAULT_SIMPLIFY_TOLERANCE_METERS = 25
+
+# Precomputed cheapest-stop grid: geohash precisions built, stops kept per
+# cell, and the most cells a single lookup may read.
+FUEL_STOP_GRID_RESOLUTIONS = (2, 3, 4)
+FUEL_STOP_GRID_TOP_K = 16
+FUEL_STOP_GRID_MAX_CELLS = 36
+
+# Route coordinates per route_geometry line of an NDJSON plan stream.
+NDJSON_GEOMETRY_CHUNK_POINTS = 1000
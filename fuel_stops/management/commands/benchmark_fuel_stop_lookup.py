@@ -0,0 +1,109 @@
+import itertools
+import logging
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from fuel_stops.constants import MILES_TO_METERS
+from fuel_stops.models import FuelStop
+from fuel_stops.services.fuel_stop_grid_service import FuelStopGridService
+from fuel_stops.services.route_optimizer_service import RouteOptimizerService
+from fuel_stops.utils.benchmarking import measure
+from fuel_stops.utils.spatial_index import FuelStopSpatialIndex
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Benchmark cheapest-fuel-stop lookups for each lookup backend."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=200,
+            help="Number of lookups per backend.",
+        )
+        parser.add_argument(
+            "--radius-miles",
+            type=float,
+            default=100,
+            help="Search radius for each lookup.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=42,
+            help="Random seed for the sampled query points.",
+        )
+
+    def handle(self, *args, **options):
+        """Times ORM, in-memory and grid lookups over the same query points."""
+        iterations = options["iterations"]
+        within = options["radius_miles"] * MILES_TO_METERS
+        rng = random.Random(options["seed"])
+
+        coordinates = list(
+            FuelStop.objects.values_list("point", flat=True)[: iterations * 10]
+        )
+        if not coordinates:
+            raise CommandError("No fuel stops found. Import fuel stops first.")
+
+        points = []
+        for _ in range(iterations):
+            anchor = rng.choice(coordinates)
+            points.append(
+                (anchor.x + rng.uniform(-1, 1), anchor.y + rng.uniform(-1, 1))
+            )
+
+        started = time.perf_counter()
+        index = FuelStopSpatialIndex.from_database()
+        build_ms = (time.perf_counter() - started) * 1000
+        self.stdout.write(
+            f"Built in-memory index of {index.size} stops in {build_ms:.1f} ms"
+        )
+
+        grid = FuelStopGridService()
+        if not grid.is_current():
+            started = time.perf_counter()
+            grid.build()
+            build_ms = (time.perf_counter() - started) * 1000
+            self.stdout.write(f"Built fuel stop grid in {build_ms:.1f} ms")
+
+        results = {}
+        for backend in ("orm", "memory", "grid"):
+            optimizer = RouteOptimizerService(
+                start=points[0],
+                steps=[],
+                vehicle_range_miles=0,
+                mpg=1,
+                lookup_backend=backend,
+                spatial_index=index,
+            )
+            matches = [optimizer.find_nearest_fuel_stop(p, within) for p in points]
+            queue = itertools.cycle(points)
+            stats = measure(
+                lambda: optimizer.find_nearest_fuel_stop(next(queue), within),
+                iterations,
+            )
+            results[backend] = matches
+            self.stdout.write(
+                f"{backend:>8}: mean {stats['mean_ms']:.3f} ms, "
+                f"p50 {stats['p50_ms']:.3f} ms, p95 {stats['p95_ms']:.3f} ms, "
+                f"p99 {stats['p99_ms']:.3f} ms"
+            )
+
+        for backend in ("memory", "grid"):
+            mismatches = sum(
+                1
+                for orm_stop, other_stop in zip(results["orm"], results[backend])
+                if (orm_stop and orm_stop.retail_price)
+                != (other_stop and other_stop.retail_price)
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Compared {iterations} {backend} lookups with orm, "
+                    f"{mismatches} price mismatches."
+                )
+            )
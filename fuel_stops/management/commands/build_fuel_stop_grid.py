@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from fuel_stops.services.fuel_stop_grid_service import FuelStopGridService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the precomputed cheapest-fuel-stop grid used by the grid lookup."
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        counts = FuelStopGridService().build()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        for resolution, rows in counts.items():
+            self.stdout.write(f"Resolution {resolution}: {rows} ranked stops")
+        self.stdout.write(
+            self.style.SUCCESS(f"Built fuel stop grid in {elapsed_ms:.1f} ms.")
+        )
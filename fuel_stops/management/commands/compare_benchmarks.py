@@ -0,0 +1,58 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from fuel_stops.utils.benchmarking import compare_results, load_results
+
+
+class Command(BaseCommand):
+    help = "Compare two benchmark result files written by the benchmark suite."
+
+    def add_arguments(self, parser):
+        parser.add_argument("baseline", type=str, help="Reference results file.")
+        parser.add_argument("current", type=str, help="Results file to check.")
+        parser.add_argument(
+            "--metric",
+            choices=("mean_ms", "p50_ms", "p95_ms", "p99_ms"),
+            default="p95_ms",
+            help="Latency metric to compare.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Relative slowdown reported as a regression, 0.2 being 20%%.",
+        )
+
+    def handle(self, *args, **options):
+        """Prints the per-benchmark change and fails on regressions."""
+        try:
+            baseline = load_results(Path(options["baseline"]))
+            current = load_results(Path(options["current"]))
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f"Could not read benchmark results: {e}")
+
+        rows = compare_results(baseline, current, metric=options["metric"])
+        regressions = [row for row in rows if row["change"] > options["threshold"]]
+
+        for row in rows:
+            line = (
+                f"{row['name']}: {row['baseline_ms']:.3f} ms -> "
+                f"{row['current_ms']:.3f} ms ({row['change']:+.1%})"
+            )
+            if row in regressions:
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+
+        for name in sorted(baseline.keys() ^ current.keys()):
+            side = "baseline" if name in baseline else "current"
+            self.stdout.write(self.style.WARNING(f"{name}: only in {side} run"))
+
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} benchmarks regressed by more than "
+                f"{options['threshold']:.0%} on {options['metric']}."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Compared {len(rows)} benchmarks, no regressions.")
+        )
@@ -1,15 +1,26 @@
 import csv
 import logging
+import os
 import time
 from pathlib import Path
+from typing import Set
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
-from fuel_stops.utils.geocode_cache import GeocodeCache
-from fuel_stops.utils.geocoder import Geocoder
+from fuel_stops.utils.geocode_cache import open_geocode_cache
+from fuel_stops.utils.geocoder import ChainedGeocoder, Geocoder, OfflineGeocoder
 
 logger = logging.getLogger(__name__)
 
+GEOCODER_BACKENDS = ("offline", "online")
+
+# Uncached rows handed to the geocoder chain at once. Output and cache are
+# checkpointed after every chunk.
+GEOCODE_CHUNK_SIZE = 100
+
+# Seconds between progress reports.
+PROGRESS_INTERVAL_SECONDS = 10
+
 
 class Command(BaseCommand):
     help = (
@@ -27,22 +38,135 @@ class Command(BaseCommand):
         parser.add_argument(
             "--cache",
             type=str,
-            default="data/geocode_cache.json",
-            help="Path to geocode cache file",
+            default="data/geocode_cache.sqlite3",
+            help=(
+                "Path to geocode cache file; the suffix picks the backend "
+                "(.sqlite3, .sqlite or .db for SQLite, .json for JSON)"
+            ),
+        )
+        parser.add_argument(
+            "--backends",
+            type=str,
+            default="online",
+            help=(
+                "Comma-separated geocoder backends tried in order, "
+                "e.g. 'offline,online'."
+            ),
+        )
+        parser.add_argument(
+            "--gazetteer",
+            type=str,
+            help="City/state gazetteer CSV for the offline backend",
+        )
+        parser.add_argument(
+            "--exits",
+            type=str,
+            help="Interstate exit CSV for the offline backend",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Append to an existing output, skipping IDs already written",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Concurrent requests for the online backend",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=1.0,
+            help="Maximum online requests per second across all workers",
+        )
+
+    def _build_geocoder(self, kwargs) -> ChainedGeocoder:
+        """Builds the geocoder chain from the --backends option."""
+        names = [name.strip() for name in kwargs["backends"].split(",") if name]
+        unknown = set(names) - set(GEOCODER_BACKENDS)
+        if not names or unknown:
+            raise CommandError(
+                f"--backends must list one or more of: {', '.join(GEOCODER_BACKENDS)}"
+            )
+
+        backends = []
+        for name in names:
+            if name == "online":
+                backends.append(
+                    Geocoder(workers=kwargs["workers"], rate=kwargs["rate"])
+                )
+                continue
+            gazetteer, exits = kwargs.get("gazetteer"), kwargs.get("exits")
+            if not gazetteer and not exits:
+                raise CommandError(
+                    "The offline backend needs --gazetteer and/or --exits"
+                )
+            try:
+                backends.append(
+                    OfflineGeocoder(
+                        gazetteer_path=Path(gazetteer) if gazetteer else None,
+                        exits_path=Path(exits) if exits else None,
+                    )
+                )
+            except (OSError, ValueError) as e:
+                raise CommandError(str(e))
+        return ChainedGeocoder(backends)
+
+    def _read_checkpoint(self, output_path: Path) -> Set[str]:
+        """Returns the IDs already in an output file being resumed.
+
+        A trailing partial line left by an interrupted run is truncated.
+        """
+        with output_path.open("rb+") as f:
+            content = f.read()
+            end = content.rfind(b"\n") + 1
+            if end < len(content):
+                f.truncate(end)
+
+        with output_path.open(newline="", encoding="utf-8") as f:
+            return {row["OPIS Truckstop ID"].strip() for row in csv.DictReader(f)}
 
     def handle(self, *args, **kwargs):
         """Handles the geocoding of addresses from a CSV file."""
         input_path = Path(kwargs.get("input", "data/fuel-prices-for-be-assessment.csv"))
         output_path = Path(kwargs.get("output", "data/fuelstops_address_geocoded.csv"))
-        cache_path = Path(kwargs.get("cache", "data/geocode_cache.json"))
+        cache_path = Path(kwargs.get("cache", "data/geocode_cache.sqlite3"))
+        legacy_cache = cache_path.with_suffix(".json")
+        if (
+            cache_path.suffix != ".json"
+            and legacy_cache.exists()
+            and not cache_path.exists()
+        ):
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{legacy_cache} is not used; run migrate_geocode_cache "
+                    f"to move its entries into {cache_path}."
+                )
+            )
+
+        resuming = (
+            kwargs.get("resume", False)
+            and output_path.exists()
+            and output_path.stat().st_size > 0
+        )
+        seen_ids = self._read_checkpoint(output_path) if resuming else set()
+        if resuming:
+            self.stdout.write(f"Resuming: {len(seen_ids)} rows already written.")
+
+        with input_path.open(newline="", encoding="utf-8") as infile:
+            total_rows = sum(1 for _ in csv.DictReader(infile))
 
-        seen_ids = set()
-        cache = GeocodeCache(cache_path)
-        geocoder = Geocoder()
+        geocoder = self._build_geocoder(kwargs)
+        self.cached_count = 0
+        self.processed = 0
+        self.total_rows = total_rows
+        self.started = self.last_report = time.monotonic()
 
-        with input_path.open(newline="", encoding="utf-8") as infile, output_path.open(
-            "w", newline="", encoding="utf-8"
+        with open_geocode_cache(cache_path) as cache, input_path.open(
+            newline="", encoding="utf-8"
+        ) as infile, output_path.open(
+            "a" if resuming else "w", newline="", encoding="utf-8"
         ) as outfile:
             reader = csv.DictReader(infile)
             fieldnames = (
@@ -51,9 +175,13 @@ class Command(BaseCommand):
                 else []
             )
             writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-            writer.writeheader()
+            if not resuming:
+                writer.writeheader()
 
+            chunk = []
+            uncached = 0
             for row in reader:
+                self.processed += 1
                 truckstop_id = row["OPIS Truckstop ID"].strip()
                 if truckstop_id in seen_ids:
                     continue
@@ -62,20 +190,63 @@ class Command(BaseCommand):
                 cached = cache.get(truckstop_id)
                 if cached:
                     row["Latitude"], row["Longitude"] = cached
-                    writer.writerow(row)
-                    continue
-
-                truckstop_name = row["Truckstop Name"].strip()
-                coordinate = geocoder.fetch(truckstop_name)
-                if coordinate:
-                    lat, lon = coordinate
-                    cache.set(truckstop_id, lat, lon)
-                    row["Latitude"], row["Longitude"] = lat, lon
-                    writer.writerow(row)
-                    time.sleep(1)
+                    self.cached_count += 1
                 else:
-                    continue
+                    uncached += 1
+                chunk.append((truckstop_id, row, bool(cached)))
+
+                if uncached >= GEOCODE_CHUNK_SIZE:
+                    self._write_chunk(chunk, geocoder, cache, writer, outfile)
+                    chunk, uncached = [], 0
+
+            if chunk:
+                self._write_chunk(chunk, geocoder, cache, writer, outfile)
 
+        resolved = ", ".join(
+            f"{backend.name}={geocoder.resolved[backend.name]}"
+            for backend in geocoder.backends
+        )
+        self.stdout.write(
+            f"Rows from cache: {self.cached_count}. Resolved by {resolved}."
+        )
         self.stdout.write(
             self.style.SUCCESS(f"Geocoding complete. Output saved to: {output_path}")
         )
+
+    def _report_progress(self):
+        """Writes processed rows, throughput and ETA every few seconds."""
+        now = time.monotonic()
+        if now - self.last_report < PROGRESS_INTERVAL_SECONDS:
+            return
+        self.last_report = now
+        rate = self.processed / max(now - self.started, 1e-9)
+        eta = (self.total_rows - self.processed) / rate if rate else 0
+        self.stdout.write(
+            f"Processed {self.processed}/{self.total_rows} rows "
+            f"({rate:.1f} rows/s, ETA {eta:.0f}s)"
+        )
+
+    def _write_chunk(self, chunk, geocoder, cache, writer, outfile):
+        """Geocodes the uncached rows of a chunk and writes it in input order.
+
+        The output and cache are flushed afterwards, so a resumed run picks
+        up after the last completed chunk.
+        """
+        pending = [
+            (truckstop_id, row) for truckstop_id, row, cached in chunk if not cached
+        ]
+        coordinates = geocoder.geocode([row for _, row in pending])
+        for (truckstop_id, row), coordinate in zip(pending, coordinates):
+            if coordinate:
+                lat, lon = coordinate
+                cache.set(truckstop_id, lat, lon)
+                row["Latitude"], row["Longitude"] = lat, lon
+
+        for _, row, _ in chunk:
+            if row.get("Latitude") is not None:
+                writer.writerow(row)
+
+        outfile.flush()
+        os.fsync(outfile.fileno())
+        cache.flush()
+        self._report_progress()
@@ -3,12 +3,19 @@ from pathlib import Path
 
 from django.core.management.base import BaseCommand
 
+from fuel_stops.services.fuel_stop_grid_service import FuelStopGridService
 from fuel_stops.services.import_create_fuelstop_service import (
+    CopyImportFuelStopService,
     ImportCreateFuelStopService,
 )
 
 logger = logging.getLogger(__name__)
 
+IMPORT_METHODS = {
+    "orm": ImportCreateFuelStopService,
+    "copy": CopyImportFuelStopService,
+}
+
 
 class Command(BaseCommand):
     help = "Bulk import fuel stops from a geocoded CSV file."
@@ -20,6 +27,15 @@ class Command(BaseCommand):
             default="data/fuelstops_address_geocoded.csv",
             help="Path to the geocoded CSV file.",
         )
+        parser.add_argument(
+            "--method",
+            choices=sorted(IMPORT_METHODS),
+            default="orm",
+            help=(
+                "'orm' inserts batches through bulk_create; 'copy' streams the "
+                "file through PostgreSQL COPY and merges it in one statement."
+            ),
+        )
 
     def handle(self, *args, **options):
         """Handles the import of fuel stops from a geocoded CSV file."""
@@ -27,13 +43,16 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.SUCCESS(f"Reading CSV file: {file_path}"))
 
-        importer = ImportCreateFuelStopService(file_path)
+        importer = IMPORT_METHODS[options["method"]](file_path)
 
         try:
             count = importer.import_csv(self)
             self.stdout.write(
                 self.style.SUCCESS(f"Successfully imported {count} fuel stops.")
             )
+            if count:
+                FuelStopGridService().build()
+                self.stdout.write(self.style.SUCCESS("Rebuilt fuel stop grid."))
         except FileNotFoundError as e:
             self.stderr.write(self.style.ERROR(f"File error: {e}"))
         except ValueError as e:
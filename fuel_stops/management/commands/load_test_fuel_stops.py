@@ -0,0 +1,94 @@
+import itertools
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from fuel_stops.constants import OPTIMIZER_MODES
+from fuel_stops.services.load_test_service import LoadTestService, random_trips
+from fuel_stops.utils.benchmarking import write_results
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the /fuel-stops/ endpoint with concurrent random trips and "
+        "report throughput, latency percentiles and error rates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            type=str,
+            default="http://127.0.0.1:8000/api/fuel-stops/",
+            help="The /fuel-stops/ endpoint to load.",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Total requests to send."
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=10, help="Requests in flight at once."
+        )
+        parser.add_argument(
+            "--distinct-trips",
+            type=int,
+            default=50,
+            help=(
+                "Size of the trip pool cycled through. Fewer distinct trips "
+                "means more route and plan cache hits."
+            ),
+        )
+        parser.add_argument(
+            "--mode", choices=OPTIMIZER_MODES, default="greedy", help="Optimizer mode."
+        )
+        parser.add_argument(
+            "--timeout", type=float, default=60, help="Per-request timeout in seconds."
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--output",
+            type=str,
+            default=None,
+            help="Optional JSON file to write the summary to.",
+        )
+
+    def handle(self, *args, **options):
+        """Runs the load test and prints its summary."""
+        if (
+            min(options["requests"], options["concurrency"], options["distinct_trips"])
+            < 1
+        ):
+            raise CommandError(
+                "--requests, --concurrency and --distinct-trips must be positive."
+            )
+
+        trips = random_trips(
+            options["distinct_trips"], seed=options["seed"], mode=options["mode"]
+        )
+        payloads = list(itertools.islice(itertools.cycle(trips), options["requests"]))
+
+        self.stdout.write(
+            f"Sending {len(payloads)} requests to {options['url']} "
+            f"with concurrency {options['concurrency']}..."
+        )
+        summary = LoadTestService(
+            options["url"],
+            concurrency=options["concurrency"],
+            timeout=options["timeout"],
+        ).run(payloads)
+
+        self.stdout.write(
+            f"{summary['throughput_rps']:.1f} req/s over {summary['duration_s']:.1f} s, "
+            f"p50 {summary['p50_ms']:.1f} ms, p95 {summary['p95_ms']:.1f} ms, "
+            f"p99 {summary['p99_ms']:.1f} ms"
+        )
+        outcomes = ", ".join(
+            f"{outcome}: {count}" for outcome, count in summary["outcomes"].items()
+        )
+        style = self.style.ERROR if summary["error_rate"] else self.style.SUCCESS
+        self.stdout.write(style(f"Error rate {summary['error_rate']:.1%} ({outcomes})"))
+
+        if options["output"]:
+            write_results(
+                Path(options["output"]),
+                {f"load_test[{options['mode']}-c{options['concurrency']}]": summary},
+                url=options["url"],
+            )
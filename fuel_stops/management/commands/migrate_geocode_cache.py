@@ -0,0 +1,43 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from fuel_stops.utils.geocode_cache import open_geocode_cache
+
+
+class Command(BaseCommand):
+    help = "Copy a geocode cache into another backend, e.g. JSON into SQLite."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            type=str,
+            default="data/geocode_cache.json",
+            help="Path to the existing geocode cache",
+        )
+        parser.add_argument(
+            "--target",
+            type=str,
+            default="data/geocode_cache.sqlite3",
+            help="Path to the geocode cache to write",
+        )
+
+    def handle(self, *args, **options):
+        source_path = Path(options["source"])
+        target_path = Path(options["target"])
+        if not source_path.exists():
+            raise CommandError(f"Geocode cache not found: {source_path}")
+        if source_path.resolve() == target_path.resolve():
+            raise CommandError("--source and --target must be different files")
+
+        copied = 0
+        with open_geocode_cache(source_path) as source, open_geocode_cache(
+            target_path, flush_every=10_000
+        ) as target:
+            for key, (lat, lon) in source.items():
+                target.set(key, lat, lon)
+                copied += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Copied {copied} geocodes to {target_path}")
+        )
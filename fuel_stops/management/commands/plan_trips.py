@@ -0,0 +1,100 @@
+import os
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from fuel_stops.constants import OPTIMIZER_MODES
+from fuel_stops.services.fleet_planning_service import (
+    FleetPlanningService,
+    LaneResultWriter,
+    read_lanes,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Plan the fuel stops of every origin/destination pair in a CSV or "
+        "Parquet file across worker processes, resuming earlier output."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "input",
+            type=str,
+            help=(
+                "CSV or Parquet file with start_lat, start_lon, end_lat and "
+                "end_lon columns, and optionally vehicle_range_miles and mpg."
+            ),
+        )
+        parser.add_argument(
+            "output",
+            type=str,
+            help=(
+                "CSV file to append results to, or a .parquet directory to "
+                "write one part file per chunk into."
+            ),
+        )
+        parser.add_argument(
+            "--id-column",
+            type=str,
+            default="lane_id",
+            help="Column identifying each lane; the row number when absent.",
+        )
+        parser.add_argument(
+            "--mode", choices=OPTIMIZER_MODES, default="greedy", help="Optimizer mode."
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Worker processes, each with its own station snapshot.",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=1000, help="Lanes per written chunk."
+        )
+        parser.add_argument(
+            "--overwrite",
+            action="store_true",
+            help="Discard existing output instead of resuming after it.",
+        )
+
+    def handle(self, *args, **options):
+        """Plans the pending lanes and reports progress after each chunk."""
+        if min(options["workers"], options["chunk_size"]) < 1:
+            raise CommandError("--workers and --chunk-size must be positive.")
+
+        try:
+            lanes = read_lanes(Path(options["input"]), options["id_column"])
+            writer = LaneResultWriter(
+                Path(options["output"]), overwrite=options["overwrite"]
+            )
+            completed = len(writer.completed_ids())
+        except FileNotFoundError as e:
+            raise CommandError(f"File error: {e}")
+        except ImportError as e:
+            raise CommandError(f"Parquet support unavailable: {e}")
+        except ValueError as e:
+            raise CommandError(f"Input validation error: {e}")
+
+        self.stdout.write(
+            f"Planning {len(lanes)} lanes with {options['workers']} workers "
+            f"({completed} already in {options['output']})..."
+        )
+
+        def progress(planned, pending, errors):
+            self.stdout.write(f"Planned {planned}/{pending} lanes ({errors} errors)")
+
+        summary = FleetPlanningService(
+            workers=options["workers"],
+            chunk_size=options["chunk_size"],
+            mode=options["mode"],
+        ).run(lanes, writer, progress=progress)
+
+        style = self.style.WARNING if summary["errors"] else self.style.SUCCESS
+        self.stdout.write(
+            style(
+                f"Planned {summary['planned']} lanes in {summary['duration_s']:.1f} s, "
+                f"skipped {summary['skipped']} already planned, "
+                f"{summary['errors']} errors."
+            )
+        )
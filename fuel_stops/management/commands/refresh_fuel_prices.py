@@ -0,0 +1,46 @@
+import logging
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from fuel_stops.services.fuel_stop_grid_service import FuelStopGridService
+from fuel_stops.services.refresh_fuel_price_service import RefreshFuelPriceService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Update fuel stop prices from a price-only CSV, changing only diffs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--input",
+            type=str,
+            default="data/fuel-prices-for-be-assessment.csv",
+            help="CSV with 'OPIS Truckstop ID' and 'Retail Price' columns.",
+        )
+
+    def handle(self, *args, **options):
+        file_path = Path(options["input"])
+        self.stdout.write(self.style.SUCCESS(f"Reading CSV file: {file_path}"))
+
+        try:
+            counts = RefreshFuelPriceService(file_path).refresh()
+        except (FileNotFoundError, ValueError) as e:
+            raise CommandError(str(e))
+
+        if counts["skipped"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Skipped {counts['skipped']} rows with an invalid ID or price."
+                )
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Prices refreshed: {counts['changed']} changed, "
+                f"{counts['unchanged']} unchanged, {counts['missing']} missing."
+            )
+        )
+        if counts["changed"]:
+            FuelStopGridService().build()
+            self.stdout.write(self.style.SUCCESS("Rebuilt fuel stop grid."))
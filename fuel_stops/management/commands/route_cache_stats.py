@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from fuel_stops.utils.route_cache import KEY_PREFIXES, get_route_cache
+
+
+class Command(BaseCommand):
+    help = "Show the route cache hit, miss and eviction counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Remove every cached route and reset the counters.",
+        )
+
+    def handle(self, *args, **options):
+        route_cache = get_route_cache()
+
+        if options["clear"]:
+            route_cache.clear()
+            self.stdout.write(self.style.SUCCESS("Route cache cleared."))
+            return
+
+        stats = route_cache.stats()
+        for name, value in stats.items():
+            self.stdout.write(f"{name}: {value}")
+
+        for kind in [kind for _, kind in KEY_PREFIXES] + ["geometry"]:
+            hits = stats.get(f"hits_{kind}", 0)
+            lookups = hits + stats.get(f"misses_{kind}", 0)
+            if lookups:
+                self.stdout.write(
+                    f"{kind} cache hit rate: {hits / lookups * 100:.1f}% "
+                    f"of {lookups} lookups"
+                )
+
+        exact = stats.get("route_exact_hits", 0)
+        snapped = stats.get("route_snapped_hits", 0)
+        lookups = exact + snapped + stats.get("route_misses", 0)
+        if lookups:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"route hit rate: exact {exact / lookups * 100:.1f}%, "
+                    f"snapped {snapped / lookups * 100:.1f}%"
+                )
+            )
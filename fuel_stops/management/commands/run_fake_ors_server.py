@@ -0,0 +1,94 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from fuel_stops.utils.fake_ors import FakeORSRoutes, FakeORSServer
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve a local stand-in for the ORS driving-hgv directions endpoint. "
+        "Point ORS_BASE_URL at it to load-test without the ORS quota."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", type=str, default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8081)
+        parser.add_argument(
+            "--replay-dir",
+            type=str,
+            default=None,
+            help=(
+                "Directory of recorded ORS GeoJSON responses to replay. Routes "
+                "are synthesized when omitted."
+            ),
+        )
+        parser.add_argument(
+            "--latency-ms",
+            type=float,
+            default=0,
+            help="Delay added before every response.",
+        )
+        parser.add_argument(
+            "--jitter-ms",
+            type=float,
+            default=0,
+            help="Upper bound of extra random delay per response.",
+        )
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=0,
+            help="Fraction of requests answered with --error-status.",
+        )
+        parser.add_argument(
+            "--error-status",
+            type=int,
+            default=503,
+            help=(
+                "HTTP status used for injected errors. The ORS client retries "
+                "429 and 503 responses, any other status fails the request."
+            ),
+        )
+        parser.add_argument(
+            "--steps-per-mile",
+            type=float,
+            default=0.5,
+            help="Step density of synthesized routes.",
+        )
+
+    def handle(self, *args, **options):
+        """Runs the stand-in server until interrupted."""
+        if not 0 <= options["error_rate"] <= 1:
+            raise CommandError("--error-rate must be between 0 and 1.")
+
+        replay_dir = options["replay_dir"] and Path(options["replay_dir"])
+        if replay_dir and not replay_dir.is_dir():
+            raise CommandError(f"Replay directory not found: {replay_dir}")
+
+        routes = FakeORSRoutes(
+            replay_dir=replay_dir, steps_per_mile=options["steps_per_mile"]
+        )
+        server = FakeORSServer(
+            (options["host"], options["port"]),
+            routes=routes,
+            latency_ms=options["latency_ms"],
+            jitter_ms=options["jitter_ms"],
+            error_rate=options["error_rate"],
+            error_status=options["error_status"],
+        )
+
+        source = (
+            f"replaying {len(routes.recorded)} recorded routes"
+            if routes.recorded
+            else "synthesizing routes"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Fake ORS listening on {server.base_url}, {source}.")
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
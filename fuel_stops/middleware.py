@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+from asgiref.sync import markcoroutinefunction
+
+from fuel_stops.utils.metrics import (
+    REQUEST_METRIC,
+    collect_request_timings,
+    get_metrics_registry,
+)
+
+
+class ServerTimingMiddleware:
+    """Reports per-phase timings of each request in a Server-Timing header.
+
+    Phases timed with fuel_stops.utils.metrics.timed while the request is
+    served are listed with their summed durations, followed by the total.
+    The total is also recorded in the request duration histogram. Streaming
+    responses produce their body after the headers are sent, so they get no
+    header and their total is recorded once the stream closes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # Under ASGI the chain is async, so stay async rather than have
+        # Django run every request on one thread_sensitive worker thread.
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with collect_request_timings() as timings:
+            response = self.get_response(request)
+        return self._finish(request, response, timings, started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with collect_request_timings() as timings:
+            response = await self.get_response(request)
+        return self._finish(request, response, timings, started)
+
+    def _finish(self, request, response, timings, started: float):
+        if response.streaming:
+            response.streaming_content = self._observe_when_closed(
+                request, response.streaming_content, started
+            )
+            return response
+
+        total_seconds = time.perf_counter() - started
+        self._observe(request, total_seconds)
+        response["Server-Timing"] = timings.server_timing(total_seconds)
+        return response
+
+    def _observe_when_closed(self, request, content, started):
+        try:
+            yield from content
+        finally:
+            self._observe(request, time.perf_counter() - started)
+
+    @staticmethod
+    def _observe(request, total_seconds: float):
+        resolver_match = getattr(request, "resolver_match", None)
+        get_metrics_registry().observe(
+            REQUEST_METRIC,
+            total_seconds,
+            view=getattr(resolver_match, "url_name", None) or "unmatched",
+            method=request.method,
+        )
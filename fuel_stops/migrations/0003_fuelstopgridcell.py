@@ -0,0 +1,47 @@
+# Generated by Django 3.2.23 on 2026-10-17 23:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fuel_stops", "0002_auto_20250624_1231"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FuelStopGridCell",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("resolution", models.PositiveSmallIntegerField()),
+                ("cell_key", models.CharField(max_length=12)),
+                ("rank", models.PositiveSmallIntegerField()),
+                ("retail_price", models.DecimalField(decimal_places=3, max_digits=10)),
+                (
+                    "fuel_stop",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="grid_cells",
+                        to="fuel_stops.fuelstop",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="fuelstopgridcell",
+            constraint=models.UniqueConstraint(
+                fields=("resolution", "cell_key", "rank"),
+                name="unique_fuel_stop_grid_cell_rank",
+            ),
+        ),
+    ]
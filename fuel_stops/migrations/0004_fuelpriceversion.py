@@ -0,0 +1,29 @@
+# Generated by Django 3.2.23 on 2026-10-18 00:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fuel_stops", "0003_fuelstopgridcell"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FuelPriceVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.PositiveBigIntegerField()),
+                ("grid_version", models.PositiveBigIntegerField(null=True)),
+            ],
+        ),
+    ]
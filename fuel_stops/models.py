@@ -13,3 +13,45 @@ class FuelStop(models.Model):
 
     def __str__(self):
         return self.truckstop_name
+
+
+class FuelStopGridCell(models.Model):
+    """One of the cheapest fuel stops in a geohash cell.
+
+    Rows are rebuilt by build_fuel_stop_grid for each resolution, keeping the
+    top-ranked stops per cell by (retail_price, id).
+    """
+
+    resolution = models.PositiveSmallIntegerField()
+    cell_key = models.CharField(max_length=12)
+    rank = models.PositiveSmallIntegerField()
+    retail_price = models.DecimalField(max_digits=10, decimal_places=3)
+    fuel_stop = models.ForeignKey(
+        FuelStop, on_delete=models.CASCADE, related_name="grid_cells"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["resolution", "cell_key", "rank"],
+                name="unique_fuel_stop_grid_cell_rank",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.cell_key}#{self.rank}"
+
+
+class FuelPriceVersion(models.Model):
+    """The single row versioning the fuel price snapshot.
+
+    version is bumped in the same transaction as every price write, so all
+    workers on every host agree on which cached plans are still current.
+    grid_version is the price version the fuel stop grid was built for.
+    """
+
+    version = models.PositiveBigIntegerField()
+    grid_version = models.PositiveBigIntegerField(null=True)
+
+    def __str__(self):
+        return f"v{self.version}"
@@ -0,0 +1,96 @@
+import json
+from decimal import Decimal
+from typing import Iterable, Iterator, Optional
+
+from django.conf import settings
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def decimal_encoder(decimal_places: Optional[int] = None):
+    """Builds a JSON ``default`` hook that emits Decimals as numbers.
+
+    Args:
+        decimal_places (int): Round every Decimal to this many places, or
+            keep their full precision when None.
+
+    Returns:
+        Callable: The hook, raising TypeError for other unsupported types.
+    """
+
+    def default(value):
+        if isinstance(value, Decimal):
+            if decimal_places is None:
+                return float(value)
+            return round(float(value), decimal_places)
+        if hasattr(value, "tolist"):
+            return value.tolist()
+        raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+    return default
+
+
+class FastJSONRenderer(BaseRenderer):
+    """JSON renderer for large plan payloads.
+
+    GeoJSON features are dicts and are encoded as such; Decimals become
+    numbers, rounded to FAST_JSON_DECIMAL_PLACES when it is set. orjson is
+    used when installed, otherwise the standard library encoder with compact
+    separators. Unlike JSONRenderer, there is no indentation support.
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def __init__(self, decimal_places: Optional[int] = None):
+        self.decimal_places = (
+            decimal_places
+            if decimal_places is not None
+            else settings.FAST_JSON_DECIMAL_PLACES
+        )
+        self._default = decimal_encoder(self.decimal_places)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if data is None:
+            return b""
+        if orjson is not None:
+            return orjson.dumps(
+                data, default=self._default, option=orjson.OPT_SERIALIZE_NUMPY
+            )
+        return json.dumps(
+            data,
+            default=self._default,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+class NDJSONRenderer(FastJSONRenderer):
+    """Renders newline-delimited JSON, one object per line.
+
+    render() encodes a single object, such as an error body; iter_lines()
+    encodes a stream of objects for a StreamingHttpResponse.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if data is None:
+            return b""
+        return super().render(data, accepted_media_type, renderer_context) + b"\n"
+
+    def iter_lines(self, objects: Iterable) -> Iterator[bytes]:
+        for data in objects:
+            yield self.render(data)
+
+
+def get_json_renderer_class():
+    """Returns the JSON renderer selected by the FAST_JSON_RENDERER setting."""
+    return FastJSONRenderer if settings.FAST_JSON_RENDERER else JSONRenderer
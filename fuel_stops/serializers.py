@@ -1,11 +1,44 @@
 from rest_framework import serializers
 
+from fuel_stops.constants import (
+    DEFAULT_SIMPLIFY_TOLERANCE_METERS,
+    GEOMETRY_FORMATS,
+    MAX_SWEEP_PROFILES,
+    MAX_TRIP_WAYPOINTS,
+    MPG,
+    OPTIMIZER_MODES,
+    POLYLINE_PRECISIONS,
+    VEHICLE_RANGE_MILES,
+)
+
+
+class WaypointSerializer(serializers.Serializer):
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lon = serializers.FloatField(min_value=-180, max_value=180)
+
 
 class OptimalFuelStopRouteSerializer(serializers.Serializer):
     start_lat = serializers.FloatField()
     start_lon = serializers.FloatField()
     end_lat = serializers.FloatField()
     end_lon = serializers.FloatField()
+    waypoints = serializers.ListField(
+        child=WaypointSerializer(),
+        default=list,
+        max_length=MAX_TRIP_WAYPOINTS,
+    )
+    mode = serializers.ChoiceField(choices=OPTIMIZER_MODES, default="greedy")
+    geometry_format = serializers.ChoiceField(
+        choices=GEOMETRY_FORMATS, default="geojson"
+    )
+    simplify_tolerance = serializers.FloatField(
+        min_value=0, default=DEFAULT_SIMPLIFY_TOLERANCE_METERS
+    )
+    polyline_precision = serializers.ChoiceField(choices=POLYLINE_PRECISIONS, default=5)
+    vehicle_range_miles = serializers.FloatField(
+        min_value=1, default=VEHICLE_RANGE_MILES
+    )
+    mpg = serializers.FloatField(min_value=0.1, default=MPG)
 
     def validate(self, data):
         # Validate latitudes
@@ -23,3 +56,25 @@ class OptimalFuelStopRouteSerializer(serializers.Serializer):
                 )
 
         return data
+
+
+class VehicleProfileSerializer(serializers.Serializer):
+    vehicle_range_miles = serializers.FloatField(min_value=1)
+    mpg = serializers.FloatField(min_value=0.1)
+    starting_fuel = serializers.FloatField(min_value=0, max_value=1, default=1)
+    reserve_miles = serializers.FloatField(min_value=0, default=0)
+
+    def validate(self, data):
+        if data["reserve_miles"] >= data["vehicle_range_miles"]:
+            raise serializers.ValidationError(
+                {"error": "reserve_miles must be less than vehicle_range_miles."}
+            )
+        return data
+
+
+class VehicleSweepSerializer(OptimalFuelStopRouteSerializer):
+    profiles = serializers.ListField(
+        child=VehicleProfileSerializer(),
+        min_length=1,
+        max_length=MAX_SWEEP_PROFILES,
+    )
@@ -0,0 +1,322 @@
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Set
+
+import pandas as pd
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections
+from pandas.io.parquet import get_engine as get_parquet_engine
+from rest_framework.exceptions import ValidationError
+
+from fuel_stops.constants import MILES_TO_METERS, MPG, VEHICLE_RANGE_MILES
+from fuel_stops.models import FuelStop
+from fuel_stops.services.route_optimizer_service import RouteOptimizerService
+from fuel_stops.services.trip_planner_service import (
+    TripPlannerService,
+    trip_endpoints,
+    trip_error_message,
+)
+from fuel_stops.utils.open_route_service import (
+    OpenRouteServiceClient,
+    reset_http_session,
+)
+from fuel_stops.utils.spatial_index import FuelStopSpatialIndex
+
+logger = logging.getLogger(__name__)
+
+LANE_COLUMNS = ("start_lat", "start_lon", "end_lat", "end_lon")
+# Per-lane vehicle columns, used when present in the input.
+VEHICLE_COLUMNS = {"vehicle_range_miles": VEHICLE_RANGE_MILES, "mpg": MPG}
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+RESULT_COLUMNS = (
+    "lane_id",
+    "status",
+    "total_cost",
+    "fuel_stop_count",
+    "gallons_bought",
+    "distance_miles",
+    "error",
+    "elapsed_ms",
+)
+
+# Station snapshot and ORS client of the current worker process.
+_worker = {}
+
+
+def is_parquet(path: Path) -> bool:
+    """Whether a lanes or results path is read and written as Parquet."""
+    return Path(path).suffix.lower() in PARQUET_SUFFIXES
+
+
+def read_lanes(path: Path, id_column: str = "lane_id") -> pd.DataFrame:
+    """Reads the origin/destination pairs to plan from CSV or Parquet.
+
+    Args:
+        path (Path): The input file; .parquet and .pq files are read as Parquet.
+        id_column (str): The column identifying each lane. The row number
+            is used when the column is missing.
+
+    Raises:
+        ValueError: If a coordinate column is missing or lane ids repeat.
+
+    Returns:
+        pd.DataFrame: The lanes, with a "lane_id" column.
+    """
+    path = Path(path)
+    lanes = pd.read_parquet(path) if is_parquet(path) else pd.read_csv(path)
+
+    missing = [column for column in LANE_COLUMNS if column not in lanes.columns]
+    if missing:
+        raise ValueError(f"Missing columns in {path}: {', '.join(missing)}")
+
+    if id_column in lanes.columns:
+        lanes = lanes.rename(columns={id_column: "lane_id"})
+    else:
+        lanes = lanes.assign(lane_id=range(len(lanes)))
+    if lanes["lane_id"].duplicated().any():
+        raise ValueError(f"Lane ids in {path} must be unique.")
+    return lanes
+
+
+class LaneResultWriter:
+    """Appends lane results to CSV or Parquet in chunks and resumes from them.
+
+    A CSV output is one file that every chunk is appended to. A Parquet
+    output is a directory holding one part file per chunk. Either way, the
+    lanes already written are the run's progress, so a rerun skips them.
+
+    Args:
+        path (Path): The output file, or directory for Parquet.
+        overwrite (bool): Discard earlier results instead of resuming.
+
+    Raises:
+        ImportError: If Parquet output is asked for without pyarrow or
+            fastparquet installed.
+    """
+
+    def __init__(self, path: Path, overwrite: bool = False):
+        self.path = Path(path)
+        self.parquet = is_parquet(self.path)
+        if self.parquet:
+            # Fail before planning rather than when the first chunk is written.
+            get_parquet_engine("auto")
+        if overwrite:
+            self._remove()
+
+    def _remove(self):
+        if self.parquet and self.path.is_dir():
+            for part in self.path.glob("part-*.parquet"):
+                part.unlink()
+        elif self.path.exists():
+            self.path.unlink()
+
+    def _parts(self) -> List[Path]:
+        return sorted(self.path.glob("part-*.parquet")) if self.path.is_dir() else []
+
+    def completed_ids(self) -> Set[str]:
+        """Returns the ids of the lanes already written, as strings."""
+        if self.parquet:
+            frames = [
+                pd.read_parquet(part, columns=["lane_id"]) for part in self._parts()
+            ]
+        elif self.path.exists() and self.path.stat().st_size:
+            frames = [pd.read_csv(self.path, usecols=["lane_id"], dtype=str)]
+        else:
+            frames = []
+        return {str(lane_id) for frame in frames for lane_id in frame["lane_id"]}
+
+    def write(self, records: List[dict]):
+        """Appends a chunk of lane results."""
+        frame = pd.DataFrame.from_records(records, columns=RESULT_COLUMNS)
+        if self.parquet:
+            self.path.mkdir(parents=True, exist_ok=True)
+            part = self.path / f"part-{len(self._parts()):05d}.parquet"
+            # Write under a temporary name so an interrupted write leaves no
+            # partial part behind.
+            staging = part.with_suffix(".tmp")
+            frame.to_parquet(staging, index=False)
+            os.replace(staging, part)
+            return
+
+        header = not self.path.exists() or not self.path.stat().st_size
+        with self.path.open("a", encoding="utf-8", newline="") as f:
+            f.write(frame.to_csv(index=False, header=header))
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def init_worker(stations: Optional[List[FuelStop]] = None):
+    """Prepares a worker process for planning lanes.
+
+    Each worker builds its own station snapshot and opens its own pooled
+    ORS session instead of sharing its parent's connections. Database
+    connections inherited through the fork are dropped, not closed: closing
+    them would end the parent's session on the server. The parent closes
+    its connections before forking, so normally there are none.
+
+    Args:
+        stations (List[FuelStop]): The stations to index, read from the
+            database when omitted.
+    """
+    for connection in connections.all():
+        if connection.connection is not None:
+            # Keep a reference so the inherited object is never finalized,
+            # which would close it; workers exit without finalizing objects.
+            _worker.setdefault("inherited_connections", []).append(
+                connection.connection
+            )
+            connection.connection = None
+    reset_http_session()
+    cell_degrees = settings.FUEL_STOP_INDEX_CELL_DEGREES
+    if stations is None:
+        index = FuelStopSpatialIndex.from_database(cell_degrees=cell_degrees)
+    else:
+        index = FuelStopSpatialIndex(stations, cell_degrees=cell_degrees)
+    _worker["spatial_index"] = index
+    _worker["planner"] = TripPlannerService(OpenRouteServiceClient())
+
+
+def plan_lane(lane: dict) -> dict:
+    """Plans one lane in a worker process set up by init_worker.
+
+    Args:
+        lane (dict): A row of read_lanes with the optimizer "mode" added.
+
+    Returns:
+        dict: The lane's result row, with status "ok" or "error".
+    """
+    started = time.perf_counter()
+    result = {"lane_id": lane["lane_id"]}
+    try:
+        route_data = _worker["planner"].fetch_route(lane)
+        optimizer = RouteOptimizerService(
+            start=trip_endpoints(lane)[0],
+            steps=route_data.get("steps", []),
+            vehicle_range_miles=lane["vehicle_range_miles"],
+            mpg=lane["mpg"],
+            lookup_backend="memory",
+            spatial_index=_worker["spatial_index"],
+            route_geometry=route_data.get("geometry"),
+            mode=lane["mode"],
+        )
+        fuel_stops, total_cost = optimizer.compute_optimal_stops()
+        result.update(
+            status="ok",
+            total_cost=float(total_cost.quantize(Decimal("0.00"))),
+            fuel_stop_count=len(fuel_stops),
+            gallons_bought=float(
+                sum((stop["gallons_bought"] for stop in fuel_stops), Decimal(0))
+            ),
+            distance_miles=round(
+                route_data.get("total_distance", 0) / MILES_TO_METERS, 1
+            ),
+        )
+    except (ValidationError, DjangoValidationError) as e:
+        result.update(status="error", error=trip_error_message(e))
+    except Exception as e:
+        logger.exception(f"Unexpected error planning lane {lane['lane_id']}")
+        result.update(status="error", error=str(e))
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return result
+
+
+class FleetPlanningService:
+    """Plans many lanes offline across a pool of worker processes.
+
+    Workers are forked so they inherit the configured Django settings. Each
+    one holds its own station snapshot and ORS client (see init_worker), and
+    lanes are planned with RouteOptimizerService on the "memory" backend.
+    Results come back in input order and are written every chunk_size lanes.
+
+    Args:
+        workers (int): The number of worker processes.
+        chunk_size (int): The lanes per written chunk.
+        mode (str): The optimizer mode.
+        stations (List[FuelStop]): The stations to plan with, read from the
+            database by each worker when omitted.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        chunk_size: int = 1000,
+        mode: str = "greedy",
+        stations: Optional[List[FuelStop]] = None,
+    ):
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.mode = mode
+        self.stations = stations
+
+    def pending_lanes(
+        self, lanes: pd.DataFrame, completed_ids: Set[str]
+    ) -> Iterable[dict]:
+        """Yields the lanes not yet written as trips for plan_lane."""
+        for lane in lanes.to_dict("records"):
+            if str(lane["lane_id"]) in completed_ids:
+                continue
+            for column, default in VEHICLE_COLUMNS.items():
+                if pd.isna(lane.get(column)):
+                    lane[column] = default
+            lane["mode"] = self.mode
+            yield lane
+
+    def run(
+        self,
+        lanes: pd.DataFrame,
+        writer: LaneResultWriter,
+        progress: Optional[Callable[[int, int, int], None]] = None,
+    ) -> dict:
+        """Plans every lane not already in the writer's output.
+
+        Args:
+            lanes (pd.DataFrame): The lanes returned by read_lanes.
+            writer (LaneResultWriter): Where results are appended.
+            progress (Callable): Called after each chunk with the lanes
+                planned so far, the lanes pending and the errors so far.
+
+        Returns:
+            dict: Counts of skipped, planned and failed lanes and the duration.
+        """
+        started = time.perf_counter()
+        completed_ids = writer.completed_ids()
+        pending = list(self.pending_lanes(lanes, completed_ids))
+        skipped = len(lanes) - len(pending)
+
+        planned = errors = 0
+        if pending:
+            chunk = []
+            # Forked workers must not inherit open database connections.
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(pending)),
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=init_worker,
+                initargs=(self.stations,),
+            ) as executor:
+                # Small task batches keep every worker busy without
+                # shipping lanes one at a time.
+                batch = max(1, min(64, len(pending) // (self.workers * 4)))
+                for result in executor.map(plan_lane, pending, chunksize=batch):
+                    chunk.append(result)
+                    planned += 1
+                    errors += result["status"] == "error"
+                    if len(chunk) >= self.chunk_size or planned == len(pending):
+                        writer.write(chunk)
+                        chunk = []
+                        if progress:
+                            progress(planned, len(pending), errors)
+
+        return {
+            "skipped": skipped,
+            "planned": planned,
+            "errors": errors,
+            "duration_s": round(time.perf_counter() - started, 3),
+        }
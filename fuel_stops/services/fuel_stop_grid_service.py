@@ -0,0 +1,172 @@
+import logging
+from math import cos, degrees, radians
+from typing import Dict, Optional, Tuple
+
+from django.db import connection, transaction
+from django.db.models import F
+
+from fuel_stops.constants import (
+    EARTH_RADIUS_METERS,
+    FUEL_STOP_GRID_MAX_CELLS,
+    FUEL_STOP_GRID_RESOLUTIONS,
+    FUEL_STOP_GRID_TOP_K,
+)
+from fuel_stops.models import FuelPriceVersion, FuelStop, FuelStopGridCell
+from fuel_stops.utils.geo import haversine_meters
+from fuel_stops.utils.geohash import cells_covering, count_cells_covering
+from fuel_stops.utils.price_version import PRICE_VERSION_ID, lock_price_version
+from fuel_stops.utils.spatial_index import MAX_LATITUDE
+
+logger = logging.getLogger(__name__)
+
+BUILD_GRID_SQL = """
+    INSERT INTO {grid_table} (resolution, cell_key, rank, retail_price, fuel_stop_id)
+    SELECT %s, cell_key, rank, retail_price, id
+    FROM (
+        SELECT f.id, f.retail_price, cells.cell_key,
+               row_number() OVER (
+                   PARTITION BY cells.cell_key ORDER BY f.retail_price, f.id
+               ) AS rank
+        FROM {table} f,
+             LATERAL (SELECT ST_GeoHash(f.point::geometry, %s) AS cell_key) cells
+    ) ranked
+    WHERE rank <= %s
+"""
+
+
+class FuelStopGridService:
+    """Builds and reads the precomputed cheapest-stops-per-cell grid.
+
+    For each geohash resolution, the grid keeps the top_k cheapest stops of
+    every cell. A cheapest-within-radius lookup reads the cells covering the
+    search circle at the finest resolution that needs at most max_cells
+    cells, then checks exact distances. When a cell's stored stops are all
+    out of range and the cell may hold cheaper stops beyond its top_k, the
+    lookup reports itself unresolved so callers can fall back to PostGIS.
+    The same happens when the grid was built for an older price version;
+    that is checked on the first lookup only, so create one service per
+    planning run.
+    """
+
+    def __init__(
+        self,
+        resolutions: Tuple[int, ...] = FUEL_STOP_GRID_RESOLUTIONS,
+        top_k: int = FUEL_STOP_GRID_TOP_K,
+        max_cells: int = FUEL_STOP_GRID_MAX_CELLS,
+    ):
+        self.resolutions = tuple(sorted(resolutions))
+        self.top_k = top_k
+        self.max_cells = max_cells
+        self._current = None
+
+    def build(self) -> Dict[int, int]:
+        """Rebuilds every resolution of the grid in one transaction.
+
+        Returns:
+            Dict[int, int]: The number of rows written per resolution.
+        """
+        sql = BUILD_GRID_SQL.format(
+            grid_table=FuelStopGridCell._meta.db_table,
+            table=FuelStop._meta.db_table,
+        )
+
+        counts = {}
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Price writes wait for the build, so the grid matches its version.
+            price_version = lock_price_version()
+            FuelStopGridCell.objects.all().delete()
+            for resolution in self.resolutions:
+                cursor.execute(sql, [resolution, resolution, self.top_k])
+                counts[resolution] = cursor.rowcount
+            FuelPriceVersion.objects.filter(pk=PRICE_VERSION_ID).update(
+                grid_version=price_version
+            )
+        self._current = None
+
+        logger.info(f"Built fuel stop grid: {counts}")
+        return counts
+
+    def is_current(self) -> bool:
+        """Whether the grid was built for the current price version."""
+        return FuelPriceVersion.objects.filter(
+            pk=PRICE_VERSION_ID, grid_version=F("version")
+        ).exists()
+
+    def _resolution_for(self, bbox: Tuple[float, float, float, float]) -> int:
+        for resolution in reversed(self.resolutions):
+            if count_cells_covering(*bbox, resolution) <= self.max_cells:
+                return resolution
+        return self.resolutions[0]
+
+    def cheapest_within(
+        self, point: tuple, within: float
+    ) -> Tuple[bool, Optional[FuelStop]]:
+        """Finds the cheapest fuel stop within a radius from the grid.
+
+        Args:
+            point (tuple): The search centre as (longitude, latitude).
+            within (float): The search radius in meters.
+
+        Returns:
+            tuple: (resolved, fuel_stop). When resolved is False the grid
+            cannot answer exactly and the caller should query PostGIS.
+        """
+        if self._current is None:
+            self._current = self.is_current()
+        if not self._current:
+            return False, None
+
+        lon, lat = point
+        lat_delta = degrees(within / EARTH_RADIUS_METERS)
+        widest_lat = min(abs(lat) + lat_delta, MAX_LATITUDE)
+        lon_delta = min(lat_delta / cos(radians(widest_lat)), 180.0)
+        bbox = (
+            lon - lon_delta,
+            max(lat - lat_delta, -90.0),
+            lon + lon_delta,
+            min(lat + lat_delta, 90.0),
+        )
+        resolution = self._resolution_for(bbox)
+
+        entries = (
+            FuelStopGridCell.objects.filter(
+                resolution=resolution,
+                cell_key__in=cells_covering(*bbox, resolution),
+            )
+            .select_related("fuel_stop")
+            .only(
+                "cell_key",
+                "rank",
+                "retail_price",
+                "fuel_stop__id",
+                "fuel_stop__truckstop_name",
+                "fuel_stop__retail_price",
+                "fuel_stop__point",
+            )
+            .order_by("cell_key", "rank")
+        )
+
+        best = None
+        cells: Dict[str, list] = {}
+        for entry in entries:
+            cells.setdefault(entry.cell_key, []).append(entry)
+
+        # Highest (price, id) a cell's unseen stops could beat, per full cell
+        # whose stored stops were all out of range.
+        unresolved_floors = []
+        for cell_entries in cells.values():
+            for entry in cell_entries:
+                stop = entry.fuel_stop
+                if haversine_meters(lon, lat, stop.point.x, stop.point.y) <= within:
+                    key = (entry.retail_price, stop.id)
+                    if best is None or key < best[0]:
+                        best = (key, stop)
+                    break
+            else:
+                if len(cell_entries) >= self.top_k:
+                    last = cell_entries[-1]
+                    unresolved_floors.append((last.retail_price, last.fuel_stop.id))
+
+        if any(best is None or floor < best[0] for floor in unresolved_floors):
+            return False, None
+        return True, best[1] if best else None
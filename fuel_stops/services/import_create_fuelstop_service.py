@@ -1,11 +1,14 @@
 import csv
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
 from django.contrib.gis.geos import Point
+from django.db import connection, transaction
 
 from fuel_stops.models import FuelStop
+from fuel_stops.utils.copy_stream import CopyStream, csv_chunks
+from fuel_stops.utils.price_version import bump_price_version
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +27,39 @@ REQUIRED_FIELDS = [
 
 BATCH_SIZE = 500
 
+STAGING_TABLE = "fuel_stop_import_staging"
+
+CREATE_STAGING_TABLE_SQL = f"""
+CREATE TEMPORARY TABLE {STAGING_TABLE} (
+    opis_truckstop integer NOT NULL,
+    truckstop_name varchar(255) NOT NULL,
+    address text NOT NULL,
+    city varchar(30) NOT NULL,
+    state varchar(10) NOT NULL,
+    rack_id integer NOT NULL,
+    retail_price numeric(10, 3) NOT NULL,
+    longitude double precision NOT NULL,
+    latitude double precision NOT NULL
+) ON COMMIT DROP
+"""
+
+COPY_STAGING_SQL = f"COPY {STAGING_TABLE} FROM STDIN WITH (FORMAT csv)"
+
+MERGE_STAGING_SQL = f"""
+INSERT INTO {{table}} (
+    opis_truckstop, truckstop_name, address, city, state, rack_id,
+    retail_price, point
+)
+SELECT
+    s.opis_truckstop, s.truckstop_name, s.address, s.city, s.state, s.rack_id,
+    s.retail_price,
+    ST_SetSRID(ST_MakePoint(s.longitude, s.latitude), 4326)::geography
+FROM {STAGING_TABLE} s
+WHERE NOT EXISTS (
+    SELECT 1 FROM {{table}} f WHERE f.opis_truckstop = s.opis_truckstop
+)
+"""
+
 
 class ImportCreateFuelStopService:
     """Handles the bulk creation of FuelStop instances from a CSV file."""
@@ -65,19 +101,26 @@ class ImportCreateFuelStopService:
 
         return self.created_count
 
-    def _build_instance(self, row: dict) -> Optional[FuelStop]:
-        """Builds a FuelStop instance from a row of data."""
+    @staticmethod
+    def _parse_coordinates(row: dict) -> Optional[Tuple[float, float]]:
+        """Returns the row's (lon, lat), or None when either is missing."""
         try:
             lat = float(row.get("Latitude", "") or 0)
             lon = float(row.get("Longitude", "") or 0)
-            point = Point(lon, lat) if lat and lon else None
         except (ValueError, TypeError):
-            point = None
+            return None
+        return (lon, lat) if lat and lon else None
 
+    @staticmethod
+    def _parse_price(row: dict) -> float:
         try:
-            retail_price = float(row.get("Retail Price") or 0.0)
+            return float(row.get("Retail Price") or 0.0)
         except (ValueError, TypeError):
-            retail_price = 0.0
+            return 0.0
+
+    def _build_instance(self, row: dict) -> Optional[FuelStop]:
+        """Builds a FuelStop instance from a row of data."""
+        coordinates = self._parse_coordinates(row)
 
         return FuelStop(
             opis_truckstop=row["OPIS Truckstop ID"].strip(),
@@ -86,8 +129,8 @@ class ImportCreateFuelStopService:
             city=row.get("City", ""),
             state=row.get("State", ""),
             rack_id=row["Rack ID"].strip(),
-            retail_price=retail_price,
-            point=point,
+            retail_price=self._parse_price(row),
+            point=Point(*coordinates) if coordinates else None,
         )
 
     def _commit_batch(self, fuelstops: List[FuelStop], command) -> None:
@@ -105,7 +148,10 @@ class ImportCreateFuelStopService:
         ]
 
         if new_fuelstops:
-            FuelStop.objects.bulk_create(new_fuelstops)
+            with transaction.atomic():
+                FuelStop.objects.bulk_create(new_fuelstops)
+                # bulk_create skips save signals, so invalidate cached plans here.
+                bump_price_version()
             command.stdout.write(
                 command.style.NOTICE(f"Created {len(new_fuelstops)} new fuel stops.")
             )
@@ -114,3 +160,78 @@ class ImportCreateFuelStopService:
             command.stdout.write(
                 command.style.WARNING("No new fuel stops in this batch.")
             )
+
+
+class CopyImportFuelStopService(ImportCreateFuelStopService):
+    """Imports fuel stops through PostgreSQL COPY and one set-based insert.
+
+    Rows are streamed into a temporary staging table, then inserted into
+    the FuelStop table in a single INSERT ... SELECT that skips IDs already
+    present and builds the geography points in SQL. Duplicate IDs within the
+    file keep their first occurrence, as in the ORM import. Rows without
+    coordinates are skipped and counted in skipped_count.
+    """
+
+    def __init__(self, file_path: Path):
+        super().__init__(file_path)
+        self.skipped_count = 0
+
+    def import_csv(self, command) -> int:
+        """Imports fuel stops from a CSV file."""
+        if not self.file_path.exists():
+            raise FileNotFoundError(f"CSV file not found: {self.file_path}")
+
+        with self.file_path.open(newline="", encoding="utf-8") as csvfile:
+            reader = csv.DictReader(csvfile)
+
+            if not all(field in reader.fieldnames for field in REQUIRED_FIELDS):
+                raise ValueError("CSV is missing one or more required columns")
+
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(CREATE_STAGING_TABLE_SQL)
+                cursor.copy_expert(
+                    COPY_STAGING_SQL, CopyStream(csv_chunks(self._staging_rows(reader)))
+                )
+                cursor.execute(MERGE_STAGING_SQL.format(table=FuelStop._meta.db_table))
+                self.created_count = cursor.rowcount
+                if self.created_count:
+                    bump_price_version()
+
+        if self.skipped_count:
+            command.stdout.write(
+                command.style.WARNING(
+                    f"Skipped {self.skipped_count} rows without coordinates."
+                )
+            )
+        if self.created_count:
+            command.stdout.write(
+                command.style.NOTICE(f"Created {self.created_count} new fuel stops.")
+            )
+        else:
+            command.stdout.write(command.style.WARNING("No new fuel stops to import."))
+
+        return self.created_count
+
+    def _staging_rows(self, reader: csv.DictReader) -> Iterator[tuple]:
+        """Yields the first row per OPIS ID, normalized for the staging table."""
+        for row in reader:
+            truckstop_id = row["OPIS Truckstop ID"].strip()
+            if truckstop_id in self.seen_ids:
+                continue
+            self.seen_ids.add(truckstop_id)
+
+            coordinates = self._parse_coordinates(row)
+            if coordinates is None:
+                self.skipped_count += 1
+                continue
+
+            yield (
+                truckstop_id,
+                row["Truckstop Name"].strip(),
+                row.get("Address", ""),
+                row.get("City", ""),
+                row.get("State", ""),
+                row["Rack ID"].strip(),
+                self._parse_price(row),
+                *coordinates,
+            )
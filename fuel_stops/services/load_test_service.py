@@ -0,0 +1,130 @@
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+import requests
+
+from fuel_stops.utils.benchmarking import summarize
+from fuel_stops.utils.synthetic import CONTIGUOUS_US_BBOX
+
+logger = logging.getLogger(__name__)
+
+# Degrees kept clear of the bounding box edges when sampling trip endpoints.
+TRIP_MARGIN_DEGREES = 2.0
+
+
+def random_trips(count: int, seed: int = 0, mode: str = "greedy") -> List[dict]:
+    """Builds /fuel-stops/ request bodies between random US points.
+
+    Args:
+        count (int): The number of distinct trips.
+        seed (int): The random seed.
+        mode (str): The optimizer mode requested for every trip.
+
+    Returns:
+        List[dict]: The request bodies.
+    """
+    rng = random.Random(seed)
+    min_lon, min_lat, max_lon, max_lat = CONTIGUOUS_US_BBOX
+
+    def point():
+        return (
+            round(
+                rng.uniform(
+                    min_lon + TRIP_MARGIN_DEGREES, max_lon - TRIP_MARGIN_DEGREES
+                ),
+                6,
+            ),
+            round(
+                rng.uniform(
+                    min_lat + TRIP_MARGIN_DEGREES, max_lat - TRIP_MARGIN_DEGREES
+                ),
+                6,
+            ),
+        )
+
+    trips = []
+    for _ in range(count):
+        (start_lon, start_lat), (end_lon, end_lat) = point(), point()
+        trips.append(
+            {
+                "start_lon": start_lon,
+                "start_lat": start_lat,
+                "end_lon": end_lon,
+                "end_lat": end_lat,
+                "mode": mode,
+            }
+        )
+    return trips
+
+
+class LoadTestService:
+    """Fires concurrent trip requests at the fuel stops API.
+
+    Each worker thread keeps its own keep-alive session, so the measured
+    latency is the server's rather than connection setup.
+
+    Args:
+        url (str): The /fuel-stops/ endpoint URL.
+        concurrency (int): The number of requests in flight at once.
+        timeout (float): The per-request timeout in seconds.
+    """
+
+    def __init__(self, url: str, concurrency: int = 10, timeout: float = 60):
+        self.url = url
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _send(self, payload: dict) -> Tuple[str, float]:
+        started = time.perf_counter()
+        try:
+            response = self.session.post(self.url, json=payload, timeout=self.timeout)
+            outcome = str(response.status_code)
+        except requests.RequestException as e:
+            logger.debug(f"Load test request failed: {e}")
+            outcome = type(e).__name__
+        return outcome, (time.perf_counter() - started) * 1000
+
+    def run(self, payloads: List[dict]) -> dict:
+        """Sends every payload and reports throughput, latency and errors.
+
+        Args:
+            payloads (List[dict]): The request bodies, sent in order.
+
+        Returns:
+            dict: The request count, duration, throughput, error rate,
+            counts per status code or exception name, and the mean and
+            p50/p95/p99 latencies in milliseconds.
+        """
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            results = list(executor.map(self._send, payloads))
+        duration = time.perf_counter() - started
+
+        outcomes = Counter(outcome for outcome, _ in results)
+        errors = sum(
+            count
+            for outcome, count in outcomes.items()
+            if not (outcome.isdigit() and int(outcome) < 400)
+        )
+        return {
+            "requests": len(results),
+            "concurrency": self.concurrency,
+            "duration_s": duration,
+            "throughput_rps": len(results) / duration if duration else 0.0,
+            "error_rate": errors / len(results) if results else 0.0,
+            "outcomes": dict(sorted(outcomes.items())),
+            **summarize([latency for _, latency in results]),
+        }
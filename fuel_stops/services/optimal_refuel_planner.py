@@ -0,0 +1,122 @@
+from decimal import ROUND_HALF_UP, Decimal
+from typing import List, Tuple
+
+from rest_framework.exceptions import ValidationError
+
+# Prices are held in thousandths of a dollar and gallons in thousandths of a
+# gallon, so every purchase costs an exact number of millionths of a dollar.
+PRICE_SCALE = 1000
+GALLON_SCALE = 1000
+GALLON_EXPONENT = -3
+COST_EXPONENT = -6
+
+
+def to_price_units(price) -> int:
+    """Converts a retail price to integer thousandths of a dollar."""
+    return int(
+        (Decimal(str(price)) * PRICE_SCALE).to_integral_value(rounding=ROUND_HALF_UP)
+    )
+
+
+def gallon_units_to_decimal(gallon_units: int) -> Decimal:
+    """Converts thousandths of a gallon back to a Decimal."""
+    return Decimal(gallon_units).scaleb(GALLON_EXPONENT)
+
+
+def cost_units_to_decimal(cost_units: int) -> Decimal:
+    """Converts a cost in millionths of a dollar back to a Decimal."""
+    return Decimal(cost_units).scaleb(COST_EXPONENT)
+
+
+class OptimalRefuelPlanner:
+    """Plans the cheapest refuelling for stations projected onto a route.
+
+    Implements the classic "next cheaper station within range" algorithm with
+    partial fills: at each station the truck buys just enough fuel to reach
+    the next cheaper station, or fills up when there is none within range.
+    Stations must expose ``distance_along`` (meters from the route start)
+    and ``retail_price``. The truck starts with a full tank.
+    """
+
+    def __init__(
+        self,
+        route_length: float,
+        vehicle_range_meters: float,
+        meters_per_gallon: float,
+    ):
+        self.route_length = int(round(route_length))
+        self.vehicle_range = int(vehicle_range_meters)
+        self.meters_per_gallon = meters_per_gallon
+
+    def plan(self, stations: list) -> Tuple[List[Tuple[object, int]], int]:
+        """Computes the cheapest purchases along the route.
+
+        Args:
+            stations (list): Candidate stations in any order.
+
+        Raises:
+            ValidationError: If a gap between stations exceeds the vehicle range.
+
+        Returns:
+            tuple: The purchases as (station, gallons in thousandths) pairs and
+            the total cost in millionths of a dollar.
+        """
+        ordered = sorted(
+            (
+                (
+                    min(max(int(round(station.distance_along)), 0), self.route_length),
+                    to_price_units(station.retail_price),
+                    index,
+                    station,
+                )
+                for index, station in enumerate(stations)
+            ),
+            key=lambda entry: entry[:3],
+        )
+        positions = [entry[0] for entry in ordered] + [self.route_length]
+        prices = [entry[1] for entry in ordered]
+        destination = len(ordered)
+
+        # Monotonic stack: next_cheaper[i] is the first station after i with a
+        # lower price, or the destination when there is none.
+        next_cheaper = [destination] * destination
+        stack = []
+        for i in range(destination - 1, -1, -1):
+            while stack and prices[stack[-1]] >= prices[i]:
+                stack.pop()
+            if stack:
+                next_cheaper[i] = stack[-1]
+            stack.append(i)
+
+        purchases = []
+        total_cost = 0
+        fuel = self.vehicle_range
+
+        # The origin sells no fuel, so the truck drives to the first station.
+        current = 0
+        if positions[0] > fuel:
+            raise ValidationError("No fuel stop found within range.")
+        fuel -= positions[0]
+
+        while current < destination:
+            target = next_cheaper[current]
+            distance = positions[target] - positions[current]
+            if distance <= self.vehicle_range:
+                bought = max(0, distance - fuel)
+                fuel += bought - distance
+            else:
+                target = current + 1
+                distance = positions[target] - positions[current]
+                if distance > self.vehicle_range:
+                    raise ValidationError("No fuel stop found within range.")
+                bought = self.vehicle_range - fuel
+                fuel = self.vehicle_range - distance
+
+            if bought > 0:
+                gallons = round(bought * GALLON_SCALE / self.meters_per_gallon)
+                total_cost += gallons * prices[current]
+                purchases.append((ordered[current][3], gallons))
+
+            current = target
+
+        return purchases, total_cost
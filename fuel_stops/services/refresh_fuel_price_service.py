@@ -0,0 +1,119 @@
+import csv
+import logging
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Dict, Iterator
+
+from django.db import connection, transaction
+
+from fuel_stops.models import FuelStop
+from fuel_stops.utils.copy_stream import CopyStream, csv_chunks
+from fuel_stops.utils.price_version import bump_price_version
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_FIELDS = ["OPIS Truckstop ID", "Retail Price"]
+
+STAGING_TABLE = "fuel_price_refresh_staging"
+
+CREATE_STAGING_TABLE_SQL = f"""
+CREATE TEMPORARY TABLE {STAGING_TABLE} (
+    opis_truckstop integer PRIMARY KEY,
+    retail_price numeric(10, 3) NOT NULL
+) ON COMMIT DROP
+"""
+
+COPY_STAGING_SQL = f"COPY {STAGING_TABLE} FROM STDIN WITH (FORMAT csv)"
+
+COUNT_MISSING_SQL = f"""
+SELECT count(*) FROM {STAGING_TABLE} s
+WHERE NOT EXISTS (
+    SELECT 1 FROM {{table}} f WHERE f.opis_truckstop = s.opis_truckstop
+)
+"""
+
+UPDATE_CHANGED_SQL = f"""
+WITH updated AS (
+    UPDATE {{table}} f
+    SET retail_price = s.retail_price
+    FROM {STAGING_TABLE} s
+    WHERE f.opis_truckstop = s.opis_truckstop
+      AND f.retail_price IS DISTINCT FROM s.retail_price
+    RETURNING f.opis_truckstop
+)
+SELECT count(DISTINCT opis_truckstop) FROM updated
+"""
+
+
+class RefreshFuelPriceService:
+    """Applies a price-only CSV to existing fuel stops.
+
+    Prices are streamed into a staging table with COPY. A single UPDATE
+    then changes only the stops whose price differs. Counts are per OPIS
+    ID: changed, unchanged, and missing from the FuelStop table. Rows
+    without a valid price are skipped. Duplicate IDs keep their first
+    occurrence.
+    """
+
+    def __init__(self, file_path: Path):
+        self.file_path = file_path
+        self.seen_ids = set()
+        self.skipped_count = 0
+        self.staged_count = 0
+
+    def refresh(self) -> Dict[str, int]:
+        """Refreshes prices in one transaction and returns the diff counts."""
+        if not self.file_path.exists():
+            raise FileNotFoundError(f"CSV file not found: {self.file_path}")
+
+        table = FuelStop._meta.db_table
+        with self.file_path.open(newline="", encoding="utf-8") as csvfile:
+            reader = csv.DictReader(csvfile)
+
+            if not all(field in (reader.fieldnames or []) for field in REQUIRED_FIELDS):
+                raise ValueError("CSV is missing one or more required columns")
+
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(CREATE_STAGING_TABLE_SQL)
+                cursor.copy_expert(
+                    COPY_STAGING_SQL, CopyStream(csv_chunks(self._staging_rows(reader)))
+                )
+                cursor.execute(COUNT_MISSING_SQL.format(table=table))
+                missing = cursor.fetchone()[0]
+                cursor.execute(UPDATE_CHANGED_SQL.format(table=table))
+                changed = cursor.fetchone()[0]
+
+                if changed:
+                    bump_price_version()
+
+        return {
+            "changed": changed,
+            "unchanged": self.staged_count - missing - changed,
+            "missing": missing,
+            "skipped": self.skipped_count,
+        }
+
+    def _staging_rows(self, reader: csv.DictReader) -> Iterator[tuple]:
+        """Yields one (id, price) pair per OPIS ID with a valid price."""
+        for row in reader:
+            # Deduplicate on the parsed ID, as "0123" and "123" are one stop.
+            try:
+                truckstop_id = int((row["OPIS Truckstop ID"] or "").strip())
+            except ValueError:
+                self.skipped_count += 1
+                continue
+            if truckstop_id in self.seen_ids:
+                continue
+            self.seen_ids.add(truckstop_id)
+
+            try:
+                price = Decimal((row["Retail Price"] or "").strip())
+            except InvalidOperation:
+                self.skipped_count += 1
+                continue
+            if not price.is_finite() or price < 0:
+                self.skipped_count += 1
+                continue
+
+            self.staged_count += 1
+            yield truckstop_id, price
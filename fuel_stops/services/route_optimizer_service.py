@@ -1,19 +1,78 @@
+import json
 from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterator, List, Optional
 
+from django.conf import settings
 from django.contrib.gis.geos import Point
 from django.contrib.gis.measure import D
+from django.core.exceptions import ImproperlyConfigured
 from geojson import Feature, FeatureCollection
 from geojson import Point as P
 from rest_framework.exceptions import ValidationError
 
-from fuel_stops.constants import MILES_TO_METERS
+from fuel_stops.constants import (
+    FUEL_STOP_LOOKUP_BACKENDS,
+    MILES_TO_METERS,
+    OPTIMIZER_MODES,
+)
 from fuel_stops.models import FuelStop
+from fuel_stops.services.fuel_stop_grid_service import FuelStopGridService
+from fuel_stops.services.optimal_refuel_planner import (
+    OptimalRefuelPlanner,
+    cost_units_to_decimal,
+    gallon_units_to_decimal,
+)
+from fuel_stops.utils.metrics import timed
+from fuel_stops.utils.route_model import RouteModel
+from fuel_stops.utils.spatial_index import FuelStopSpatialIndex, get_spatial_index
+
+CORRIDOR_CANDIDATES_SQL = """
+    SELECT f.id, f.truckstop_name, f.retail_price, f.point,
+           ST_LineLocatePoint(route.geom, f.point::geometry)
+               * ST_Length(route.geom::geography) AS distance_along
+    FROM {table} f,
+         (SELECT ST_SetSRID(ST_GeomFromGeoJSON(%s), 4326) AS geom) route
+    WHERE ST_DWithin(f.point, route.geom::geography, %s)
+    ORDER BY distance_along
+"""
 
 
 class RouteOptimizerService:
     def __init__(
-        self, start: tuple, steps: list, vehicle_range_miles: float, mpg: float
+        self,
+        start: tuple,
+        steps: list,
+        vehicle_range_miles: float,
+        mpg: float,
+        lookup_backend: Optional[str] = None,
+        spatial_index: Optional[FuelStopSpatialIndex] = None,
+        route_geometry: Optional[dict] = None,
+        corridor_width_meters: Optional[float] = None,
+        mode: str = "greedy",
     ):
+        if mode not in OPTIMIZER_MODES:
+            raise ValidationError(f"Unknown optimizer mode: {mode}")
+        self.mode = mode
+        self.lookup_backend = lookup_backend or settings.FUEL_STOP_LOOKUP_BACKEND
+        if self.lookup_backend not in FUEL_STOP_LOOKUP_BACKENDS:
+            raise ImproperlyConfigured(
+                f"Unknown fuel stop lookup backend: {self.lookup_backend}"
+            )
+        # The process-wide index is resolved once per optimizer, so its
+        # price version check does not run on every refuel lookup.
+        if spatial_index is None and self.lookup_backend == "memory":
+            spatial_index = get_spatial_index()
+        self.spatial_index = spatial_index
+        self.route_geometry = route_geometry
+        self.corridor_width_meters = (
+            corridor_width_meters
+            if corridor_width_meters is not None
+            else settings.ROUTE_CORRIDOR_WIDTH_MILES * MILES_TO_METERS
+        )
+        self._corridor_candidates = None
+        self._corridor_index = None
+        self._grid = None
+        self._route_model = None
         self.start = start
         self.steps = steps
         self.vehicle_range_meters = vehicle_range_miles * MILES_TO_METERS
@@ -23,9 +82,24 @@ class RouteOptimizerService:
         self.fuel_stops = []
         self.total_cost = Decimal("0.00")
 
+    @property
+    def route_model(self) -> RouteModel:
+        """The linear-referenced route, built on first use."""
+        if self._route_model is None:
+            self._route_model = RouteModel(
+                (self.route_geometry or {}).get("coordinates", []),
+                [step["distance"] for step in self.steps],
+            )
+        return self._route_model
+
     def find_nearest_fuel_stop(self, point: tuple, within: float) -> FuelStop:
         """Finds the nearest fuel stop to the given point.
 
+        Uses the in-memory spatial index when the "memory" lookup backend is
+        selected, the route corridor candidates for "corridor", and the
+        precomputed grid for "grid". Otherwise, or when the grid cannot answer
+        exactly, queries PostGIS.
+
         Args:
             point (tuple): The point to find the nearest fuel stop to.
             within (float): The maximum distance to search for a fuel stop.
@@ -33,13 +107,63 @@ class RouteOptimizerService:
         Returns:
             FuelStop: The nearest fuel stop to the given point.
         """
-        lon, lat = point
-        geo_point = Point(lon, lat)
-        return (
-            FuelStop.objects.filter(point__dwithin=(geo_point, D(m=within)))
-            .order_by("retail_price")
-            .first()
-        )
+        with timed("find_nearest_fuel_stop", backend=self.lookup_backend):
+            if self.lookup_backend == "memory":
+                return self.spatial_index.cheapest_within(point, within)
+
+            if self.lookup_backend == "corridor" and self.route_geometry:
+                if self._corridor_index is None:
+                    self._corridor_index = FuelStopSpatialIndex(
+                        self.fetch_corridor_candidates()
+                    )
+                return self._corridor_index.cheapest_within(point, within)
+
+            if self.lookup_backend == "grid":
+                if self._grid is None:
+                    self._grid = FuelStopGridService()
+                resolved, fuel_stop = self._grid.cheapest_within(point, within)
+                if resolved:
+                    return fuel_stop
+
+            lon, lat = point
+            geo_point = Point(lon, lat)
+            return (
+                FuelStop.objects.filter(point__dwithin=(geo_point, D(m=within)))
+                .order_by("retail_price")
+                .first()
+            )
+
+    def fetch_corridor_candidates(self) -> List[FuelStop]:
+        """Fetches every fuel stop within the corridor around the route.
+
+        A single query replaces the per-refuel lookups. Each returned stop is
+        annotated with ``distance_along``, its distance in meters from the
+        route start when projected onto the route.
+
+        Returns:
+            List[FuelStop]: The candidate fuel stops ordered along the route.
+        """
+        if self._corridor_candidates is None:
+            sql = CORRIDOR_CANDIDATES_SQL.format(table=FuelStop._meta.db_table)
+            self._corridor_candidates = list(
+                FuelStop.objects.raw(
+                    sql,
+                    [json.dumps(self.route_geometry), self.corridor_width_meters],
+                )
+            )
+        return self._corridor_candidates
+
+    def fetch_route_candidates(self) -> List[FuelStop]:
+        """Fetches the fuel stops along the route with their route positions.
+
+        The "memory" backend projects stops from the in-memory index onto the
+        route model; every other backend uses the corridor query.
+        """
+        if self.lookup_backend == "memory":
+            return self.spatial_index.near_route(
+                self.route_model, self.corridor_width_meters
+            )
+        return self.fetch_corridor_candidates()
 
     def compute_optimal_stops(self):
         """Computes the optimal fuel stops for the given route.
@@ -50,63 +174,149 @@ class RouteOptimizerService:
         Returns:
             tuple: A tuple containing the list of fuel stops and the total cost.
         """
-        for step in self.steps:
-            distance_to_next = step["distance"]
-            if self.remaining_range < distance_to_next:
-                nearest_stop = self.find_nearest_fuel_stop(
-                    self.current_pos, within=100 * MILES_TO_METERS
-                )
-                if not nearest_stop:
-                    raise ValidationError("No fuel stop found within range.")
+        with timed("compute_optimal_stops", mode=self.mode):
+            for _ in self.iter_optimal_stops():
+                pass
+            return self.fuel_stops, self.total_cost
 
-                gallons_bought = Decimal(self.remaining_range / self.mpg).quantize(
-                    Decimal("0.000"), rounding=ROUND_HALF_UP
-                )
-                cost = gallons_bought * nearest_stop.retail_price
-                self.total_cost += cost
-
-                self.fuel_stops.append(
-                    {
-                        "truckstop_name": nearest_stop.truckstop_name,
-                        "retail_price": nearest_stop.retail_price,
-                        "latitude": nearest_stop.point.y,
-                        "longitude": nearest_stop.point.x,
-                        "gallons_bought": gallons_bought,
-                    }
-                )
+    def iter_optimal_stops(self) -> Iterator[dict]:
+        """Yields the optimal fuel stops for the given route as they are found.
+
+        Greedy stops are yielded refuel by refuel; optimal stops once the
+        whole route is planned. Each stop is also appended to fuel_stops and
+        added to total_cost, which is final once the generator is exhausted.
+
+        Raises:
+            ValidationError: If no fuel stop is found within range.
+
+        Yields:
+            dict: The next fuel stop along the route.
+        """
+        if self.mode == "optimal":
+            yield from self.iter_planned_stops()
+            return
+
+        route_model = self.route_model
+        refuel_base = 0.0
+        for index in route_model.refuel_step_indices(self.vehicle_range_meters):
+            step_start = float(route_model.step_starts[index])
+            self.remaining_range = self.vehicle_range_meters - (
+                step_start - refuel_base
+            )
+            nearest_stop = self.find_nearest_fuel_stop(
+                self.current_pos, within=100 * MILES_TO_METERS
+            )
+            if not nearest_stop:
+                raise ValidationError("No fuel stop found within range.")
+
+            gallons_bought = Decimal(self.remaining_range / self.mpg).quantize(
+                Decimal("0.000"), rounding=ROUND_HALF_UP
+            )
+            cost = gallons_bought * nearest_stop.retail_price
+            self.total_cost += cost
+
+            fuel_stop = {
+                "truckstop_name": nearest_stop.truckstop_name,
+                "retail_price": nearest_stop.retail_price,
+                "latitude": nearest_stop.point.y,
+                "longitude": nearest_stop.point.x,
+                "gallons_bought": gallons_bought,
+            }
+            self.fuel_stops.append(fuel_stop)
 
-                self.remaining_range = self.vehicle_range_meters
-                self.current_pos = (nearest_stop.point.x, nearest_stop.point.y)
+            refuel_base = step_start
+            self.current_pos = (nearest_stop.point.x, nearest_stop.point.y)
+            yield fuel_stop
 
-            self.remaining_range -= distance_to_next
+    def iter_planned_stops(self) -> Iterator[dict]:
+        """Yields the globally cheapest fuel stops using partial fills.
 
-        return self.fuel_stops, self.total_cost
+        Candidates are the stations along the route, planned in one pass by
+        OptimalRefuelPlanner. total_cost is set before the first stop.
+
+        Raises:
+            ValidationError: If the route geometry is missing or a stretch of
+                the route has no fuel stop within range.
+
+        Yields:
+            dict: The next fuel stop along the route.
+        """
+        if not self.route_geometry:
+            raise ValidationError("Route geometry is required for optimal planning.")
+
+        planner = OptimalRefuelPlanner(
+            route_length=self.route_model.length,
+            vehicle_range_meters=self.vehicle_range_meters,
+            meters_per_gallon=self.mpg * MILES_TO_METERS,
+        )
+        purchases, cost_units = planner.plan(self.fetch_route_candidates())
+
+        self.fuel_stops = []
+        self.total_cost = cost_units_to_decimal(cost_units)
+        for stop, gallons in purchases:
+            fuel_stop = {
+                "truckstop_name": stop.truckstop_name,
+                "retail_price": stop.retail_price,
+                "latitude": stop.point.y,
+                "longitude": stop.point.x,
+                "gallons_bought": gallon_units_to_decimal(gallons),
+            }
+            self.fuel_stops.append(fuel_stop)
+            yield fuel_stop
 
     def generate_map_geojson(self, route_geometry, fuel_stops):
         """Generates a GeoJSON object for the map data.
 
         Args:
-            route_geometry (LineString): The route geometry.
+            route_geometry (LineString): The route geometry, or an
+                EncodedPolyline geometry from get_route_geometry.
             fuel_stops (list): List of fuel stops.
 
         Returns:
             FeatureCollection: The GeoJSON object for the map data.
         """
 
-        features = []
+        with timed("generate_map_geojson"):
+            features = []
+
+            if route_geometry and route_geometry.get("type") == "EncodedPolyline":
+                features.append(
+                    Feature(
+                        geometry=None,
+                        properties={
+                            "encoded_polyline": route_geometry["polyline"],
+                            "polyline_precision": route_geometry["precision"],
+                        },
+                    )
+                )
+            else:
+                features.append(Feature(geometry=route_geometry))
 
-        features.append(Feature(geometry=route_geometry))
+            if self.route_geometry:
+                route_model = self.route_model
+            else:
+                route_model = RouteModel((route_geometry or {}).get("coordinates", []))
+            distances_along = None
+            if len(route_model.coordinates) > 1 and fuel_stops:
+                distances_along, _ = route_model.project(
+                    [(stop["longitude"], stop["latitude"]) for stop in fuel_stops]
+                )
 
-        for stop in fuel_stops:
-            features.append(
-                Feature(
-                    geometry=P((stop["longitude"], stop["latitude"])),
-                    properties={
-                        "truckstop_name": stop["truckstop_name"],
-                        "retail_price": stop["retail_price"],
-                        "gallons_bought": stop["gallons_bought"],
-                    },
+            for position, stop in enumerate(fuel_stops):
+                properties = {
+                    "truckstop_name": stop["truckstop_name"],
+                    "retail_price": stop["retail_price"],
+                    "gallons_bought": stop["gallons_bought"],
+                }
+                if distances_along is not None:
+                    properties["distance_along_miles"] = round(
+                        float(distances_along[position]) / MILES_TO_METERS, 1
+                    )
+                features.append(
+                    Feature(
+                        geometry=P((stop["longitude"], stop["latitude"])),
+                        properties=properties,
+                    )
                 )
-            )
 
-        return FeatureCollection(features)
+            return FeatureCollection(features)
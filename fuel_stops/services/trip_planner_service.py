@@ -0,0 +1,412 @@
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework.exceptions import ValidationError
+
+from fuel_stops.constants import (
+    MILES_TO_METERS,
+    MPG,
+    NDJSON_GEOMETRY_CHUNK_POINTS,
+    ROUTE_CACHE_TIMEOUT,
+    VEHICLE_RANGE_MILES,
+)
+from fuel_stops.services.route_optimizer_service import RouteOptimizerService
+from fuel_stops.utils.open_route_service import OpenRouteServiceClient, route_cache_key
+from fuel_stops.utils.price_version import get_price_version
+from fuel_stops.utils.route_cache import get_route_cache
+from fuel_stops.utils.route_stitching import stitch_routes
+
+logger = logging.getLogger(__name__)
+
+# Request options that change the plan for a given route.
+PLAN_OPTION_FIELDS = (
+    "mode",
+    "geometry_format",
+    "simplify_tolerance",
+    "polyline_precision",
+    "vehicle_range_miles",
+    "mpg",
+)
+
+# Defaults of the plan options a trip may leave out.
+PLAN_OPTION_DEFAULTS = {"vehicle_range_miles": VEHICLE_RANGE_MILES, "mpg": MPG}
+
+# Process-wide executor for waypoint legs and the pid that created it.
+_leg_executor = None
+_leg_executor_pid = None
+_leg_executor_lock = threading.Lock()
+
+
+def get_leg_executor() -> ThreadPoolExecutor:
+    """Returns the process-wide thread pool that fetches waypoint legs.
+
+    Every trip shares it, so concurrent requests and batch fetches never
+    run more leg fetches than the ORS connection pool holds. A forked
+    child gets its own pool, since its parent's threads do not survive.
+    """
+    global _leg_executor, _leg_executor_pid
+    if _leg_executor is None or _leg_executor_pid != os.getpid():
+        with _leg_executor_lock:
+            if _leg_executor is None or _leg_executor_pid != os.getpid():
+                _leg_executor = ThreadPoolExecutor(
+                    max_workers=settings.ORS_HTTP_POOL_SIZE,
+                    thread_name_prefix="ors-leg",
+                )
+                _leg_executor_pid = os.getpid()
+    return _leg_executor
+
+
+def trip_endpoints(trip: dict) -> tuple:
+    """Returns the (lon, lat) origin and destination of a validated trip."""
+    return (trip["start_lon"], trip["start_lat"]), (trip["end_lon"], trip["end_lat"])
+
+
+def trip_legs(trip: dict) -> List[Tuple[tuple, tuple]]:
+    """Returns the (origin, destination) pairs of a trip's legs in order."""
+    origin, destination = trip_endpoints(trip)
+    points = [
+        origin,
+        *(
+            (waypoint["lon"], waypoint["lat"])
+            for waypoint in trip.get("waypoints") or []
+        ),
+        destination,
+    ]
+    return list(zip(points, points[1:]))
+
+
+def trip_route_key(trip: dict) -> str:
+    """Builds the cache key of a trip's whole route, waypoints included."""
+    return "_via_".join(route_cache_key(*leg) for leg in trip_legs(trip))
+
+
+def plan_cache_key(trip: dict, price_version: str) -> str:
+    """Builds the cache key for a trip's plan under a price snapshot version."""
+    options = "_".join(
+        str(trip.get(field, PLAN_OPTION_DEFAULTS.get(field)))
+        for field in PLAN_OPTION_FIELDS
+    )
+    return f"fuel_plan_{trip_route_key(trip)}_v{price_version}_{options}"
+
+
+def plan_etag(trip: dict, price_version: str, representation: str = "json") -> str:
+    """Builds the strong ETag of a trip's plan under a price snapshot version.
+
+    Args:
+        trip (dict): The validated OptimalFuelStopRouteSerializer data.
+        price_version (str): The price snapshot version.
+        representation (str): The rendered format, such as "json".
+
+    Returns:
+        str: The quoted ETag.
+    """
+    key = f"{plan_cache_key(trip, price_version)}_{representation}"
+    return f'"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+
+def trip_error_message(error: Exception) -> str:
+    """Flattens a validation error raised while planning into a message."""
+    detail = getattr(error, "detail", None) or getattr(error, "messages", None)
+    if isinstance(detail, (list, tuple)) and detail:
+        return str(detail[0])
+    return str(detail or error)
+
+
+class TripPlannerService:
+    """Fetches the route for a validated trip and plans its fuel stops."""
+
+    def __init__(self, ors_client: OpenRouteServiceClient):
+        self.ors_client = ors_client
+
+    def plan_trip(self, trip: dict, price_version: Optional[str] = None) -> dict:
+        """Returns the cached plan for a trip, planning and caching it on a miss.
+
+        Plans are cached under the price version read before planning, so a
+        price update landing mid-plan invalidates the result.
+
+        Args:
+            trip (dict): The validated OptimalFuelStopRouteSerializer data.
+            price_version (str): The price version to plan at, read from the
+                route cache when omitted.
+
+        Returns:
+            dict: The response payload for the trip.
+        """
+        price_version = price_version or get_price_version()
+        cached_plan = self.get_cached_plan(trip, price_version)
+        if cached_plan is not None:
+            return cached_plan
+
+        plan = self.plan(trip, self.fetch_route(trip))
+        self.cache_plan(trip, plan, price_version)
+        return plan
+
+    def get_cached_plan(self, trip: dict, price_version: str) -> Optional[dict]:
+        """Returns the plan cached for the trip at a price version, if any."""
+        return get_route_cache().get(plan_cache_key(trip, price_version))
+
+    def cache_plan(self, trip: dict, plan: dict, price_version: str):
+        """Caches a trip's plan under the price version it was computed at."""
+        get_route_cache().set(
+            plan_cache_key(trip, price_version), plan, timeout=ROUTE_CACHE_TIMEOUT
+        )
+
+    def fetch_route(self, trip: dict) -> dict:
+        """Fetches the ORS route for the trip.
+
+        With waypoints, every leg is fetched concurrently through the ORS
+        client on the shared leg executor, so each leg is cached on its own,
+        and the legs are stitched into one route.
+        """
+        legs = trip_legs(trip)
+        if len(legs) == 1:
+            routes = [self.ors_client.get_route(*legs[0])]
+        else:
+            routes = list(
+                get_leg_executor().map(
+                    lambda leg: self.ors_client.get_route(*leg), legs
+                )
+            )
+        return self._stitch(routes)
+
+    async def fetch_route_async(self, trip: dict) -> dict:
+        """Fetches the trip's route, awaiting every leg concurrently."""
+        routes = await asyncio.gather(
+            *(self.ors_client.get_route(*leg) for leg in trip_legs(trip))
+        )
+        return self._stitch(routes)
+
+    @staticmethod
+    def _stitch(routes: List[dict]) -> dict:
+        if not all(routes):
+            raise ValidationError("No route found between the given points.")
+        return stitch_routes(routes)
+
+    def plan(self, trip: dict, route_data: dict) -> dict:
+        """Computes the fuel stops, total cost and map data for a trip.
+
+        Args:
+            trip (dict): The validated OptimalFuelStopRouteSerializer data.
+            route_data (dict): The route returned by fetch_route.
+
+        Returns:
+            dict: The response payload for the trip.
+        """
+        origin, destination = trip_endpoints(trip)
+
+        optimizer = RouteOptimizerService(
+            start=origin,
+            steps=route_data.get("steps", []),
+            vehicle_range_miles=trip.get("vehicle_range_miles", VEHICLE_RANGE_MILES),
+            mpg=trip.get("mpg", MPG),
+            route_geometry=route_data.get("geometry"),
+            mode=trip["mode"],
+        )
+        fuel_stops, total_cost = optimizer.compute_optimal_stops()
+
+        route_geometry = route_data.get("geometry")
+        if trip["geometry_format"] != "geojson":
+            route_geometry = self.ors_client.get_route_geometry(
+                origin,
+                destination,
+                route_data,
+                geometry_format=trip["geometry_format"],
+                tolerance=trip["simplify_tolerance"],
+                precision=trip["polyline_precision"],
+                route_key=trip_route_key(trip),
+            )
+
+        map_data = optimizer.generate_map_geojson(route_geometry, fuel_stops)
+
+        return {
+            "total_cost": total_cost.quantize(Decimal("0.00")),
+            "fuel_stops": fuel_stops,
+            "map_data": map_data,
+        }
+
+    def iter_plan(self, trip: dict, route_data: dict) -> Iterator[dict]:
+        """Yields a trip's plan as a stream of NDJSON records.
+
+        A summary record comes first, then one record per fuel stop as the
+        optimizer finds it, a total record, and finally the route geometry
+        split into records of NDJSON_GEOMETRY_CHUNK_POINTS coordinates.
+
+        Args:
+            trip (dict): The validated OptimalFuelStopRouteSerializer data.
+            route_data (dict): The route returned by fetch_route.
+
+        Raises:
+            ValidationError: If no fuel stop is found within range.
+
+        Yields:
+            dict: The next record, tagged with its "type".
+        """
+        origin, destination = trip_endpoints(trip)
+        yield {
+            "type": "summary",
+            "mode": trip["mode"],
+            "geometry_format": trip["geometry_format"],
+            "total_distance_miles": round(
+                route_data.get("total_distance", 0) / MILES_TO_METERS, 1
+            ),
+            "total_duration_seconds": route_data.get("total_duration"),
+        }
+
+        optimizer = RouteOptimizerService(
+            start=origin,
+            steps=route_data.get("steps", []),
+            vehicle_range_miles=trip.get("vehicle_range_miles", VEHICLE_RANGE_MILES),
+            mpg=trip.get("mpg", MPG),
+            route_geometry=route_data.get("geometry"),
+            mode=trip["mode"],
+        )
+        route_model = optimizer.route_model
+        for index, fuel_stop in enumerate(optimizer.iter_optimal_stops()):
+            record = {"type": "fuel_stop", "index": index, **fuel_stop}
+            if len(route_model.coordinates) > 1:
+                distances_along, _ = route_model.project(
+                    [(fuel_stop["longitude"], fuel_stop["latitude"])]
+                )
+                record["distance_along_miles"] = round(
+                    float(distances_along[0]) / MILES_TO_METERS, 1
+                )
+            yield record
+
+        yield {
+            "type": "total",
+            "total_cost": optimizer.total_cost.quantize(Decimal("0.00")),
+            "fuel_stop_count": len(optimizer.fuel_stops),
+        }
+
+        route_geometry = route_data.get("geometry")
+        if trip["geometry_format"] != "geojson":
+            route_geometry = self.ors_client.get_route_geometry(
+                origin,
+                destination,
+                route_data,
+                geometry_format=trip["geometry_format"],
+                tolerance=trip["simplify_tolerance"],
+                precision=trip["polyline_precision"],
+                route_key=trip_route_key(trip),
+            )
+        if not route_geometry:
+            return
+        if route_geometry.get("type") == "EncodedPolyline":
+            yield {
+                "type": "route_geometry",
+                "geometry_type": "EncodedPolyline",
+                "encoded_polyline": route_geometry["polyline"],
+                "polyline_precision": route_geometry["precision"],
+            }
+            return
+
+        coordinates = route_geometry.get("coordinates", [])
+        for chunk, offset in enumerate(
+            range(0, len(coordinates), NDJSON_GEOMETRY_CHUNK_POINTS)
+        ):
+            yield {
+                "type": "route_geometry",
+                "geometry_type": route_geometry.get("type"),
+                "chunk": chunk,
+                "coordinates": coordinates[
+                    offset : offset + NDJSON_GEOMETRY_CHUNK_POINTS
+                ],
+            }
+
+
+class BatchTripPlannerService:
+    """Plans many trips, fetching their routes concurrently.
+
+    Routes are fetched through a bounded thread pool, one ORS client per
+    fetch. Trips on the same lane share a single route fetch. Trips that
+    also share plan options share a single plan, and trips with a plan
+    cached at the current price version skip both steps. Planning runs on
+    the calling thread, so database access stays on the request's connection.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], OpenRouteServiceClient],
+        concurrency: int,
+    ):
+        self.client_factory = client_factory
+        self.concurrency = max(1, concurrency)
+
+    def _fetch_route(self, trip: dict) -> tuple:
+        started = time.perf_counter()
+        try:
+            route_data = TripPlannerService(self.client_factory()).fetch_route(trip)
+            return route_data, None, (time.perf_counter() - started) * 1000
+        except (ValidationError, DjangoValidationError) as e:
+            return None, e, (time.perf_counter() - started) * 1000
+
+    def plan(self, trips: List[dict]) -> List[dict]:
+        """Plans every trip and returns per-trip results in input order.
+
+        Args:
+            trips (List[dict]): Validated OptimalFuelStopRouteSerializer data.
+
+        Returns:
+            List[dict]: One result or error entry per trip, with timings.
+        """
+        return list(self.iter_results(trips))
+
+    def iter_results(self, trips: List[dict]) -> Iterator[dict]:
+        """Plans every trip, yielding each result in input order once planned.
+
+        Routes are all fetched before the first result is yielded.
+
+        Args:
+            trips (List[dict]): Validated OptimalFuelStopRouteSerializer data.
+
+        Yields:
+            dict: One result or error entry per trip, with timings.
+        """
+        price_version = get_price_version()
+        plan_keys = [plan_cache_key(trip, price_version) for trip in trips]
+        plans = get_route_cache().get_many(plan_keys)
+
+        lanes = {}
+        for trip, plan_key in zip(trips, plan_keys):
+            if plan_key not in plans:
+                lanes.setdefault(trip_route_key(trip), trip)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            fetched = dict(zip(lanes, executor.map(self._fetch_route, lanes.values())))
+
+        planner = TripPlannerService(self.client_factory())
+        for index, (trip, plan_key) in enumerate(zip(trips, plan_keys)):
+            lane = trip_route_key(trip)
+            route_data, error, route_ms = fetched.get(lane, (None, None, 0.0))
+
+            started = time.perf_counter()
+            if error is None and plan_key not in plans:
+                try:
+                    plans[plan_key] = planner.plan(trip, route_data)
+                    planner.cache_plan(trip, plans[plan_key], price_version)
+                except (ValidationError, DjangoValidationError) as e:
+                    plans[plan_key] = e
+            plan_ms = (time.perf_counter() - started) * 1000
+
+            outcome = plans[plan_key] if plan_key in plans else error
+            entry = {"index": index}
+            if isinstance(outcome, Exception):
+                logger.error(f"Error optimizing fuel stops for trip {index}: {outcome}")
+                entry.update(status="error", error=trip_error_message(outcome))
+            else:
+                entry.update(status="ok", result=outcome)
+            entry["timing_ms"] = {
+                "route": round(route_ms, 3),
+                "plan": round(plan_ms, 3),
+                "total": round(route_ms + plan_ms, 3),
+            }
+            yield entry
@@ -0,0 +1,214 @@
+import logging
+from decimal import Decimal
+from typing import List
+
+import numpy as np
+from rest_framework.exceptions import ValidationError
+
+from fuel_stops.constants import MILES_TO_METERS
+from fuel_stops.services.optimal_refuel_planner import (
+    GALLON_SCALE,
+    cost_units_to_decimal,
+    gallon_units_to_decimal,
+    to_price_units,
+)
+from fuel_stops.services.route_optimizer_service import RouteOptimizerService
+from fuel_stops.services.trip_planner_service import TripPlannerService, trip_endpoints
+from fuel_stops.utils.metrics import timed
+from fuel_stops.utils.open_route_service import OpenRouteServiceClient
+
+logger = logging.getLogger(__name__)
+
+
+class VehicleSweepPlanner:
+    """Plans the cheapest refuelling of many vehicle profiles at once.
+
+    Runs the same "next cheaper station within range" walk as
+    OptimalRefuelPlanner, but over one shared, sorted candidate set: the
+    next-cheaper table is built once, and every step of the walk advances
+    all still-driving profiles together as numpy arrays. Each profile has a
+    vehicle_range_miles and mpg, a starting_fuel fraction of a full tank and
+    reserve_miles of fuel that must never be used.
+
+    With a full tank and no reserve a profile gets the same purchases as
+    OptimalRefuelPlanner with its range and mpg.
+
+    Args:
+        route_length (float): The route length in meters.
+        stations (list): Candidate stations exposing ``distance_along`` and
+            ``retail_price``, in any order.
+    """
+
+    def __init__(self, route_length: float, stations: list):
+        self.route_length = int(round(route_length))
+        ordered = sorted(
+            (
+                min(max(int(round(station.distance_along)), 0), self.route_length),
+                to_price_units(station.retail_price),
+                index,
+            )
+            for index, station in enumerate(stations)
+        )
+        self.positions = np.array(
+            [entry[0] for entry in ordered] + [self.route_length], dtype=np.int64
+        )
+        self.prices = np.array([entry[1] for entry in ordered], dtype=np.int64)
+        self.destination = len(ordered)
+
+        # Same monotonic stack as OptimalRefuelPlanner, with a sentinel entry
+        # for the destination so targets can be looked up for every profile.
+        prices = self.prices.tolist()
+        next_cheaper = [self.destination] * (self.destination + 1)
+        stack = []
+        for i in range(self.destination - 1, -1, -1):
+            while stack and prices[stack[-1]] >= prices[i]:
+                stack.pop()
+            if stack:
+                next_cheaper[i] = stack[-1]
+            stack.append(i)
+        self.next_cheaper = np.array(next_cheaper, dtype=np.int64)
+
+    def evaluate(self, profiles: List[dict]) -> List[dict]:
+        """Computes the cheapest plan of every profile.
+
+        Args:
+            profiles (List[dict]): Validated VehicleProfileSerializer data.
+
+        Returns:
+            List[dict]: Per profile, in input order, its status ("ok" or
+            "infeasible"), total_cost, gallons_bought and fuel_stop_count.
+        """
+        range_meters = (
+            np.array(
+                [profile["vehicle_range_miles"] for profile in profiles], dtype=float
+            )
+            * MILES_TO_METERS
+        )
+        reserve_meters = (
+            np.array([profile.get("reserve_miles", 0) for profile in profiles], float)
+            * MILES_TO_METERS
+        )
+        starting_fuel = np.array(
+            [profile.get("starting_fuel", 1) for profile in profiles], dtype=float
+        )
+        meters_per_gallon = (
+            np.array([profile["mpg"] for profile in profiles], dtype=float)
+            * MILES_TO_METERS
+        )
+
+        # Only fuel above the reserve is usable, so the walk works on that.
+        capacity = (range_meters - reserve_meters).astype(np.int64)
+        fuel = (starting_fuel * range_meters - reserve_meters).astype(np.int64)
+
+        positions = self.positions
+        current = np.zeros(len(profiles), dtype=np.int64)
+        cost_units = np.zeros(len(profiles), dtype=np.int64)
+        gallon_units = np.zeros(len(profiles), dtype=np.int64)
+        stop_counts = np.zeros(len(profiles), dtype=np.int64)
+
+        # The origin sells no fuel, so every truck drives to the first station.
+        feasible = (capacity > 0) & (fuel >= positions[0])
+        fuel -= positions[0]
+        active = np.flatnonzero(feasible & (current < self.destination))
+
+        while active.size:
+            here = current[active]
+            tank = capacity[active]
+            level = fuel[active]
+
+            target = self.next_cheaper[here]
+            distance = positions[target] - positions[here]
+            reachable = distance <= tank
+
+            # Without a cheaper station in range: fill up, drive one station.
+            next_station = here + 1
+            next_distance = positions[next_station] - positions[here]
+            stranded = ~reachable & (next_distance > tank)
+
+            bought = np.where(reachable, np.maximum(distance - level, 0), tank - level)
+            target = np.where(reachable, target, next_station)
+            fuel[active] = np.where(
+                reachable, level + bought - distance, tank - next_distance
+            )
+
+            gallons = np.rint(bought * GALLON_SCALE / meters_per_gallon[active]).astype(
+                np.int64
+            )
+            gallons[stranded] = 0
+            cost_units[active] += gallons * self.prices[here]
+            gallon_units[active] += gallons
+            stop_counts[active] += gallons > 0
+
+            feasible[active[stranded]] = False
+            current[active] = target
+            active = active[~stranded & (target < self.destination)]
+
+        results = []
+        for index in range(len(profiles)):
+            if not feasible[index]:
+                results.append({"index": index, "status": "infeasible"})
+                continue
+            results.append(
+                {
+                    "index": index,
+                    "status": "ok",
+                    "total_cost": cost_units_to_decimal(
+                        int(cost_units[index])
+                    ).quantize(Decimal("0.00")),
+                    "gallons_bought": gallon_units_to_decimal(int(gallon_units[index])),
+                    "fuel_stop_count": int(stop_counts[index]),
+                }
+            )
+        return results
+
+
+class VehicleSweepService:
+    """Evaluates many vehicle profiles against a single trip.
+
+    The route is fetched and the candidate stations along it are looked up
+    once; the profiles are then planned together by VehicleSweepPlanner.
+    """
+
+    def __init__(self, ors_client: OpenRouteServiceClient):
+        self.ors_client = ors_client
+
+    def sweep(self, trip: dict, profiles: List[dict]) -> dict:
+        """Plans the trip for every profile.
+
+        Args:
+            trip (dict): The validated VehicleSweepSerializer data.
+            profiles (List[dict]): Validated VehicleProfileSerializer data.
+
+        Raises:
+            ValidationError: If no route is found between the trip's points.
+
+        Returns:
+            dict: The route distance, the shared candidate count and one
+            result per profile.
+        """
+        route_data = TripPlannerService(self.ors_client).fetch_route(trip)
+        if not route_data.get("geometry"):
+            raise ValidationError("Route geometry is required for a vehicle sweep.")
+        origin, _ = trip_endpoints(trip)
+
+        optimizer = RouteOptimizerService(
+            start=origin,
+            steps=route_data.get("steps", []),
+            vehicle_range_miles=max(p["vehicle_range_miles"] for p in profiles),
+            mpg=profiles[0]["mpg"],
+            route_geometry=route_data.get("geometry"),
+            mode="optimal",
+        )
+        candidates = optimizer.fetch_route_candidates()
+
+        with timed("vehicle_sweep"):
+            planner = VehicleSweepPlanner(optimizer.route_model.length, candidates)
+            results = planner.evaluate(profiles)
+
+        return {
+            "route_distance_miles": round(
+                optimizer.route_model.length / MILES_TO_METERS, 1
+            ),
+            "candidate_count": len(candidates),
+            "results": results,
+        }
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from fuel_stops.models import FuelStop
+from fuel_stops.utils.price_version import bump_price_version
+
+
+@receiver(post_save, sender=FuelStop)
+@receiver(post_delete, sender=FuelStop)
+def fuel_stop_changed(sender, **kwargs):
+    """Invalidates cached plans when a fuel stop is saved or deleted."""
+    bump_price_version()
@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import pytest
+from decouple import Csv, config
+
+from fuel_stops.constants import FUEL_STOP_LOOKUP_BACKENDS
+from fuel_stops.models import FuelStop
+from fuel_stops.services.fuel_stop_grid_service import FuelStopGridService
+from fuel_stops.utils.benchmarking import measure, write_results
+from fuel_stops.utils.price_version import bump_price_version
+from fuel_stops.utils.spatial_index import FuelStopSpatialIndex
+from fuel_stops.utils.synthetic import synthetic_fuel_stops, synthetic_ors_response
+
+BENCHMARK_ITERATIONS = config("BENCHMARK_ITERATIONS", default=20, cast=int)
+BENCHMARK_OUTPUT = Path(
+    config("BENCHMARK_OUTPUT", default="data/benchmarks/latest.json")
+)
+BENCHMARK_STATION_COUNTS = config(
+    "BENCHMARK_STATION_COUNTS", default="1000,10000,100000,1000000", cast=Csv(int)
+)
+
+# (miles, steps) pairs for the synthetic ORS routes.
+BENCHMARK_ROUTES = ((100, 200), (500, 1000), (1500, 3000), (3000, 5000))
+
+
+def route_id(route):
+    miles, steps = route
+    return f"{miles}mi-{steps}steps"
+
+
+@pytest.fixture(scope="session")
+def benchmark_results():
+    """Collects summaries from every benchmark and writes them at the end."""
+    results = {}
+    yield results
+    if results:
+        write_results(BENCHMARK_OUTPUT, results, iterations=BENCHMARK_ITERATIONS)
+
+
+@pytest.fixture(scope="session")
+def run_benchmark(benchmark_results):
+    """Times a zero-argument callable and records its summary under a name."""
+
+    def _run(name, func):
+        summary = measure(func, BENCHMARK_ITERATIONS)
+        benchmark_results[name] = summary
+        return summary
+
+    return _run
+
+
+@pytest.fixture(scope="session", params=BENCHMARK_STATION_COUNTS, ids=str)
+def stations(request):
+    """A synthetic fuel stop dataset of each benchmarked size."""
+    return synthetic_fuel_stops(request.param, seed=request.param)
+
+
+@pytest.fixture(scope="session")
+def station_index(stations):
+    """An in-memory spatial index over the synthetic fuel stops."""
+    return FuelStopSpatialIndex(stations)
+
+
+@pytest.fixture(scope="session")
+def seeded_stations(stations, django_db_setup, django_db_blocker):
+    """Loads the synthetic fuel stops into the test database.
+
+    The rows replace those of the previous dataset size, and the grid is
+    rebuilt for them so the "grid" backend answers from current cells.
+    """
+    with django_db_blocker.unblock():
+        FuelStop.objects.all().delete()
+        FuelStop.objects.bulk_create(stations, batch_size=10_000)
+        bump_price_version()
+        FuelStopGridService().build()
+    return stations
+
+
+@pytest.fixture(
+    params=[
+        pytest.param(
+            backend, marks=() if backend == "memory" else pytest.mark.django_db
+        )
+        for backend in FUEL_STOP_LOOKUP_BACKENDS
+    ]
+)
+def lookup_options(request):
+    """RouteOptimizerService lookup arguments of each backend.
+
+    The "memory" backend searches station_index; the others query the
+    synthetic stops seeded into the database.
+    """
+    if request.param == "memory":
+        return {
+            "lookup_backend": "memory",
+            "spatial_index": request.getfixturevalue("station_index"),
+        }
+    request.getfixturevalue("seeded_stations")
+    return {"lookup_backend": request.param}
+
+
+@pytest.fixture(scope="session", params=BENCHMARK_ROUTES, ids=route_id)
+def ors_response(request):
+    """A synthetic ORS directions response, as (route id, GeoJSON)."""
+    miles, steps = request.param
+    return route_id(request.param), synthetic_ors_response(miles, steps, seed=miles)
@@ -0,0 +1,104 @@
+import pytest
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+
+from fuel_stops.constants import MPG, VEHICLE_RANGE_MILES
+from fuel_stops.renderers import FastJSONRenderer
+from fuel_stops.services.route_optimizer_service import RouteOptimizerService
+from fuel_stops.utils.open_route_service import BaseOpenRouteServiceClient
+
+pytestmark = pytest.mark.benchmark
+
+
+def build_optimizer(route_data, mode, **lookup_options):
+    coordinates = route_data["geometry"]["coordinates"]
+    return RouteOptimizerService(
+        start=tuple(coordinates[0]),
+        steps=route_data["steps"],
+        vehicle_range_miles=VEHICLE_RANGE_MILES,
+        mpg=MPG,
+        route_geometry=route_data["geometry"],
+        mode=mode,
+        **lookup_options,
+    )
+
+
+def memory_optimizer(route_data, station_index, mode):
+    return build_optimizer(
+        route_data, mode, lookup_backend="memory", spatial_index=station_index
+    )
+
+
+def plan_route(route_data, station_index, mode):
+    optimizer = memory_optimizer(route_data, station_index, mode)
+    fuel_stops, total_cost = optimizer.compute_optimal_stops()
+    return {
+        "total_cost": total_cost,
+        "fuel_stops": fuel_stops,
+        "map_data": optimizer.generate_map_geojson(route_data["geometry"], fuel_stops),
+    }
+
+
+def test_benchmark_ors_parse(ors_response, run_benchmark):
+    name, geojson = ors_response
+    client = BaseOpenRouteServiceClient()
+
+    summary = run_benchmark(
+        f"ors_parse[{name}]",
+        lambda: client._simplify_geojson(geojson),
+    )
+
+    assert summary["p99_ms"] >= summary["p50_ms"] > 0
+
+
+@pytest.mark.parametrize("mode", ["greedy", "optimal"])
+def test_benchmark_optimizer(
+    stations, lookup_options, ors_response, mode, run_benchmark
+):
+    name, geojson = ors_response
+    route_data = BaseOpenRouteServiceClient()._simplify_geojson(geojson)
+    try:
+        build_optimizer(route_data, mode, **lookup_options).compute_optimal_stops()
+    except ValidationError as e:
+        pytest.skip(f"No feasible plan at this station density: {e}")
+
+    backend = lookup_options["lookup_backend"]
+    summary = run_benchmark(
+        f"optimizer[{mode}-{backend}-{len(stations)}-{name}]",
+        lambda: build_optimizer(
+            route_data, mode, **lookup_options
+        ).compute_optimal_stops(),
+    )
+
+    assert summary["p99_ms"] >= summary["p50_ms"] > 0
+
+
+def test_benchmark_generate_map_geojson(station_index, ors_response, run_benchmark):
+    name, geojson = ors_response
+    route_data = BaseOpenRouteServiceClient()._simplify_geojson(geojson)
+    optimizer = memory_optimizer(route_data, station_index, "greedy")
+    fuel_stops, _ = optimizer.compute_optimal_stops()
+
+    summary = run_benchmark(
+        f"generate_map_geojson[{station_index.size}-{name}]",
+        lambda: optimizer.generate_map_geojson(route_data["geometry"], fuel_stops),
+    )
+
+    assert summary["p99_ms"] >= summary["p50_ms"] > 0
+
+
+@pytest.mark.parametrize("renderer_class", [JSONRenderer, FastJSONRenderer])
+def test_benchmark_serialization(
+    station_index, ors_response, renderer_class, run_benchmark
+):
+    name, geojson = ors_response
+    route_data = BaseOpenRouteServiceClient()._simplify_geojson(geojson)
+    plan = plan_route(route_data, station_index, "greedy")
+    renderer = renderer_class()
+
+    summary = run_benchmark(
+        f"serialization[{renderer_class.__name__}-{station_index.size}-{name}]",
+        lambda: renderer.render(plan),
+    )
+
+    assert summary["p99_ms"] >= summary["p50_ms"] > 0
@@ -1,9 +1,13 @@
 import csv
+import threading
 from decimal import Decimal
 from unittest.mock import Mock, patch
 
 import pytest
 
+from fuel_stops.utils.fake_ors import FakeORSServer
+from fuel_stops.utils.spatial_index import reset_spatial_index
+
 
 @pytest.fixture
 def mock_command(mock_stdout, mock_stderr):
@@ -98,6 +102,24 @@ def duplicate_csv_data():
     ]
 
 
+@pytest.fixture(autouse=True)
+def route_cache_location(settings, tmp_path):
+    """Keeps the persistent route cache out of the project data directory."""
+    settings.ROUTE_CACHE = {
+        **settings.ROUTE_CACHE,
+        "LOCATION": str(tmp_path / "route_cache.sqlite3"),
+    }
+    return settings.ROUTE_CACHE["LOCATION"]
+
+
+@pytest.fixture(autouse=True)
+def fresh_spatial_index():
+    """Keeps the process-wide fuel stop index from leaking between tests."""
+    reset_spatial_index()
+    yield
+    reset_spatial_index()
+
+
 @pytest.fixture
 def mock_stdout():
     return Mock(write=Mock())
@@ -164,9 +186,7 @@ def call_geocode_command(mock_open_csv):
 
 @pytest.fixture
 def mock_ors_client():
-    with patch(
-        "fuel_stops.utils.open_route_service.OpenRouteServiceClient"
-    ) as mock_class:
+    with patch("fuel_stops.views.OpenRouteServiceClient") as mock_class:
         instance = mock_class.return_value
         instance.get_route.return_value = {
             "steps": [
@@ -183,10 +203,21 @@ def mock_ors_client():
         yield instance
 
 
+@pytest.fixture
+def fake_ors_server(settings):
+    """Serves synthesized ORS routes locally and points ORS_BASE_URL at them."""
+    server = FakeORSServer(("127.0.0.1", 0))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings.ORS_BASE_URL = server.base_url
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
 @pytest.fixture
 def mock_optimizer_service():
     with patch(
-        "fuel_stops.services.route_optimizer_service.RouteOptimizerService"
+        "fuel_stops.services.trip_planner_service.RouteOptimizerService"
     ) as mock_class:
         instance = mock_class.return_value
         instance.compute_optimal_stops.return_value = (
@@ -1,11 +1,20 @@
+import asyncio
 import http
+import json
+import time
 from decimal import Decimal
+from unittest.mock import patch
 
+import pytest
+from django.test import AsyncClient
 from rest_framework.test import APIClient
 
+from fuel_stops.services.trip_planner_service import TripPlannerService
+
 client = APIClient()
 
 
+@pytest.mark.django_db
 def test_valid_input_returns_success(
     sample_valid_data, mock_ors_client, mock_optimizer_service
 ):
@@ -27,3 +36,118 @@ def test_invalid_serializer_returns_bad_request(sample_invalid_data):
 
     assert response.status_code == http.HTTPStatus.BAD_REQUEST
     assert "start_lat must be between -90 and 90." in response.data["error"]
+
+
+@pytest.mark.django_db
+def test_response_reports_server_timing_and_metrics(
+    sample_valid_data, mock_ors_client, mock_optimizer_service
+):
+    response = client.post("/api/fuel-stops/", data=sample_valid_data, format="json")
+    metrics_response = client.get("/metrics")
+
+    assert "total;dur=" in response["Server-Timing"]
+    assert metrics_response.status_code == http.HTTPStatus.OK
+    assert 'view="fuel_stops"' in metrics_response.content.decode()
+
+
+def test_ndjson_accept_streams_summary_stops_total_then_geometry(
+    sample_valid_data, mock_ors_client, mock_optimizer_service
+):
+    stop = {
+        "truckstop_name": "Cheapest Stop",
+        "retail_price": Decimal("3.00"),
+        "latitude": 41.5092474,
+        "longitude": -112.0537895,
+        "gallons_bought": Decimal("49.5"),
+    }
+    mock_optimizer_service.iter_optimal_stops.return_value = iter([stop])
+    mock_optimizer_service.fuel_stops = [stop]
+    mock_optimizer_service.total_cost = Decimal("148.5")
+    mock_optimizer_service.route_model.coordinates = []
+
+    with patch("fuel_stops.middleware.get_metrics_registry") as registry:
+        response = client.post(
+            "/api/fuel-stops/",
+            data=sample_valid_data,
+            format="json",
+            HTTP_ACCEPT="application/x-ndjson",
+        )
+        # The request is only timed once its body has been streamed.
+        registry.return_value.observe.assert_not_called()
+        records = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        registry.return_value.observe.assert_called_once()
+
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert not response.has_header("Server-Timing")
+    assert [record["type"] for record in records] == [
+        "summary",
+        "fuel_stop",
+        "total",
+        "route_geometry",
+    ]
+    assert records[1]["truckstop_name"] == "Cheapest Stop"
+    assert records[2]["total_cost"] == 148.5
+    assert records[3]["coordinates"][0] == [-85.6243147, 30.1755249]
+
+
+@pytest.mark.django_db
+def test_get_returns_etag_and_honours_if_none_match(
+    sample_valid_data, mock_ors_client, mock_optimizer_service
+):
+    with patch(
+        "fuel_stops.services.trip_planner_service.RouteOptimizerService",
+        return_value=mock_optimizer_service,
+    ):
+        response = client.get("/api/fuel-stops/", data=sample_valid_data)
+        revalidated = client.get(
+            "/api/fuel-stops/",
+            data=sample_valid_data,
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        changed = client.get(
+            "/api/fuel-stops/",
+            data={**sample_valid_data, "mode": "optimal"},
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+
+    assert response.status_code == http.HTTPStatus.OK
+    assert response.data["total_cost"] == Decimal("148.50")
+    assert "max-age=86400" in response["Cache-Control"]
+    assert revalidated.status_code == http.HTTPStatus.NOT_MODIFIED
+    assert revalidated["ETag"] == response["ETag"]
+    assert changed["ETag"] != response["ETag"]
+
+
+def test_async_requests_overlap_under_asgi(sample_valid_data):
+    async def fetch_route_async(self, trip):
+        await asyncio.sleep(0.5)
+        return {"steps": [], "geometry": None}
+
+    async def post_concurrently():
+        async_client = AsyncClient()
+        return await asyncio.gather(
+            *(
+                async_client.post(
+                    "/api/fuel-stops/async/",
+                    data={**sample_valid_data, "end_lat": end_lat},
+                    content_type="application/json",
+                )
+                # Distinct trips, so neither is served from the other's plan.
+                for end_lat in (41.5, 42.5)
+            )
+        )
+
+    with patch("fuel_stops.views.get_price_version", return_value="1"), patch.object(
+        TripPlannerService, "fetch_route_async", fetch_route_async
+    ), patch.object(TripPlannerService, "plan", return_value={"total_cost": 1}):
+        started = time.perf_counter()
+        responses = asyncio.run(post_concurrently())
+        elapsed = time.perf_counter() - started
+
+    assert [response.status_code for response in responses] == [200, 200]
+    assert all("total;dur=" in response["Server-Timing"] for response in responses)
+    # Both routes are awaited at once instead of on one shared thread.
+    assert elapsed < 0.9
@@ -0,0 +1,33 @@
+import http
+from decimal import Decimal
+
+import pytest
+from rest_framework.test import APIClient
+
+client = APIClient()
+
+
+@pytest.mark.django_db
+def test_batch_returns_results_in_input_order(
+    sample_valid_data, mock_ors_client, mock_optimizer_service
+):
+    trips = [sample_valid_data, {**sample_valid_data, "end_lat": 40.0}]
+
+    response = client.post("/api/fuel-stops/batch/", data=trips, format="json")
+
+    assert response.status_code == http.HTTPStatus.OK
+    results = response.data["results"]
+    assert [result["index"] for result in results] == [0, 1]
+    assert all(result["status"] == "ok" for result in results)
+    assert results[0]["result"]["total_cost"] == Decimal("148.50")
+    assert set(results[0]["timing_ms"]) == {"route", "plan", "total"}
+
+
+def test_batch_rejects_invalid_trips(sample_valid_data, sample_invalid_data):
+    trips = [sample_valid_data, sample_invalid_data]
+
+    response = client.post("/api/fuel-stops/batch/", data=trips, format="json")
+
+    assert response.status_code == http.HTTPStatus.BAD_REQUEST
+    assert response.data[0] == {}
+    assert "start_lat must be between -90 and 90." in response.data[1]["error"]
@@ -5,6 +5,7 @@ import pytest
 
 from fuel_stops.models import FuelStop
 from fuel_stops.services.import_create_fuelstop_service import (
+    CopyImportFuelStopService,
     ImportCreateFuelStopService,
 )
 
@@ -50,3 +51,21 @@ def test_missing_required_columns_raises_error(mock_dictreader, mock_command, tm
     importer = ImportCreateFuelStopService(csv_file)
     with pytest.raises(ValueError):
         importer.import_csv(mock_command)
+
+
+@pytest.mark.django_db
+def test_copy_import_matches_orm_counts(duplicate_csv_data, mock_command, tmp_path):
+    csv_file = tmp_path / "duplicates.csv"
+    with open(csv_file, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=duplicate_csv_data[0].keys())
+        writer.writeheader()
+        writer.writerows(duplicate_csv_data)
+
+    first = CopyImportFuelStopService(csv_file).import_csv(mock_command)
+    second = CopyImportFuelStopService(csv_file).import_csv(mock_command)
+
+    assert first == 1
+    assert second == 0
+    fuel_stop = FuelStop.objects.get()
+    assert fuel_stop.point.x == pytest.approx(float(duplicate_csv_data[0]["Longitude"]))
+    assert fuel_stop.point.y == pytest.approx(float(duplicate_csv_data[0]["Latitude"]))
@@ -45,3 +45,76 @@ def test_geocode_csv_uses_cache_and_skips_reprocessing(
     assert len(first_run) == len(second_run)
     assert first_run[0]["Latitude"] == second_run[0]["Latitude"]
     assert first_run[0]["Longitude"] == second_run[0]["Longitude"]
+
+
+def test_geocode_csv_chains_offline_before_online(
+    mock_open_csv, mock_geocoder_success, tmp_path
+):
+    from django.core.management import call_command
+
+    gazetteer = tmp_path / "gazetteer.csv"
+    gazetteer.write_text("city,state,latitude,longitude\nSpringfield,IL,39.8,-89.6\n")
+
+    call_command(
+        "geocode_csv",
+        input=str(mock_open_csv["input_file"]),
+        output=str(mock_open_csv["output_file"]),
+        cache=str(mock_open_csv["cache_file"]),
+        backends="offline,online",
+        gazetteer=str(gazetteer),
+    )
+    rows = list(csv.DictReader(open(mock_open_csv["output_file"])))
+
+    assert [(row["Latitude"], row["Longitude"]) for row in rows] == [
+        ("39.8", "-89.6"),
+        ("40.7128", "-74.006"),
+    ]
+    assert mock_geocoder_success.call_count == 1
+
+
+def test_geocode_csv_resume_appends_only_missing_rows(
+    mock_open_csv, mock_geocoder_success, call_geocode_command
+):
+    from django.core.management import call_command
+
+    output_file = call_geocode_command()
+    lines = output_file.read_text().splitlines(keepends=True)
+    # Keep the first row and a partial second line, as after a crash.
+    output_file.write_text("".join(lines[:2]) + lines[2][:10])
+    mock_open_csv["cache_file"].unlink()
+    mock_geocoder_success.reset_mock()
+
+    call_command(
+        "geocode_csv",
+        input=str(mock_open_csv["input_file"]),
+        output=str(output_file),
+        cache=str(mock_open_csv["cache_file"]),
+        resume=True,
+    )
+    rows = list(csv.DictReader(open(output_file)))
+
+    assert [row["OPIS Truckstop ID"] for row in rows] == ["1001", "1002"]
+    assert mock_geocoder_success.call_count == 1
+
+
+def test_geocode_csv_defaults_to_sqlite_cache_and_points_at_migration(
+    mock_open_csv, mock_geocoder_success, tmp_path, monkeypatch
+):
+    from io import StringIO
+
+    from django.core.management import call_command
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "geocode_cache.json").write_text("{}")
+    stdout = StringIO()
+
+    call_command(
+        "geocode_csv",
+        input=str(mock_open_csv["input_file"]),
+        output=str(mock_open_csv["output_file"]),
+        stdout=stdout,
+    )
+
+    assert (tmp_path / "data" / "geocode_cache.sqlite3").exists()
+    assert "run migrate_geocode_cache" in stdout.getvalue()
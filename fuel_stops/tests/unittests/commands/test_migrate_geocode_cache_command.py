@@ -0,0 +1,18 @@
+import json
+
+from fuel_stops.utils.geocode_cache import SQLiteGeocodeCache
+
+
+def test_migrate_geocode_cache_copies_json_into_sqlite(tmp_path):
+    from django.core.management import call_command
+
+    source = tmp_path / "cache.json"
+    source.write_text(json.dumps({"1": [40.0, -74.0], "2": [41.0, -75.0]}))
+    target = tmp_path / "cache.sqlite3"
+
+    call_command("migrate_geocode_cache", source=str(source), target=str(target))
+
+    assert dict(SQLiteGeocodeCache(target).items()) == {
+        "1": (40.0, -74.0),
+        "2": (41.0, -75.0),
+    }
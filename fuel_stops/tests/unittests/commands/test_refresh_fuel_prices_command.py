@@ -0,0 +1,74 @@
+import csv
+import io
+from decimal import Decimal
+
+import pytest
+from django.contrib.gis.geos import Point
+from django.core.management import CommandError, call_command
+
+from fuel_stops.models import FuelStop
+from fuel_stops.services.refresh_fuel_price_service import RefreshFuelPriceService
+
+
+def create_fuel_stop(opis_truckstop, retail_price):
+    return FuelStop.objects.create(
+        opis_truckstop=opis_truckstop,
+        truckstop_name=f"Stop {opis_truckstop}",
+        address="I-44, EXIT 283",
+        city="Big Cabin",
+        state="OK",
+        rack_id=307,
+        retail_price=retail_price,
+        point=Point(-95.2, 36.5),
+    )
+
+
+@pytest.mark.django_db
+def test_refresh_fuel_prices_updates_only_changed_rows(tmp_path, capsys):
+    create_fuel_stop(1, Decimal("3.000"))
+    create_fuel_stop(2, Decimal("3.500"))
+    csv_file = tmp_path / "prices.csv"
+    csv_file.write_text(
+        "OPIS Truckstop ID,Retail Price\n"
+        "1,3.1234\n"
+        "2,3.5\n"
+        "3,4.0\n"
+        "1,9.99\n"
+        "4,n/a\n"
+    )
+
+    call_command("refresh_fuel_prices", input=str(csv_file))
+
+    output = capsys.readouterr().out
+    assert "1 changed, 1 unchanged, 1 missing" in output
+    assert "Skipped 1 rows" in output
+    assert FuelStop.objects.get(opis_truckstop=1).retail_price == Decimal("3.123")
+    assert FuelStop.objects.get(opis_truckstop=2).retail_price == Decimal("3.500")
+
+
+def test_refresh_fuel_prices_requires_price_columns(tmp_path):
+    csv_file = tmp_path / "prices.csv"
+    csv_file.write_text("OPIS Truckstop ID,Price\n1,3.0\n")
+
+    with pytest.raises(CommandError, match="missing one or more required columns"):
+        call_command("refresh_fuel_prices", input=str(csv_file))
+
+
+def test_refresh_stages_ids_that_differ_only_in_format_once(tmp_path):
+    reader = csv.DictReader(
+        io.StringIO(
+            "OPIS Truckstop ID,Retail Price\n"
+            "0123,3.1\n"
+            "123,9.0\n"
+            "+123,8.0\n"
+            "abc,3.0\n"
+            "7,3.2\n"
+        )
+    )
+    service = RefreshFuelPriceService(tmp_path / "prices.csv")
+
+    rows = list(service._staging_rows(reader))
+
+    assert rows == [(123, Decimal("3.1")), (7, Decimal("3.2"))]
+    assert service.skipped_count == 1
+    assert service.staged_count == 2
@@ -0,0 +1,89 @@
+from unittest.mock import Mock, patch
+
+import pandas as pd
+import pytest
+
+from fuel_stops.services.fleet_planning_service import (
+    FleetPlanningService,
+    LaneResultWriter,
+    init_worker,
+    read_lanes,
+)
+from fuel_stops.utils.synthetic import synthetic_fuel_stops
+
+LANES = pd.DataFrame(
+    {
+        "lane": ["okc-tul", "dal-kc", "hou-mem", "aus-stl"],
+        "start_lat": [35.47, 32.78, 29.76, 30.27],
+        "start_lon": [-97.52, -96.80, -95.37, -97.74],
+        "end_lat": [36.15, 39.10, 35.15, 38.63],
+        "end_lon": [-95.99, -94.58, -90.05, -90.20],
+        "vehicle_range_miles": [None, 300, None, None],
+    }
+)
+
+
+def test_run_plans_lanes_in_workers_and_resumes_after_written_chunks(
+    fake_ors_server, tmp_path
+):
+    input_path = tmp_path / "lanes.csv"
+    output_path = tmp_path / "results.csv"
+    LANES.to_csv(input_path, index=False)
+    lanes = read_lanes(input_path, id_column="lane")
+    service = FleetPlanningService(
+        workers=2,
+        chunk_size=2,
+        stations=synthetic_fuel_stops(2000, seed=3, bbox=(-99, 28, -88, 41)),
+    )
+    progress = []
+
+    first = service.run(
+        lanes.head(3),
+        LaneResultWriter(output_path),
+        progress=lambda *a: progress.append(a),
+    )
+    second = service.run(lanes, LaneResultWriter(output_path))
+
+    results = pd.read_csv(output_path)
+    assert list(results["lane_id"]) == list(LANES["lane"])
+    assert set(results["status"]) == {"ok"}
+    # Only the lane with a short-range truck and the longest lane refuel.
+    assert list(results["fuel_stop_count"] > 0) == [False, True, False, True]
+    assert progress == [(2, 3, 0), (3, 3, 0)]
+    assert (first["planned"], first["skipped"]) == (3, 0)
+    assert (second["planned"], second["skipped"]) == (1, 3)
+
+
+def test_run_closes_database_connections_before_forking_workers(tmp_path):
+    input_path = tmp_path / "lanes.csv"
+    LANES.to_csv(input_path, index=False)
+    lanes = read_lanes(input_path, id_column="lane")
+    calls = Mock()
+
+    with patch(
+        "fuel_stops.services.fleet_planning_service.connections"
+    ) as connections, patch(
+        "fuel_stops.services.fleet_planning_service.ProcessPoolExecutor",
+        side_effect=RuntimeError("stop before forking"),
+    ) as pool:
+        calls.attach_mock(connections.close_all, "close_all")
+        calls.attach_mock(pool, "pool")
+        with pytest.raises(RuntimeError):
+            FleetPlanningService(workers=2, stations=[]).run(
+                lanes, LaneResultWriter(tmp_path / "results.csv")
+            )
+
+    assert [name for name, _, _ in calls.mock_calls] == ["close_all", "pool"]
+
+
+def test_init_worker_drops_inherited_connections_without_closing_them():
+    inherited = Mock()
+    wrapper = Mock(connection=inherited)
+
+    with patch("fuel_stops.services.fleet_planning_service.connections") as connections:
+        connections.all.return_value = [wrapper]
+        init_worker(stations=[])
+
+    assert wrapper.connection is None
+    inherited.close.assert_not_called()
+    connections.close_all.assert_not_called()
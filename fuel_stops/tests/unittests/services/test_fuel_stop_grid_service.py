@@ -0,0 +1,40 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.gis.geos import Point
+
+from fuel_stops.models import FuelStop
+from fuel_stops.services.fuel_stop_grid_service import FuelStopGridService
+from fuel_stops.utils.price_version import bump_price_version
+
+
+def create_fuel_stop(opis_truckstop, name, lon, lat, price):
+    return FuelStop.objects.create(
+        opis_truckstop=opis_truckstop,
+        truckstop_name=name,
+        address="",
+        city="",
+        state="",
+        rack_id=1,
+        retail_price=Decimal(price),
+        point=Point(lon, lat),
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_grid_lookup_matches_cheapest_in_range_and_falls_back_when_stale():
+    create_fuel_stop(1, "Far cheap", -90.0, 35.0, "2.500")
+    near = create_fuel_stop(2, "Near", -97.1, 35.1, "3.200")
+    create_fuel_stop(3, "Near pricey", -97.0, 35.0, "3.900")
+    grid = FuelStopGridService(top_k=1)
+
+    counts = grid.build()
+
+    assert all(rows >= 2 for rows in counts.values())
+    assert grid.cheapest_within((-97.0, 35.0), 50_000) == (True, near)
+
+    bump_price_version()
+    # Freshness is checked once per service, so a new run sees the bump.
+    assert grid.cheapest_within((-97.0, 35.0), 50_000) == (True, near)
+    stale = FuelStopGridService(top_k=1)
+    assert stale.cheapest_within((-97.0, 35.0), 50_000) == (False, None)
@@ -0,0 +1,56 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from rest_framework.exceptions import ValidationError
+
+from fuel_stops.services.optimal_refuel_planner import (
+    OptimalRefuelPlanner,
+    cost_units_to_decimal,
+)
+
+
+def station(name, distance_along, price):
+    return SimpleNamespace(
+        truckstop_name=name, distance_along=distance_along, retail_price=Decimal(price)
+    )
+
+
+def test_plan_buys_only_enough_to_reach_cheaper_station():
+    planner = OptimalRefuelPlanner(
+        route_length=1000, vehicle_range_meters=400, meters_per_gallon=10
+    )
+    stations = [
+        station("Expensive", 300, "4.000"),
+        station("Cheap", 500, "3.000"),
+        station("Cheaper", 800, "2.000"),
+    ]
+
+    purchases, cost_units = planner.plan(stations)
+
+    assert [(stop.truckstop_name, gallons) for stop, gallons in purchases] == [
+        ("Expensive", 10000),
+        ("Cheap", 30000),
+        ("Cheaper", 20000),
+    ]
+    assert cost_units_to_decimal(cost_units) == Decimal("170.000000")
+
+
+def test_plan_skips_purchases_when_tank_reaches_destination():
+    planner = OptimalRefuelPlanner(
+        route_length=300, vehicle_range_meters=400, meters_per_gallon=10
+    )
+
+    purchases, cost_units = planner.plan([station("Unused", 100, "3.000")])
+
+    assert purchases == []
+    assert cost_units == 0
+
+
+def test_plan_raises_when_gap_exceeds_range():
+    planner = OptimalRefuelPlanner(
+        route_length=1000, vehicle_range_meters=400, meters_per_gallon=10
+    )
+
+    with pytest.raises(ValidationError):
+        planner.plan([station("Lonely", 300, "3.000")])
@@ -0,0 +1,121 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.contrib.gis.geos import Point
+
+from fuel_stops.constants import MILES_TO_METERS
+from fuel_stops.models import FuelStop
+from fuel_stops.services.route_optimizer_service import RouteOptimizerService
+from fuel_stops.utils.geo import haversine_meters
+from fuel_stops.utils.spatial_index import FuelStopSpatialIndex
+
+ROUTE_GEOMETRY = {
+    "type": "LineString",
+    "coordinates": [[-100.0, 35.0], [-95.0, 35.0]],
+}
+
+# A 566 mile route due east along 35N, in one-degree steps.
+LONG_ROUTE_COORDINATES = [[-100.0 + degree, 35.0] for degree in range(11)]
+LONG_ROUTE_STEPS = [
+    {"distance": haversine_meters(*start, *end)}
+    for start, end in zip(LONG_ROUTE_COORDINATES, LONG_ROUTE_COORDINATES[1:])
+]
+
+
+def create_fuel_stop(opis_id, name, price, lon, lat):
+    return FuelStop.objects.create(
+        opis_truckstop=opis_id,
+        truckstop_name=name,
+        address="",
+        city="",
+        state="",
+        rack_id=1,
+        retail_price=Decimal(price),
+        point=Point(lon, lat),
+    )
+
+
+def unsaved_fuel_stop(opis_id, price, lon, lat=35.0):
+    return FuelStop(
+        id=opis_id,
+        opis_truckstop=opis_id,
+        truckstop_name=f"Stop {opis_id}",
+        address="",
+        city="",
+        state="",
+        rack_id=1,
+        retail_price=Decimal(price),
+        point=Point(lon, lat, srid=4326),
+    )
+
+
+def long_route_optimizer(**options):
+    return RouteOptimizerService(
+        start=tuple(LONG_ROUTE_COORDINATES[0]),
+        steps=LONG_ROUTE_STEPS,
+        vehicle_range_miles=400,
+        mpg=10,
+        route_geometry={"type": "LineString", "coordinates": LONG_ROUTE_COORDINATES},
+        **options,
+    )
+
+
+@pytest.mark.django_db
+def test_fetch_corridor_candidates_returns_stops_near_route_in_order():
+    create_fuel_stop(1, "East", "3.100", -95.5, 35.01)
+    create_fuel_stop(2, "West", "3.300", -99.5, 34.99)
+    create_fuel_stop(3, "Off Route", "2.900", -97.0, 38.0)
+
+    optimizer = RouteOptimizerService(
+        start=(-100.0, 35.0),
+        steps=[],
+        vehicle_range_miles=500,
+        mpg=10,
+        lookup_backend="corridor",
+        route_geometry=ROUTE_GEOMETRY,
+        corridor_width_meters=10 * MILES_TO_METERS,
+    )
+    candidates = optimizer.fetch_corridor_candidates()
+
+    assert [stop.truckstop_name for stop in candidates] == ["West", "East"]
+    assert candidates[0].distance_along < candidates[1].distance_along
+
+
+def test_memory_backend_resolves_the_shared_index_once_per_optimizer():
+    index = FuelStopSpatialIndex(
+        [unsaved_fuel_stop(1, "4.000", -99.5), unsaved_fuel_stop(2, "3.000", -95.0)]
+    )
+
+    with patch(
+        "fuel_stops.services.route_optimizer_service.get_spatial_index",
+        return_value=index,
+    ) as get_spatial_index:
+        optimizer = long_route_optimizer(lookup_backend="memory")
+        optimizer.compute_optimal_stops()
+        optimizer.fetch_route_candidates()
+
+    get_spatial_index.assert_called_once()
+
+
+def test_optimal_mode_buys_no_more_stops_and_costs_no_more_than_greedy():
+    index = FuelStopSpatialIndex(
+        [
+            unsaved_fuel_stop(1, "4.000", -99.5),
+            unsaved_fuel_stop(2, "3.000", -95.0),
+            unsaved_fuel_stop(3, "3.500", -92.0),
+        ]
+    )
+
+    greedy_stops, greedy_cost = long_route_optimizer(
+        lookup_backend="memory", spatial_index=index
+    ).compute_optimal_stops()
+    optimal_stops, optimal_cost = long_route_optimizer(
+        lookup_backend="memory", spatial_index=index, mode="optimal"
+    ).compute_optimal_stops()
+
+    assert [stop["truckstop_name"] for stop in optimal_stops] == ["Stop 2"]
+    assert optimal_stops[0]["gallons_bought"] == Decimal("16.598")
+    assert optimal_cost == Decimal("49.794")
+    assert len(optimal_stops) <= len(greedy_stops)
+    assert optimal_cost <= greedy_cost
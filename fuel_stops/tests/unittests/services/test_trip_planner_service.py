@@ -0,0 +1,84 @@
+import threading
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+import pytest
+
+from fuel_stops.services.trip_planner_service import (
+    TripPlannerService,
+    get_leg_executor,
+)
+from fuel_stops.utils.open_route_service import OpenRouteServiceClient
+from fuel_stops.utils.price_version import bump_price_version
+
+TRIP = {
+    "start_lat": 35.0,
+    "start_lon": -97.0,
+    "end_lat": 36.0,
+    "end_lon": -96.0,
+    "mode": "greedy",
+    "geometry_format": "geojson",
+    "simplify_tolerance": 25.0,
+    "polyline_precision": 5,
+}
+PLAN = {"total_cost": Decimal("10.00"), "fuel_stops": [], "map_data": {}}
+
+
+@pytest.mark.django_db
+def test_plan_trip_serves_cached_plan_until_prices_change():
+    ors_client = Mock()
+    ors_client.get_route.return_value = {"steps": [], "geometry": None}
+    planner = TripPlannerService(ors_client)
+
+    with patch.object(TripPlannerService, "plan", return_value=PLAN) as plan:
+        first = planner.plan_trip(TRIP)
+        second = planner.plan_trip(TRIP)
+        bump_price_version()
+        third = planner.plan_trip(TRIP)
+
+    assert first == second == third == PLAN
+    assert plan.call_count == 2
+    assert ors_client.get_route.call_count == 2
+
+
+def test_fetch_route_caches_legs_independently_and_stitches_them(fake_ors_server):
+    routes = fake_ors_server.routes
+    waypoints = [{"lat": 35.5, "lon": -96.5}, {"lat": 35.8, "lon": -96.2}]
+
+    with patch.object(routes, "route", wraps=routes.route) as fetched:
+        planner = TripPlannerService(OpenRouteServiceClient())
+        route = planner.fetch_route({**TRIP, "waypoints": waypoints})
+        planner.fetch_route({**TRIP, "waypoints": waypoints[:1]})
+
+    coordinates = route["geometry"]["coordinates"]
+    assert coordinates[0] == [-97.0, 35.0]
+    assert [-96.5, 35.5] in coordinates
+    assert coordinates[-1] == [-96.0, 36.0]
+    assert len(route["legs"]) == 3
+    assert route["total_distance"] == sum(
+        leg["total_distance"] for leg in route["legs"]
+    )
+    # The second trip reuses the cached first leg and fetches one new leg.
+    assert fetched.call_count == 4
+
+
+def test_waypoint_legs_are_fetched_on_the_shared_leg_executor():
+    fetch_threads = []
+
+    def get_route(origin, destination):
+        fetch_threads.append(threading.current_thread().name)
+        return {
+            "steps": [],
+            "total_distance": 1.0,
+            "geometry": {"type": "LineString", "coordinates": [origin, destination]},
+        }
+
+    ors_client = Mock()
+    ors_client.get_route.side_effect = get_route
+    planner = TripPlannerService(ors_client)
+    planner.fetch_route({**TRIP, "waypoints": [{"lat": 35.5, "lon": -96.5}]})
+    planner.fetch_route({**TRIP, "waypoints": [{"lat": 35.8, "lon": -96.2}]})
+
+    assert len(fetch_threads) == 4
+    assert all(name.startswith("ors-leg") for name in fetch_threads)
+    assert get_leg_executor() is get_leg_executor()
@@ -0,0 +1,75 @@
+import random
+from decimal import Decimal
+from types import SimpleNamespace
+
+from rest_framework.exceptions import ValidationError
+
+from fuel_stops.constants import MILES_TO_METERS
+from fuel_stops.services.optimal_refuel_planner import (
+    OptimalRefuelPlanner,
+    cost_units_to_decimal,
+)
+from fuel_stops.services.vehicle_sweep_service import VehicleSweepPlanner
+
+
+def station(distance_along, price):
+    return SimpleNamespace(
+        truckstop_name="Stop", distance_along=distance_along, retail_price=price
+    )
+
+
+def test_full_tank_profiles_match_optimal_refuel_planner():
+    rng = random.Random(7)
+    route_length = 3000 * MILES_TO_METERS
+    stations = [
+        station(rng.uniform(0, route_length), Decimal(rng.randint(3000, 5000)) / 1000)
+        for _ in range(300)
+    ]
+    profiles = [
+        {"vehicle_range_miles": rng.choice([60, 250, 400, 500, 800]), "mpg": mpg}
+        for mpg in (6, 6.5, 7, 8.2, 10, 12)
+        for _ in range(5)
+    ]
+
+    results = VehicleSweepPlanner(route_length, stations).evaluate(profiles)
+
+    for profile, result in zip(profiles, results):
+        planner = OptimalRefuelPlanner(
+            route_length=route_length,
+            vehicle_range_meters=profile["vehicle_range_miles"] * MILES_TO_METERS,
+            meters_per_gallon=profile["mpg"] * MILES_TO_METERS,
+        )
+        try:
+            purchases, cost_units = planner.plan(stations)
+        except ValidationError:
+            assert result["status"] == "infeasible"
+            continue
+        assert result["status"] == "ok"
+        assert result["total_cost"] == cost_units_to_decimal(cost_units).quantize(
+            Decimal("0.00")
+        )
+        assert result["fuel_stop_count"] == len(purchases)
+    assert {result["status"] for result in results} == {"ok", "infeasible"}
+
+
+def test_starting_fuel_and_reserve_change_purchases():
+    miles = MILES_TO_METERS
+    stations = [station(100 * miles, Decimal("4.000"))]
+    planner = VehicleSweepPlanner(300 * miles, stations)
+
+    full, half, reserved, empty = planner.evaluate(
+        [
+            {"vehicle_range_miles": 400, "mpg": 10},
+            {"vehicle_range_miles": 400, "mpg": 10, "starting_fuel": 0.5},
+            {"vehicle_range_miles": 400, "mpg": 10, "reserve_miles": 150},
+            {"vehicle_range_miles": 400, "mpg": 10, "starting_fuel": 0.2},
+        ]
+    )
+
+    assert full["total_cost"] == 0
+    # 200 miles in the tank, 100 used to reach the stop: buy 10 gallons.
+    assert half["gallons_bought"] == Decimal("10.000")
+    assert half["total_cost"] == Decimal("40.00")
+    # 250 usable miles, 150 left at the stop: buy 5 gallons.
+    assert reserved["gallons_bought"] == Decimal("5.000")
+    assert empty["status"] == "infeasible"
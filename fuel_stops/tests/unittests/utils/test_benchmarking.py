@@ -0,0 +1,34 @@
+import pytest
+
+from fuel_stops.constants import MILES_TO_METERS
+from fuel_stops.utils.benchmarking import compare_results, load_results, write_results
+from fuel_stops.utils.open_route_service import BaseOpenRouteServiceClient
+from fuel_stops.utils.synthetic import synthetic_ors_response
+
+
+def test_compare_results_orders_by_slowdown(tmp_path):
+    path = tmp_path / "results.json"
+    write_results(
+        path,
+        {"a": {"p95_ms": 10.0}, "b": {"p95_ms": 10.0}, "old": {"p95_ms": 1.0}},
+    )
+    baseline = load_results(path)
+    current = {"a": {"p95_ms": 9.0}, "b": {"p95_ms": 15.0}, "new": {"p95_ms": 1.0}}
+
+    rows = compare_results(baseline, current)
+
+    assert [row["name"] for row in rows] == ["b", "a"]
+    assert rows[0]["change"] == pytest.approx(0.5)
+    assert rows[1]["change"] == pytest.approx(-0.1)
+
+
+def test_synthetic_ors_response_parses_to_requested_shape():
+    geojson = synthetic_ors_response(miles=200, steps=50, seed=1)
+
+    route_data = BaseOpenRouteServiceClient()._simplify_geojson(geojson)
+
+    assert len(route_data["steps"]) == 50
+    assert len(route_data["geometry"]["coordinates"]) == 2000
+    assert sum(step["distance"] for step in route_data["steps"]) == pytest.approx(
+        200 * MILES_TO_METERS, rel=1e-3
+    )
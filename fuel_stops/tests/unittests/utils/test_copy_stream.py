@@ -0,0 +1,22 @@
+import csv
+
+from fuel_stops.utils.copy_stream import CopyStream, csv_chunks
+
+
+def test_copy_stream_reads_chunked_csv_in_any_sizes():
+    rows = [(i, f"Stop, #{i}", 3.25) for i in range(25)]
+    stream = CopyStream(csv_chunks(rows, chunk_rows=4))
+
+    first_line = stream.readline()
+    parts = [first_line]
+    while True:
+        part = stream.read(7)
+        if not part:
+            break
+        parts.append(part)
+
+    text = "".join(parts)
+    assert first_line == '0,"Stop, #0",3.25\n'
+    assert list(csv.reader(text.splitlines())) == [
+        [str(i), f"Stop, #{i}", "3.25"] for i in range(25)
+    ]
@@ -0,0 +1,52 @@
+import threading
+
+import pytest
+from rest_framework.exceptions import ValidationError
+
+from fuel_stops.services.load_test_service import LoadTestService, random_trips
+from fuel_stops.utils.fake_ors import FakeORSServer
+from fuel_stops.utils.open_route_service import OpenRouteServiceClient
+
+
+@pytest.fixture
+def fake_ors(settings):
+    def _start(**options):
+        server = FakeORSServer(("127.0.0.1", 0), **options)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        settings.ORS_BASE_URL = server.base_url
+        servers.append(server)
+        return server
+
+    servers = []
+    yield _start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_client_parses_synthesized_route_between_endpoints(fake_ors):
+    fake_ors()
+    origin, destination = (-97.0, 35.0), (-90.0, 38.0)
+
+    route = OpenRouteServiceClient().get_route(origin, destination)
+
+    coordinates = route["geometry"]["coordinates"]
+    assert coordinates[0] == list(origin)
+    assert coordinates[-1] == list(destination)
+    assert sum(step["distance"] for step in route["steps"]) == pytest.approx(
+        route["total_distance"], rel=1e-3
+    )
+
+
+def test_injected_errors_fail_the_route_and_count_in_load_test(fake_ors):
+    server = fake_ors(error_rate=1.0, error_status=500)
+
+    with pytest.raises(ValidationError):
+        OpenRouteServiceClient().get_route((-97.0, 35.0), (-90.0, 38.0))
+
+    summary = LoadTestService(
+        server.base_url + "/v2/directions/driving-hgv/geojson", concurrency=2
+    ).run(random_trips(4))
+    assert summary["requests"] == 4
+    assert summary["error_rate"] == 1.0
+    assert summary["outcomes"] == {"500": 4}
@@ -0,0 +1,41 @@
+import json
+
+from fuel_stops.utils.geocode_cache import (
+    GeocodeCache,
+    SQLiteGeocodeCache,
+    open_geocode_cache,
+)
+
+
+def test_json_cache_batches_writes_and_flushes_on_close(tmp_path):
+    path = tmp_path / "cache.json"
+
+    with GeocodeCache(path, flush_every=2) as cache:
+        cache.set("1", 40.0, -74.0)
+        assert not path.exists()
+        cache.set("2", 41.0, -75.0)
+        assert json.loads(path.read_text()) == {"1": [40.0, -74.0], "2": [41.0, -75.0]}
+        cache.set("3", 42.0, -76.0)
+
+    assert json.loads(path.read_text())["3"] == [42.0, -76.0]
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_sqlite_cache_reads_pending_and_persisted_entries(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+
+    with SQLiteGeocodeCache(path, flush_every=2) as cache:
+        cache.set("1", 40.0, -74.0)
+        assert cache.get("1") == (40.0, -74.0)
+        cache.set("2", 41.0, -75.0)
+        cache.set("3", 42.0, -76.0)
+
+    reopened = open_geocode_cache(path)
+    assert isinstance(reopened, SQLiteGeocodeCache)
+    assert reopened.get("3") == (42.0, -76.0)
+    assert reopened.get("missing") is None
+    assert dict(reopened.items()) == {
+        "1": (40.0, -74.0),
+        "2": (41.0, -75.0),
+        "3": (42.0, -76.0),
+    }
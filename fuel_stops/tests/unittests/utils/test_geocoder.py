@@ -0,0 +1,55 @@
+from unittest.mock import Mock
+
+import pytest
+
+from fuel_stops.utils.geocoder import ChainedGeocoder, OfflineGeocoder
+
+ROWS = [
+    {"Address": "I-44, EXIT 283 & US-69", "City": "Big Cabin", "State": "OK"},
+    {"Address": "US-50", "City": "Tomah", "State": "WI"},
+    {"Address": "I-29 & I-80, EXIT 1B", "City": "Nowhere", "State": "IA"},
+    {"Address": "US-13", "City": "Unknown", "State": "DE"},
+]
+
+
+@pytest.fixture
+def reference_tables(tmp_path):
+    exits = tmp_path / "exits.csv"
+    exits.write_text(
+        "Highway,Exit,State,Latitude,Longitude\n"
+        "I-44,283,OK,36.5,-95.2\n"
+        "I-29,1b,IA,41.2,-95.8\n"
+    )
+    gazetteer = tmp_path / "gazetteer.csv"
+    gazetteer.write_text(
+        "city,state,latitude,longitude\n"
+        "BIG CABIN,OK,36.53,-95.22\n"
+        "Tomah,wi,43.98,-90.50\n"
+    )
+    return gazetteer, exits
+
+
+def test_offline_geocoder_prefers_exits_then_gazetteer(reference_tables):
+    gazetteer, exits = reference_tables
+    geocoder = OfflineGeocoder(gazetteer_path=gazetteer, exits_path=exits)
+
+    assert geocoder.geocode(ROWS) == [
+        (36.5, -95.2),
+        (43.98, -90.5),
+        (41.2, -95.8),
+        None,
+    ]
+
+
+def test_chained_geocoder_falls_back_and_counts_per_backend(reference_tables):
+    gazetteer, _ = reference_tables
+    online = Mock()
+    online.name = "online"
+    online.geocode.return_value = [(1.0, 2.0), None]
+    geocoder = ChainedGeocoder([OfflineGeocoder(gazetteer_path=gazetteer), online])
+
+    results = geocoder.geocode(ROWS)
+
+    assert results == [(36.53, -95.22), (43.98, -90.5), (1.0, 2.0), None]
+    assert online.geocode.call_args.args[0] == [ROWS[2], ROWS[3]]
+    assert geocoder.resolved == {"offline": 2, "online": 1}
@@ -0,0 +1,15 @@
+from fuel_stops.utils.geohash import cell_size, cells_covering, encode
+
+
+def test_encode_matches_reference_geohashes():
+    assert encode(-5.6, 42.6, 5) == "ezs42"
+    assert encode(10.40744, 57.64911, 11) == "u4pruydqqvj"
+
+
+def test_cells_covering_spans_bounding_box():
+    width, height = cell_size(3)
+    cells = cells_covering(-97.0, 35.0, -97.0 + width, 35.0 + height, 3)
+
+    assert len(cells) == 4
+    assert encode(-97.0, 35.0, 3) in cells
+    assert encode(-97.0 + width, 35.0 + height, 3) in cells
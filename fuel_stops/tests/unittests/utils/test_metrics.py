@@ -0,0 +1,39 @@
+from fuel_stops.utils.metrics import (
+    PHASE_METRIC,
+    MetricsRegistry,
+    collect_request_timings,
+    get_metrics_registry,
+    timed,
+)
+
+
+def test_render_prometheus_reports_cumulative_buckets():
+    registry = MetricsRegistry()
+    registry.observe(PHASE_METRIC, 0.002, phase="ors_get_route", cache="hit")
+    registry.observe(PHASE_METRIC, 0.2, phase="ors_get_route", cache="hit")
+
+    text = registry.render_prometheus()
+
+    labels = 'cache="hit",phase="ors_get_route"'
+    assert f"# TYPE {PHASE_METRIC} histogram" in text
+    assert f'{PHASE_METRIC}_bucket{{{labels},le="0.001"}} 0' in text
+    assert f'{PHASE_METRIC}_bucket{{{labels},le="0.0025"}} 1' in text
+    assert f'{PHASE_METRIC}_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"{PHASE_METRIC}_count{{{labels}}} 2" in text
+
+
+def test_timed_sums_repeated_phases_into_server_timing():
+    with collect_request_timings() as timings:
+        for _ in range(3):
+            with timed("find_nearest_fuel_stop", backend="memory"):
+                pass
+        with timed("ors_get_route", cache="hit") as timing:
+            timing.labels["cache"] = "miss"
+
+    header = timings.server_timing(total_seconds=0.05)
+
+    assert "find_nearest_fuel_stop;dur=" in header
+    assert 'desc="memory x3"' in header
+    assert 'desc="miss"' in header
+    assert header.endswith("total;dur=50.0")
+    assert 'phase="ors_get_route"' in get_metrics_registry().render_prometheus()
@@ -0,0 +1,138 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from fuel_stops.utils.open_route_service import (
+    AsyncOpenRouteServiceClient,
+    BaseOpenRouteServiceClient,
+    OpenRouteServiceClient,
+    get_async_http_client,
+    get_http_session,
+)
+from fuel_stops.utils.route_cache import get_route_cache
+
+ORS_RESPONSE = {
+    "features": [
+        {
+            "properties": {
+                "summary": {"distance": 1000.0, "duration": 60.0},
+                "segments": [{"steps": [{"distance": 1000.0, "duration": 60.0}]}],
+            },
+            "geometry": {
+                "type": "LineString",
+                "coordinates": [[-97.0, 35.0], [-96.99, 35.0]],
+            },
+        }
+    ]
+}
+
+
+def test_sync_clients_share_pooled_http_session():
+    first = OpenRouteServiceClient()
+    second = OpenRouteServiceClient()
+
+    assert first.client.session is get_http_session()
+    assert second.client.session is first.client.session
+
+
+def test_sync_client_sends_requests_through_the_shared_session(fake_ors_server):
+    session = get_http_session()
+
+    with patch.object(session, "request", wraps=session.request) as request:
+        route = OpenRouteServiceClient().get_route((-97.0, 35.0), (-96.0, 35.5))
+
+    assert route["total_distance"] > 0
+    request.assert_called_once()
+    assert request.call_args.args[1].startswith(fake_ors_server.base_url)
+
+
+def test_async_client_parses_and_caches_route():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=ORS_RESPONSE)
+
+    async def fetch_twice():
+        http_client = httpx.AsyncClient(
+            base_url="https://ors.test", transport=httpx.MockTransport(handler)
+        )
+        client = AsyncOpenRouteServiceClient(http_client=http_client)
+        first = await client.get_route((-97.0, 35.0), (-96.99, 35.0))
+        second = await client.get_route((-97.0, 35.0), (-96.99, 35.0))
+        await http_client.aclose()
+        return first, second
+
+    first, second = asyncio.run(fetch_twice())
+
+    assert len(requests) == 1
+    assert requests[0].url.path == "/v2/directions/driving-hgv/geojson"
+    assert first == second
+    assert first["total_distance"] == 1000.0
+    assert first["steps"][0]["distance"] == 1000.0
+
+
+def test_async_client_retries_unavailable_responses():
+    statuses = iter([503, 429, 200])
+
+    def handler(request):
+        status = next(statuses)
+        return httpx.Response(status, json=ORS_RESPONSE if status == 200 else {})
+
+    async def fetch():
+        async with httpx.AsyncClient(
+            base_url="https://ors.test", transport=httpx.MockTransport(handler)
+        ) as http_client:
+            client = AsyncOpenRouteServiceClient(http_client=http_client)
+            return await client.get_route((-97.0, 35.0), (-96.99, 35.0))
+
+    with patch(
+        "fuel_stops.utils.open_route_service.ors_retry_delay_seconds",
+        return_value=0,
+    ):
+        route = asyncio.run(fetch())
+
+    assert route["total_distance"] == 1000.0
+    assert next(statuses, None) is None
+
+
+def test_async_http_client_is_pooled_per_loop_and_closed_with_it():
+    async def get_twice():
+        return await get_async_http_client(), await get_async_http_client()
+
+    first, second = asyncio.run(get_twice())
+
+    assert first is second
+    assert first.is_closed
+
+
+def test_snap_mode_reuses_route_cached_for_nearby_endpoints(settings):
+    settings.ROUTE_CACHE_SNAP_METERS = 100
+    client = BaseOpenRouteServiceClient()
+    client._cache_route((-97.0, 35.0), (-96.99, 35.0), ORS_RESPONSE)
+
+    # About 30 m from each cached endpoint.
+    route = client._get_cached_route((-97.0, 35.00027), (-96.99, 35.00027))
+    missed = client._get_cached_route((-97.0, 35.01), (-96.99, 35.0))
+    exact = client._get_cached_route((-97.0, 35.0), (-96.99, 35.0))
+
+    assert missed is None
+    assert exact["total_distance"] == 1000.0
+    assert route["geometry"]["coordinates"][0] == [-97.0, 35.00027]
+    assert route["geometry"]["coordinates"][-1] == [-96.99, 35.00027]
+    assert route["total_distance"] == pytest.approx(1060.0, abs=1.0)
+    assert route["steps"][0]["distance"] == route["total_distance"]
+
+    stats = get_route_cache().stats()
+    assert stats["route_exact_hits"] == 1
+    assert stats["route_snapped_hits"] == 1
+    assert stats["route_misses"] == 1
+
+
+def test_snap_mode_is_off_by_default():
+    client = BaseOpenRouteServiceClient()
+    client._cache_route((-97.0, 35.0), (-96.99, 35.0), ORS_RESPONSE)
+
+    assert client._get_cached_route((-97.0, 35.00027), (-96.99, 35.00027)) is None
@@ -0,0 +1,35 @@
+from fuel_stops.utils.polyline import encode_polyline, simplify_coordinates
+
+
+def test_encode_polyline_matches_reference_encoding():
+    coordinates = [[-120.2, 38.5], [-120.95, 40.7], [-126.453, 43.252]]
+
+    assert encode_polyline(coordinates) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+
+
+def test_simplify_coordinates_drops_collinear_points():
+    coordinates = [[-100.0, 35.0], [-99.5, 35.0], [-99.0, 35.0], [-99.0, 36.0]]
+
+    assert simplify_coordinates(coordinates, tolerance=10) == [
+        [-100.0, 35.0],
+        [-99.0, 35.0],
+        [-99.0, 36.0],
+    ]
+
+
+def test_simplify_coordinates_keeps_points_beyond_tolerance():
+    coordinates = [[-100.0, 35.0], [-99.5, 35.1], [-99.0, 35.0]]
+
+    assert simplify_coordinates(coordinates, tolerance=10) == coordinates
+
+
+def test_simplify_tolerance_is_in_meters_away_from_the_prime_meridian():
+    # A north-south line at -100° whose middle point bulges 50 m east.
+    bulge = 50 / (111194.9 * 0.8186)
+    coordinates = [[-100.0, 35.0], [-100.0 + bulge, 35.05], [-100.0, 35.1]]
+
+    assert simplify_coordinates(coordinates, tolerance=60) == [
+        coordinates[0],
+        coordinates[-1],
+    ]
+    assert simplify_coordinates(coordinates, tolerance=40) == coordinates
@@ -0,0 +1,17 @@
+import pytest
+
+from fuel_stops.models import FuelPriceVersion
+from fuel_stops.utils.price_version import bump_price_version, get_price_version
+
+
+@pytest.mark.django_db
+def test_get_price_version_reads_zero_until_the_first_bump():
+    FuelPriceVersion.objects.all().delete()
+
+    assert get_price_version() == "0"
+    assert not FuelPriceVersion.objects.exists()
+
+    version = bump_price_version()
+    assert version not in ("0", None)
+    assert get_price_version() == version
+    assert bump_price_version() != version
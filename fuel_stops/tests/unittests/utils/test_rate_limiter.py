@@ -0,0 +1,14 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fuel_stops.utils.rate_limiter import RateLimiter
+
+
+def test_rate_limiter_caps_rate_across_threads():
+    limiter = RateLimiter(rate=100)
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: limiter.acquire(), range(21)))
+
+    assert time.monotonic() - started >= 0.19
@@ -0,0 +1,44 @@
+import json
+from decimal import Decimal
+
+import pytest
+from geojson import Feature, FeatureCollection, Point
+from rest_framework.renderers import JSONRenderer
+
+from fuel_stops import renderers
+from fuel_stops.renderers import FastJSONRenderer
+
+
+@pytest.fixture
+def plan():
+    return {
+        "total_cost": Decimal("148.50"),
+        "fuel_stops": [{"truckstop_name": "Stop", "retail_price": Decimal("3.199")}],
+        "map_data": FeatureCollection(
+            [
+                Feature(
+                    geometry=Point((-97.0, 35.0)),
+                    properties={"gallons_bought": Decimal("49.5")},
+                )
+            ]
+        ),
+    }
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_fast_renderer_matches_drf_renderer(plan, monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(renderers, "orjson", None)
+
+    rendered = FastJSONRenderer().render(plan)
+
+    assert json.loads(rendered) == json.loads(JSONRenderer().render(plan))
+
+
+def test_fast_renderer_rounds_decimals_to_fixed_places(plan, settings):
+    settings.FAST_JSON_DECIMAL_PLACES = 2
+
+    rendered = json.loads(FastJSONRenderer().render(plan))
+
+    assert rendered["fuel_stops"][0]["retail_price"] == 3.2
+    assert rendered["total_cost"] == 148.5
@@ -0,0 +1,139 @@
+import time
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from fuel_stops.utils.route_cache import (
+    DjangoRouteCache,
+    SQLiteRouteCache,
+    dumps,
+    get_route_cache,
+)
+
+
+def test_sqlite_route_cache_is_shared_between_instances(tmp_path):
+    location = tmp_path / "routes.sqlite3"
+    route = {"total_distance": 1000.0, "geometry": {"coordinates": [[0, 0]] * 100}}
+
+    SQLiteRouteCache(location).set("route", route, timeout=60)
+    reader = SQLiteRouteCache(location)
+
+    assert reader.get("route") == route
+    assert reader.get("missing") is None
+    assert reader.stats()["hits"] == 1
+    assert reader.stats()["misses"] == 1
+
+
+def test_sqlite_route_cache_evicts_least_recently_used_over_budget(tmp_path):
+    payload = list(range(1500))
+    entry_bytes = len(dumps({"key": "first", "payload": payload}))
+    route_cache = SQLiteRouteCache(
+        tmp_path / "routes.sqlite3", max_bytes=entry_bytes * 2 + 10, touch_seconds=0
+    )
+
+    route_cache.set("first", {"key": "first", "payload": payload})
+    route_cache.set("second", {"key": "second", "payload": payload})
+    time.sleep(0.01)
+    route_cache.get("first")
+    route_cache.set("third", {"key": "third", "payload": payload})
+
+    stats = route_cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= stats["max_bytes"]
+    assert route_cache.get("second") is None
+    assert route_cache.get("first") is not None
+    assert route_cache.get("third") is not None
+
+
+def test_sqlite_route_cache_hits_do_not_write_until_flushed(tmp_path):
+    location = tmp_path / "routes.sqlite3"
+    route_cache = SQLiteRouteCache(location, stats_flush_seconds=3600)
+    route_cache.set("route", {"total_distance": 1.0})
+    accessed_at = (
+        route_cache._connection()
+        .execute("SELECT accessed_at FROM route_cache")
+        .fetchone()[0]
+    )
+
+    for _ in range(3):
+        route_cache.get("route")
+    route_cache.get_many(["route", "missing"])
+
+    assert SQLiteRouteCache(location).stats()["hits"] == 0
+    assert (
+        route_cache._connection()
+        .execute("SELECT accessed_at FROM route_cache")
+        .fetchone()[0]
+        == accessed_at
+    )
+    assert route_cache.stats()["hits"] == 4
+    assert route_cache.stats()["misses"] == 1
+
+
+def test_sqlite_route_cache_keeps_a_running_byte_total(tmp_path):
+    route_cache = SQLiteRouteCache(tmp_path / "routes.sqlite3")
+    route_cache.set("first", {"payload": list(range(100))})
+    route_cache.set("second", {"payload": list(range(200))})
+    route_cache.set("first", {"payload": list(range(300))})
+    route_cache.delete("second")
+
+    assert (
+        route_cache.stats()["bytes"]
+        == route_cache._connection()
+        .execute("SELECT SUM(size) FROM route_cache")
+        .fetchone()[0]
+    )
+
+
+def test_sqlite_route_cache_expires_entries(tmp_path):
+    route_cache = SQLiteRouteCache(tmp_path / "routes.sqlite3")
+    route_cache.set("route", {"total_distance": 1.0}, timeout=1)
+    route_cache._connection().execute(
+        "UPDATE route_cache SET expires_at = ?", (time.time() - 1,)
+    )
+
+    assert route_cache.get("route") is None
+    assert route_cache.stats()["entries"] == 0
+
+
+def test_get_route_cache_follows_settings(settings, tmp_path):
+    first = get_route_cache()
+    settings.ROUTE_CACHE = {
+        **settings.ROUTE_CACHE,
+        "LOCATION": str(tmp_path / "other.sqlite3"),
+    }
+
+    assert get_route_cache() is not first
+    assert get_route_cache().path == tmp_path / "other.sqlite3"
+
+
+def test_route_cache_counts_hits_per_kind_of_key(tmp_path):
+    route_cache = SQLiteRouteCache(tmp_path / "routes.sqlite3")
+    route_key = "ors_route_1.000000_2.000000_to_3.000000_4.000000"
+    route_cache.set(route_key, {"total_distance": 1000.0})
+    route_cache.set(f"fuel_plan_{route_key}_v1_500", {"fuel_stops": []})
+
+    route_cache.get(route_key)
+    route_cache.get_many([f"fuel_plan_{route_key}_v1_500", f"{route_key}_geometry_x"])
+    route_cache.get("ors_snap_500_1_2")
+
+    stats = route_cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+    assert (stats["hits_route"], stats.get("misses_route", 0)) == (1, 0)
+    assert (stats["hits_plan"], stats["misses_geometry"]) == (1, 1)
+    assert stats["misses_snap_index"] == 1
+
+
+def test_get_route_cache_defaults_the_location_per_backend(settings):
+    settings.ROUTE_CACHE = {
+        "BACKEND": "fuel_stops.utils.route_cache.DjangoRouteCache",
+        "LOCATION": "",
+    }
+
+    assert get_route_cache().cache is DjangoRouteCache().cache
+
+
+def test_django_route_cache_rejects_an_unknown_alias():
+    with pytest.raises(ImproperlyConfigured, match="not a CACHES alias"):
+        DjangoRouteCache("/var/cache/route_cache.sqlite3")
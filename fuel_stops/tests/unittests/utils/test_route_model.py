@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from fuel_stops.utils.route_model import RouteModel
+
+COORDINATES = [[-100.0, 35.0], [-99.0, 35.0], [-98.0, 35.0]]
+
+
+def test_cumulative_distances_and_bearings():
+    model = RouteModel(COORDINATES)
+
+    assert model.cumulative[0] == 0
+    assert model.length == pytest.approx(182_200, rel=0.01)
+    assert model.bearings[0] == pytest.approx(90, abs=1)
+
+
+def test_refuel_step_indices_match_greedy_step_loop():
+    step_distances = [490.0, 200.0, 250.0, 100.0, 600.0, 50.0]
+    model = RouteModel(COORDINATES, step_distances)
+
+    expected = []
+    remaining = 500.0
+    for index, distance in enumerate(step_distances):
+        if remaining < distance:
+            expected.append(index)
+            remaining = 500.0
+        remaining -= distance
+
+    assert model.refuel_step_indices(500.0).tolist() == expected
+
+
+def test_project_returns_distance_along_and_offset():
+    model = RouteModel(COORDINATES)
+
+    along, offsets = model.project([[-99.0, 35.1], [-101.0, 35.0]])
+
+    assert along[0] == pytest.approx(model.cumulative[1], rel=0.001)
+    assert offsets[0] == pytest.approx(11_120, rel=0.01)
+    assert along[1] == 0
+    assert np.all(offsets > 0)
@@ -0,0 +1,66 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.gis.geos import Point
+
+from fuel_stops.constants import MILES_TO_METERS
+from fuel_stops.models import FuelStop
+from fuel_stops.utils.route_model import RouteModel
+from fuel_stops.utils.spatial_index import FuelStopSpatialIndex
+
+
+@pytest.fixture
+def fuel_stops():
+    return [
+        FuelStop(
+            id=1,
+            truckstop_name="Near",
+            retail_price=Decimal("3.500"),
+            point=Point(-97.0, 35.0),
+        ),
+        FuelStop(
+            id=2,
+            truckstop_name="Cheap",
+            retail_price=Decimal("3.100"),
+            point=Point(-97.5, 35.5),
+        ),
+        FuelStop(
+            id=3,
+            truckstop_name="Far",
+            retail_price=Decimal("2.900"),
+            point=Point(-90.0, 40.0),
+        ),
+    ]
+
+
+def test_cheapest_within_returns_cheapest_stop_in_radius(fuel_stops):
+    index = FuelStopSpatialIndex(fuel_stops, cell_degrees=0.25)
+
+    stop = index.cheapest_within((-97.0, 35.0), within=100 * MILES_TO_METERS)
+
+    assert stop.truckstop_name == "Cheap"
+
+
+def test_cheapest_within_ignores_stops_outside_radius(fuel_stops):
+    index = FuelStopSpatialIndex(fuel_stops)
+
+    stop = index.cheapest_within((-97.0, 35.0), within=10 * MILES_TO_METERS)
+
+    assert stop.truckstop_name == "Near"
+
+
+def test_cheapest_within_returns_none_when_nothing_in_range(fuel_stops):
+    index = FuelStopSpatialIndex(fuel_stops)
+
+    assert index.cheapest_within((-120.0, 45.0), within=100 * MILES_TO_METERS) is None
+
+
+def test_near_route_returns_stops_in_corridor_with_distance_along(fuel_stops):
+    index = FuelStopSpatialIndex(fuel_stops, cell_degrees=0.5)
+    route_model = RouteModel([[-98.0, 35.0], [-96.0, 35.0]])
+
+    candidates = index.near_route(route_model, within=10 * MILES_TO_METERS)
+
+    assert [stop.truckstop_name for stop in candidates] == ["Near"]
+    assert candidates[0].distance_along == pytest.approx(91_100, rel=0.01)
+    assert not hasattr(fuel_stops[0], "distance_along")
@@ -1,7 +1,27 @@
 from django.urls import path
 
-from fuel_stops.views import OptimalFuelStopRouteAPIView
+from fuel_stops.views import (
+    OptimalFuelStopRouteAPIView,
+    OptimalFuelStopRouteBatchAPIView,
+    VehicleSweepAPIView,
+    optimal_fuel_stop_route_async,
+)
 
 urlpatterns = [
     path("fuel-stops/", OptimalFuelStopRouteAPIView.as_view(), name="fuel_stops"),
+    path(
+        "fuel-stops/batch/",
+        OptimalFuelStopRouteBatchAPIView.as_view(),
+        name="fuel_stops_batch",
+    ),
+    path(
+        "fuel-stops/sweep/",
+        VehicleSweepAPIView.as_view(),
+        name="fuel_stops_sweep",
+    ),
+    path(
+        "fuel-stops/async/",
+        optimal_fuel_stop_route_async,
+        name="fuel_stops_async",
+    ),
 ]
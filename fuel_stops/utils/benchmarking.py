@@ -0,0 +1,104 @@
+import json
+import platform
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Returns the nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(
+        0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1)
+    )
+    return sorted_values[rank]
+
+
+def summarize(timings_ms: List[float]) -> Dict[str, float]:
+    """Summarizes a list of timings in milliseconds."""
+    ordered = sorted(timings_ms)
+    return {
+        "iterations": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) if ordered else 0.0,
+        "p50_ms": percentile(ordered, 50),
+        "p95_ms": percentile(ordered, 95),
+        "p99_ms": percentile(ordered, 99),
+    }
+
+
+def measure(func: Callable[[], object], iterations: int) -> Dict[str, float]:
+    """Calls func repeatedly and returns its latency distribution.
+
+    Args:
+        func (Callable): The zero-argument callable to time.
+        iterations (int): How many times to call it.
+
+    Returns:
+        Dict[str, float]: Mean and p50/p95/p99 latencies in milliseconds.
+    """
+    timings_ms = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        timings_ms.append((time.perf_counter() - started) * 1000)
+    return summarize(timings_ms)
+
+
+def write_results(path: Path, results: Dict[str, Dict[str, float]], **metadata):
+    """Writes benchmark summaries to a JSON file.
+
+    Args:
+        path (Path): The output file, created with its parent directories.
+        results (Dict): Summaries from measure() keyed by benchmark name.
+        **metadata: Extra top-level fields, such as the iteration count.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        **metadata,
+        "results": dict(sorted(results.items())),
+    }
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+
+def load_results(path: Path) -> Dict[str, Dict[str, float]]:
+    """Reads the benchmark summaries written by write_results."""
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare_results(
+    baseline: Dict[str, Dict[str, float]],
+    current: Dict[str, Dict[str, float]],
+    metric: str = "p95_ms",
+) -> List[Dict[str, object]]:
+    """Compares one latency metric between two benchmark runs.
+
+    Args:
+        baseline (Dict): Summaries from the reference run.
+        current (Dict): Summaries from the run being checked.
+        metric (str): The summary field to compare, such as "p95_ms".
+
+    Returns:
+        List[Dict]: One row per benchmark present in both runs, with the
+        baseline and current values and the relative change (0.1 is 10%
+        slower), slowest change first.
+    """
+    rows = []
+    for name in baseline.keys() & current.keys():
+        before = baseline[name][metric]
+        after = current[name][metric]
+        rows.append(
+            {
+                "name": name,
+                "baseline_ms": before,
+                "current_ms": after,
+                "change": (after - before) / before if before else 0.0,
+            }
+        )
+    return sorted(rows, key=lambda row: row["change"], reverse=True)
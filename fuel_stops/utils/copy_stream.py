@@ -0,0 +1,66 @@
+import csv
+import io
+from typing import Iterable, Iterator, Sequence
+
+# Rows formatted per chunk handed to COPY.
+COPY_CHUNK_ROWS = 1000
+
+
+def csv_chunks(
+    rows: Iterable[Sequence], chunk_rows: int = COPY_CHUNK_ROWS
+) -> Iterator[str]:
+    """Formats rows as CSV text, a chunk of rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+class CopyStream(io.TextIOBase):
+    """Read-only file over an iterator of text chunks, for cursor.copy_expert.
+
+    Lets COPY ... FROM STDIN consume rows as they are produced instead of
+    materializing the whole payload in memory.
+    """
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self._buffer = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+        if size < 0:
+            data, self._buffer = self._buffer, ""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def readline(self, size: int = -1) -> str:
+        while "\n" not in self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+        end = self._buffer.find("\n") + 1 or len(self._buffer)
+        if 0 <= size < end:
+            end = size
+        line, self._buffer = self._buffer[:end], self._buffer[end:]
+        return line
@@ -0,0 +1,173 @@
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import cycle
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from fuel_stops.constants import MILES_TO_METERS
+from fuel_stops.utils.geo import haversine_meters
+from fuel_stops.utils.synthetic import (
+    ors_response_from_coordinates,
+    route_coordinates_between,
+)
+
+logger = logging.getLogger(__name__)
+
+DIRECTIONS_PATHS = (
+    "/v2/directions/driving-hgv/geojson",
+    "/v2/directions/driving-hgv",
+)
+
+# Synthesized routes are this much longer than the straight-line distance.
+ROUTE_DETOUR_FACTOR = 1.2
+MAX_SYNTHETIC_STEPS = 5000
+
+
+def endpoint_key(origin, destination) -> Tuple[float, float, float, float]:
+    """Rounds a route's endpoints so recorded routes can be matched."""
+    return tuple(round(float(value), 4) for value in (*origin, *destination))
+
+
+class FakeORSRoutes:
+    """Produces the directions responses served by FakeORSServer.
+
+    Recorded responses are replayed when a replay directory is given: a
+    recording whose endpoints match the request is preferred, otherwise the
+    recordings are served in turn. Without recordings, a route between the
+    requested endpoints is synthesized.
+
+    Args:
+        replay_dir (Path): Directory of recorded ORS GeoJSON responses.
+        steps_per_mile (float): Step density of synthesized routes.
+        vertices_per_mile (float): Vertex density of synthesized routes.
+    """
+
+    def __init__(
+        self,
+        replay_dir: Optional[Path] = None,
+        steps_per_mile: float = 0.5,
+        vertices_per_mile: float = 10,
+    ):
+        self.steps_per_mile = steps_per_mile
+        self.vertices_per_mile = vertices_per_mile
+        self.recorded: Dict[tuple, dict] = {}
+        recordings: List[dict] = []
+
+        for path in sorted(Path(replay_dir).glob("*.json")) if replay_dir else []:
+            with path.open("r", encoding="utf-8") as f:
+                response = json.load(f)
+            coordinates = response["features"][0]["geometry"]["coordinates"]
+            self.recorded[endpoint_key(coordinates[0], coordinates[-1])] = response
+            recordings.append(response)
+
+        self._replay = cycle(recordings) if recordings else None
+        self._lock = threading.Lock()
+
+    def route(self, origin: tuple, destination: tuple) -> dict:
+        """Returns the directions response for a pair of (lon, lat) points."""
+        recorded = self.recorded.get(endpoint_key(origin, destination))
+        if recorded is not None:
+            return recorded
+        if self._replay is not None:
+            with self._lock:
+                return next(self._replay)
+
+        miles = (
+            haversine_meters(*origin, *destination)
+            * ROUTE_DETOUR_FACTOR
+            / MILES_TO_METERS
+        )
+        steps = max(1, min(MAX_SYNTHETIC_STEPS, round(miles * self.steps_per_mile)))
+        vertices = max(steps + 1, round(miles * self.vertices_per_mile))
+        seed = hash(endpoint_key(origin, destination)) & 0xFFFFFFFF
+        coordinates = route_coordinates_between(origin, destination, vertices, seed)
+        return ors_response_from_coordinates(coordinates, steps, seed=seed)
+
+
+class FakeORSRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/geo+json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+
+        if self.path.split("?")[0] not in DIRECTIONS_PATHS:
+            self._send_json(404, {"error": {"code": 2099, "message": "Not found"}})
+            return
+
+        delay = server.latency_seconds + random.uniform(0, server.jitter_seconds)
+        if delay:
+            time.sleep(delay)
+
+        if random.random() < server.error_rate:
+            self._send_json(
+                server.error_status,
+                {"error": {"code": 2099, "message": "Injected failure"}},
+            )
+            return
+
+        try:
+            coordinates = json.loads(body)["coordinates"]
+            origin, destination = coordinates[0], coordinates[-1]
+        except (ValueError, KeyError, IndexError, TypeError):
+            self._send_json(
+                400, {"error": {"code": 2003, "message": "Invalid coordinates"}}
+            )
+            return
+
+        self._send_json(200, server.routes.route(tuple(origin), tuple(destination)))
+
+
+class FakeORSServer(ThreadingHTTPServer):
+    """Local stand-in for the ORS driving-hgv directions endpoint.
+
+    Point ORS_BASE_URL at it to run the API without the ORS quota.
+
+    Args:
+        address (tuple): The (host, port) to bind, port 0 picking a free one.
+        routes (FakeORSRoutes): Produces the route responses.
+        latency_ms (float): Delay added before every response.
+        jitter_ms (float): Upper bound of extra random delay per response.
+        error_rate (float): Fraction of requests answered with error_status.
+        error_status (int): HTTP status used for injected errors.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        routes: Optional[FakeORSRoutes] = None,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0,
+        error_status: int = 503,
+    ):
+        super().__init__(address, FakeORSRequestHandler)
+        self.routes = routes or FakeORSRoutes()
+        self.latency_seconds = latency_ms / 1000
+        self.jitter_seconds = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.error_status = error_status
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
@@ -0,0 +1,23 @@
+from math import asin, cos, radians, sin, sqrt
+
+from fuel_stops.constants import EARTH_RADIUS_METERS
+
+
+def haversine_meters(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
+    """Computes the great-circle distance between two points.
+
+    Args:
+        lon1 (float): Longitude of the first point.
+        lat1 (float): Latitude of the first point.
+        lon2 (float): Longitude of the second point.
+        lat2 (float): Latitude of the second point.
+
+    Returns:
+        float: The distance between the two points in meters.
+    """
+    phi1 = radians(lat1)
+    phi2 = radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = radians(lon2 - lon1)
+    a = sin(d_phi / 2) ** 2 + cos(phi1) * cos(phi2) * sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * asin(min(1.0, sqrt(a)))
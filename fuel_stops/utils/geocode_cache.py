@@ -1,15 +1,45 @@
 import json
 import logging
+import os
+import sqlite3
+import tempfile
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# Number of new entries buffered before a cache writes them out.
+DEFAULT_FLUSH_EVERY = 100
+
+SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+
 
 class GeocodeCache:
-    def __init__(self, path: Path):
+    """Geocode cache stored as a JSON object of id -> [lat, lon].
+
+    The file is read on first use. New entries are buffered and the file is
+    rewritten every flush_every sets and on flush(). Each rewrite goes to a
+    temporary file that then replaces the cache, so a crash mid-write leaves
+    the previous version intact.
+    """
+
+    def __init__(self, path: Path, flush_every: int = DEFAULT_FLUSH_EVERY):
         self.path = path
-        self.data: Dict[str, Tuple[float, float]] = self._load()
+        self.flush_every = flush_every
+        self._data: Optional[Dict[str, Tuple[float, float]]] = None
+        self._unsaved = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def data(self) -> Dict[str, Tuple[float, float]]:
+        if self._data is None:
+            self._data = self._load()
+        return self._data
 
     def _load(self) -> Dict[str, Tuple[float, float]]:
         """Loads the geocode cache from a JSON file."""
@@ -27,10 +57,131 @@ class GeocodeCache:
         return self.data.get(key)
 
     def set(self, key: str, lat: float, lon: float):
-        """Sets the geocode for a given key."""
+        """Sets the geocode for a given key, flushing every flush_every sets."""
         self.data[key] = (lat, lon)
-        self.save()
+        self._unsaved += 1
+        if self._unsaved >= self.flush_every:
+            self.flush()
+
+    def items(self) -> Iterator[Tuple[str, Tuple[float, float]]]:
+        """Iterates over every cached (key, (lat, lon)) pair."""
+        return iter(self.data.items())
+
+    def flush(self):
+        """Writes buffered entries to disk."""
+        if self._unsaved:
+            self.save()
 
     def save(self):
-        with self.path.open("w", encoding="utf-8") as f:
-            json.dump(self.data, f, indent=2)
+        """Atomically rewrites the cache file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self._unsaved = 0
+
+    def close(self):
+        self.flush()
+
+
+class SQLiteGeocodeCache:
+    """Geocode cache stored in a SQLite table.
+
+    Lookups read single rows, so nothing is loaded up front. New entries are
+    buffered and written in one transaction every flush_every sets and on
+    flush(). A crash loses at most the unflushed buffer.
+    """
+
+    def __init__(self, path: Path, flush_every: int = DEFAULT_FLUSH_EVERY):
+        self.path = path
+        self.flush_every = flush_every
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pending: Dict[str, Tuple[float, float]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=30)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS geocodes ("
+                "key TEXT PRIMARY KEY, latitude REAL NOT NULL, longitude REAL NOT NULL)"
+            )
+        return self._connection
+
+    def get(self, key: str) -> Optional[Tuple[float, float]]:
+        """Gets the geocode for a given key."""
+        if key in self._pending:
+            return self._pending[key]
+        row = self.connection.execute(
+            "SELECT latitude, longitude FROM geocodes WHERE key = ?", (key,)
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def set(self, key: str, lat: float, lon: float):
+        """Sets the geocode for a given key, flushing every flush_every sets."""
+        self._pending[key] = (lat, lon)
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def update(self, entries: Iterable[Tuple[str, Tuple[float, float]]]):
+        """Writes many (key, (lat, lon)) pairs in a single transaction."""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO geocodes (key, latitude, longitude) "
+                "VALUES (?, ?, ?)",
+                ((key, lat, lon) for key, (lat, lon) in entries),
+            )
+
+    def items(self) -> Iterator[Tuple[str, Tuple[float, float]]]:
+        """Iterates over every cached (key, (lat, lon)) pair."""
+        self.flush()
+        for key, lat, lon in self.connection.execute(
+            "SELECT key, latitude, longitude FROM geocodes"
+        ):
+            yield key, (lat, lon)
+
+    def flush(self):
+        """Writes buffered entries to disk."""
+        if self._pending:
+            self.update(self._pending.items())
+            self._pending.clear()
+
+    def close(self):
+        self.flush()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def open_geocode_cache(
+    path: Path, flush_every: int = DEFAULT_FLUSH_EVERY
+) -> Union[GeocodeCache, SQLiteGeocodeCache]:
+    """Opens a geocode cache, choosing the backend from the file suffix.
+
+    Args:
+        path (Path): A .json file, or a .sqlite, .sqlite3 or .db file.
+        flush_every (int): Number of new entries buffered between writes.
+
+    Returns:
+        Union[GeocodeCache, SQLiteGeocodeCache]: The opened cache.
+    """
+    if path.suffix.lower() in SQLITE_SUFFIXES:
+        return SQLiteGeocodeCache(path, flush_every=flush_every)
+    return GeocodeCache(path, flush_every=flush_every)
@@ -1,17 +1,72 @@
 import logging
-from typing import Optional, Tuple
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
 
+import pandas as pd
 from geopy.exc import GeocoderServiceError, GeocoderTimedOut
 from geopy.geocoders import Nominatim
 
+from fuel_stops.utils.rate_limiter import RateLimiter
+
 logger = logging.getLogger(__name__)
 
+Coordinate = Tuple[float, float]
+
+# Nominatim's usage policy allows at most one request per second.
+NOMINATIM_MAX_REQUESTS_PER_SECOND = 1.0
+
+# First interstate and exit number of OPIS addresses such as
+# "I-44, EXIT 283 & US-69" or "I-29 & I-80, EXIT 1B".
+INTERSTATE_EXIT_PATTERN = (
+    r"^\s*I\s*-?\s*(?P<highway>\d+)[^,]*,\s*EXIT\s+(?P<exit>[0-9]+[A-Z]?)"
+)
+
+
+class BaseGeocoder:
+    """Interface shared by the geocoding backends used by geocode_csv."""
+
+    name = "base"
 
-class Geocoder:
-    def __init__(self):
+    def geocode(self, rows: Sequence[dict]) -> List[Optional[Coordinate]]:
+        """Geocodes OPIS CSV rows.
+
+        Args:
+            rows (Sequence[dict]): Rows with "Truckstop Name", "Address",
+                "City" and "State" columns.
+
+        Returns:
+            List[Optional[Coordinate]]: A (latitude, longitude) pair per row,
+            or None where the backend could not resolve the row.
+        """
+        raise NotImplementedError
+
+
+class Geocoder(BaseGeocoder):
+    """Online backend that looks truckstop names up on Nominatim.
+
+    With several workers, requests overlap their network latency while a
+    shared token bucket keeps the overall rate within the provider's limit.
+    """
+
+    name = "online"
+
+    def __init__(
+        self, workers: int = 1, rate: float = NOMINATIM_MAX_REQUESTS_PER_SECOND
+    ):
         self.client = Nominatim(user_agent="fuelstop_geocoder")
+        self.workers = max(1, workers)
+        self.rate_limiter = RateLimiter(rate)
 
-    def fetch(self, truckstop_name: str) -> Optional[Tuple[float, float]]:
+    def geocode(self, rows: Sequence[dict]) -> List[Optional[Coordinate]]:
+        names = [row["Truckstop Name"].strip() for row in rows]
+        if self.workers == 1 or len(names) < 2:
+            return [self.fetch(name) for name in names]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(self.fetch, names))
+
+    def fetch(self, truckstop_name: str) -> Optional[Coordinate]:
         """Fetches the geocode for a given truckstop_name.
 
         Args:
@@ -21,9 +76,161 @@ class Geocoder:
             Optional[Tuple[float, float]]: The geocode for the given truckstop_name, or None if the geocoding fails.
         """
         try:
+            self.rate_limiter.acquire()
             location = self.client.geocode(truckstop_name)
             if location:
-                return location.Latitude, location.Longitude
+                return location.latitude, location.longitude
         except (GeocoderTimedOut, GeocoderServiceError) as e:
             logger.error(f"Geocoding service error for {truckstop_name}: {e}")
         return None
+
+
+class OfflineGeocoder(BaseGeocoder):
+    """Offline backend driven by local reference tables.
+
+    Rows are matched first on interstate and exit number against an exits
+    table, then on city and state against a gazetteer. Both lookups are
+    pandas merges over the whole batch.
+
+    The exits CSV needs highway, exit, state, latitude and longitude columns
+    (highway as "I-44" or "44"). The gazetteer CSV needs city, state,
+    latitude and longitude columns.
+    """
+
+    name = "offline"
+
+    def __init__(
+        self, gazetteer_path: Optional[Path] = None, exits_path: Optional[Path] = None
+    ):
+        if gazetteer_path is None and exits_path is None:
+            raise ValueError("OfflineGeocoder needs a gazetteer or an exits table")
+
+        self.gazetteer = None
+        self.exits = None
+        if gazetteer_path is not None:
+            self.gazetteer = self._load(
+                gazetteer_path, ["city", "state"], self._place_keys
+            )
+        if exits_path is not None:
+            self.exits = self._load(
+                exits_path, ["highway", "exit", "state"], self._exit_keys
+            )
+
+    @staticmethod
+    def _normalize(values: pd.Series) -> pd.Series:
+        return (
+            values.fillna("")
+            .astype(str)
+            .str.upper()
+            .str.replace(r"[^A-Z0-9 ]", "", regex=True)
+            .str.split()
+            .str.join(" ")
+        )
+
+    @classmethod
+    def _place_keys(cls, frame: pd.DataFrame) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "city_key": cls._normalize(frame["city"]),
+                "state_key": cls._normalize(frame["state"]),
+            }
+        )
+
+    @classmethod
+    def _exit_keys(cls, frame: pd.DataFrame) -> pd.DataFrame:
+        highway = frame["highway"].fillna("").astype(str).str.extract(r"(\d+)")[0]
+        return pd.DataFrame(
+            {
+                "highway_key": highway.fillna(""),
+                "exit_key": cls._normalize(frame["exit"]).str.replace(" ", ""),
+                "state_key": cls._normalize(frame["state"]),
+            }
+        )
+
+    @staticmethod
+    def _load(path: Path, columns: List[str], key_builder) -> pd.DataFrame:
+        """Reads a reference CSV into a table of match keys and coordinates."""
+        frame = pd.read_csv(path, dtype=str)
+        frame.columns = [column.strip().lower() for column in frame.columns]
+        missing = set(columns + ["latitude", "longitude"]) - set(frame.columns)
+        if missing:
+            raise ValueError(f"{path} is missing columns: {', '.join(sorted(missing))}")
+
+        table = key_builder(frame)
+        table["latitude"] = pd.to_numeric(frame["latitude"], errors="coerce")
+        table["longitude"] = pd.to_numeric(frame["longitude"], errors="coerce")
+        keys = list(table.columns[:-2])
+        return table.dropna(subset=["latitude", "longitude"]).drop_duplicates(keys)
+
+    def geocode(self, rows: Sequence[dict]) -> List[Optional[Coordinate]]:
+        if not rows:
+            return []
+
+        frame = pd.DataFrame(
+            {
+                "address": [row.get("Address", "") for row in rows],
+                "city": [row.get("City", "") for row in rows],
+                "state": [row.get("State", "") for row in rows],
+            }
+        )
+        latitude = pd.Series(float("nan"), index=frame.index)
+        longitude = pd.Series(float("nan"), index=frame.index)
+
+        if self.exits is not None:
+            parsed = (
+                frame["address"]
+                .fillna("")
+                .str.upper()
+                .str.extract(INTERSTATE_EXIT_PATTERN)
+            )
+            keys = self._exit_keys(parsed.assign(state=frame["state"]))
+            matched = keys.merge(
+                self.exits, how="left", on=["highway_key", "exit_key", "state_key"]
+            )
+            latitude = latitude.fillna(matched["latitude"])
+            longitude = longitude.fillna(matched["longitude"])
+
+        if self.gazetteer is not None:
+            matched = self._place_keys(frame).merge(
+                self.gazetteer, how="left", on=["city_key", "state_key"]
+            )
+            unresolved = latitude.isna()
+            latitude = latitude.where(~unresolved, matched["latitude"])
+            longitude = longitude.where(~unresolved, matched["longitude"])
+
+        return [
+            None if pd.isna(lat) else (float(lat), float(lon))
+            for lat, lon in zip(latitude, longitude)
+        ]
+
+
+class ChainedGeocoder(BaseGeocoder):
+    """Tries each backend in turn on the rows the previous ones left unresolved.
+
+    Counts how many rows each backend resolved in ``resolved``.
+    """
+
+    name = "chain"
+
+    def __init__(self, backends: Sequence[BaseGeocoder]):
+        self.backends = list(backends)
+        self.resolved: Dict[str, int] = Counter()
+
+    def geocode(self, rows: Sequence[dict]) -> List[Optional[Coordinate]]:
+        results: List[Optional[Coordinate]] = [None] * len(rows)
+        pending = list(range(len(rows)))
+
+        for backend in self.backends:
+            if not pending:
+                break
+            coordinates = backend.geocode([rows[i] for i in pending])
+            still_pending = []
+            for i, coordinate in zip(pending, coordinates):
+                if coordinate:
+                    results[i] = coordinate
+                    self.resolved[backend.name] += 1
+                else:
+                    still_pending.append(i)
+            pending = still_pending
+
+        return results
@@ -0,0 +1,65 @@
+from math import floor
+from typing import List, Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """Returns the (longitude, latitude) size in degrees of a geohash cell."""
+    bits = 5 * precision
+    return 360.0 / 2 ** ((bits + 1) // 2), 180.0 / 2 ** (bits // 2)
+
+
+def _cell_index(lon: float, lat: float, precision: int) -> Tuple[int, int]:
+    width, height = cell_size(precision)
+    columns, rows = round(360.0 / width), round(180.0 / height)
+    x = min(max(floor((lon + 180.0) / width), 0), columns - 1)
+    y = min(max(floor((lat + 90.0) / height), 0), rows - 1)
+    return x, y
+
+
+def encode_cell(x: int, y: int, precision: int) -> str:
+    """Encodes a cell given by its column and row indices as a geohash."""
+    bits = 5 * precision
+    lon_bits, lat_bits = (bits + 1) // 2, bits // 2
+    chars = []
+    value = 0
+    for i in range(bits):
+        if i % 2 == 0:
+            lon_bits -= 1
+            bit = (x >> lon_bits) & 1
+        else:
+            lat_bits -= 1
+            bit = (y >> lat_bits) & 1
+        value = (value << 1) | bit
+        if i % 5 == 4:
+            chars.append(BASE32[value])
+            value = 0
+    return "".join(chars)
+
+
+def encode(lon: float, lat: float, precision: int) -> str:
+    """Encodes a point as a geohash, matching PostGIS ST_GeoHash."""
+    return encode_cell(*_cell_index(lon, lat, precision), precision)
+
+
+def cells_covering(
+    min_lon: float, min_lat: float, max_lon: float, max_lat: float, precision: int
+) -> List[str]:
+    """Returns the geohashes of every cell intersecting a bounding box."""
+    min_x, min_y = _cell_index(min_lon, min_lat, precision)
+    max_x, max_y = _cell_index(max_lon, max_lat, precision)
+    return [
+        encode_cell(x, y, precision)
+        for x in range(min_x, max_x + 1)
+        for y in range(min_y, max_y + 1)
+    ]
+
+
+def count_cells_covering(
+    min_lon: float, min_lat: float, max_lon: float, max_lat: float, precision: int
+) -> int:
+    """Counts the cells cells_covering would return without encoding them."""
+    min_x, min_y = _cell_index(min_lon, min_lat, precision)
+    max_x, max_y = _cell_index(max_lon, max_lat, precision)
+    return (max_x - min_x + 1) * (max_y - min_y + 1)
@@ -0,0 +1,216 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+DURATION_BUCKETS_SECONDS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+PHASE_METRIC = "fuel_stops_phase_duration_seconds"
+REQUEST_METRIC = "fuel_stops_request_duration_seconds"
+
+METRIC_HELP = {
+    PHASE_METRIC: "Time spent in an instrumented planning phase.",
+    REQUEST_METRIC: "Time spent serving a request, by URL name.",
+}
+
+# Timings of the request being served, or None outside a request.
+_request_timings: ContextVar[Optional["RequestTimings"]] = ContextVar(
+    "fuel_stops_request_timings", default=None
+)
+
+
+class Histogram:
+    """Thread-safe cumulative latency histogram."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DURATION_BUCKETS_SECONDS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        position = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[position] += 1
+            self.sum += seconds
+            self.count += 1
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        """Returns the cumulative bucket counts, sum and count."""
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative, running = [], 0
+        for bucket_count in counts:
+            running += bucket_count
+            cumulative.append(running)
+        return cumulative, total, count
+
+
+class MetricsRegistry:
+    """Process-local histograms keyed by metric name and labels.
+
+    Each worker process keeps its own registry, so a scrape of /metrics
+    reports the worker that served it, as with an unaggregated Prometheus
+    client.
+    """
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram())
+        histogram.observe(seconds)
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        """Renders every histogram in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted(self._histograms.items())
+
+        lines = []
+        current_name = None
+        for (name, labels), histogram in items:
+            if name != current_name:
+                current_name = name
+                if name in METRIC_HELP:
+                    lines.append(f"# HELP {name} {METRIC_HELP[name]}")
+                lines.append(f"# TYPE {name} histogram")
+
+            cumulative, total, count = histogram.snapshot()
+            bounds = [f"{bound:g}" for bound in histogram.buckets] + ["+Inf"]
+            for bound, bucket_count in zip(bounds, cumulative):
+                bucket_labels = _format_labels(labels + (("le", bound),))
+                lines.append(f"{name}_bucket{bucket_labels} {bucket_count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {total:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Returns the process-wide metrics registry."""
+    return _registry
+
+
+class RequestTimings:
+    """Phase durations collected while serving one request.
+
+    Repeated phases with the same labels, such as one fuel stop lookup per
+    refuel, are summed into a single Server-Timing entry with a call count.
+    """
+
+    def __init__(self):
+        self.phases: Dict[Tuple[str, Tuple[str, ...]], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float, labels: Dict[str, str]):
+        key = (name, tuple(str(value) for value in labels.values()))
+        with self._lock:
+            totals = self.phases.setdefault(key, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += 1
+
+    def server_timing(self, total_seconds: Optional[float] = None) -> str:
+        """Formats the collected phases as a Server-Timing header value."""
+        with self._lock:
+            phases = list(self.phases.items())
+
+        entries = []
+        for (name, label_values), (seconds, calls) in phases:
+            description = " ".join(label_values)
+            if calls > 1:
+                description = f"{description} x{calls}".strip()
+            entry = f"{name};dur={seconds * 1000:.1f}"
+            if description:
+                entry += f';desc="{description}"'
+            entries.append(entry)
+        if total_seconds is not None:
+            entries.append(f"total;dur={total_seconds * 1000:.1f}")
+        return ", ".join(entries)
+
+
+@contextmanager
+def collect_request_timings() -> Iterator[RequestTimings]:
+    """Collects the phases timed in the current context into RequestTimings."""
+    timings = RequestTimings()
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+class Timing:
+    """A running timed() block; labels may be filled in before it ends."""
+
+    __slots__ = ("labels",)
+
+    def __init__(self, labels: Dict[str, str]):
+        self.labels = labels
+
+
+@contextmanager
+def timed(phase: str, **labels) -> Iterator[Timing]:
+    """Times a block as a planning phase.
+
+    The duration is recorded in the phase histogram and, inside a request,
+    added to its Server-Timing header. Labels known only once the block has
+    run, such as a cache outcome, can be set on the yielded Timing.
+
+    Args:
+        phase (str): The phase name, used as the Server-Timing metric name.
+        **labels: Histogram labels for the phase.
+
+    Yields:
+        Timing: Holds the labels recorded when the block exits.
+    """
+    timing = Timing(labels)
+    started = time.perf_counter()
+    try:
+        yield timing
+    finally:
+        seconds = time.perf_counter() - started
+        _registry.observe(PHASE_METRIC, seconds, phase=phase, **timing.labels)
+        request_timings = _request_timings.get()
+        if request_timings is not None:
+            request_timings.add(phase, seconds, timing.labels)
@@ -1,70 +1,253 @@
+import asyncio
 import logging
+import random
+import threading
+import time
+import weakref
+from typing import Optional
 
+import httpx
 import openrouteservice
+import requests
+from asgiref.sync import sync_to_async
 from decouple import config
-from django.core.cache import cache
+from django.conf import settings
+from requests.adapters import HTTPAdapter
 from rest_framework.exceptions import ValidationError
 
+from fuel_stops.constants import ROUTE_CACHE_TIMEOUT
 from fuel_stops.exceptions import ORSException
+from fuel_stops.utils.metrics import timed
+from fuel_stops.utils.polyline import encode_polyline, simplify_coordinates
+from fuel_stops.utils.route_cache import get_route_cache
+from fuel_stops.utils.route_snapping import (
+    SNAP_INDEX_MAX_ENTRIES,
+    closest_snapped_entry,
+    neighbour_snap_keys,
+    snap_cell,
+    snap_index_key,
+    splice_route_ends,
+)
 
 logger = logging.getLogger(__name__)
 
+DIRECTIONS_PATH = "/v2/directions/driving-hgv/geojson"
 
-class OpenRouteServiceClient:
-    def __init__(self):
-        self.client = openrouteservice.Client(key=config("OPENROUTESERVICE_API_KEY"))
+# Statuses the openrouteservice client retries, and its default retry budget.
+ORS_RETRIABLE_STATUSES = (429, 503)
+ORS_RETRY_TIMEOUT_SECONDS = 60
 
-    def get_route(self, origin: tuple, destination: tuple) -> dict:
-        """Fetches the route between two points using OpenRouteService.
+_http_session = None
+_http_session_lock = threading.Lock()
+_async_http_clients = weakref.WeakKeyDictionary()
 
-        Args:
-            origin (tuple): The starting point as a tuple of (longitude, latitude).
-            destination (tuple): The destination point as a tuple of (longitude, latitude).
 
-        Returns:
-            dict: The route data in GeoJSON format.
+def get_http_session() -> requests.Session:
+    """Returns the process-wide keep-alive session used for ORS requests."""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=settings.ORS_HTTP_POOL_SIZE
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _http_session = session
+    return _http_session
+
+
+def reset_http_session():
+    """Drops the process-wide session so the next request opens a new pool.
+
+    Call it in a forked child, which must not reuse its parent's sockets.
+    """
+    global _http_session
+    with _http_session_lock:
+        _http_session = None
+
+
+async def _close_with_loop(http_client):
+    """Closes http_client once its event loop shuts down its async generators.
+
+    asyncio.run, and asgiref's per-call loops under WSGI, finalize suspended
+    async generators before closing the loop, so the client's connections
+    are released with the loop instead of leaking.
+    """
+    try:
+        yield
+    finally:
+        await http_client.aclose()
+
+
+async def get_async_http_client() -> httpx.AsyncClient:
+    """Returns the pooled httpx.AsyncClient for the running event loop.
+
+    Under ASGI the loop, and so the pool, lives as long as the worker. Under
+    WSGI every async request runs in a new loop, and its client is closed
+    when that loop ends.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _async_http_clients.get(loop)
+    if entry is None:
+        http_client = httpx.AsyncClient(
+            base_url=settings.ORS_BASE_URL,
+            timeout=settings.ORS_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.ORS_HTTP_POOL_SIZE,
+                max_keepalive_connections=settings.ORS_HTTP_POOL_SIZE,
+            ),
+        )
+        # The loop only tracks started async generators, and only weakly.
+        closer = _close_with_loop(http_client)
+        await closer.asend(None)
+        entry = _async_http_clients[loop] = (http_client, closer)
+    return entry[0]
+
+
+def ors_retry_delay_seconds(retry: int) -> float:
+    """Returns the jittered backoff before an ORS retry, as openrouteservice does."""
+    return 1.5 ** (retry - 1) * (random.random() + 0.5)
+
+
+def route_cache_key(origin: tuple, destination: tuple) -> str:
+    """Builds the cache key for the route between two (lon, lat) points."""
+    return f"ors_route_{origin[0]:.6f}_{origin[1]:.6f}_to_{destination[0]:.6f}_{destination[1]:.6f}"
+
+
+class BaseOpenRouteServiceClient:
+    """Response parsing and caching shared by the sync and async ORS clients."""
+
+    def _get_cached_route(self, origin: tuple, destination: tuple) -> dict:
+        """Returns the cached simplified route, or None on a miss.
+
+        An exact match on the endpoints is tried first. When
+        ROUTE_CACHE_SNAP_METERS is set, a route cached for endpoints within
+        that distance is reused with its ends spliced onto the requested ones.
+        Exact hits, snapped hits and misses are counted separately.
         """
-        try:
-            cache_key = f"ors_route_{origin[0]:.6f}_{origin[1]:.6f}_to_{destination[0]:.6f}_{destination[1]:.6f}"
-            cached_response = cache.get(cache_key)
+        route_cache = get_route_cache()
+        route = route_cache.get(route_cache_key(origin, destination))
+        if route is not None:
+            route_cache.record("route_exact_hits")
+            return route
 
-            if cached_response is not None:
-                return cached_response
+        snap_meters = settings.ROUTE_CACHE_SNAP_METERS
+        if snap_meters > 0:
+            route = self._get_snapped_route(origin, destination, snap_meters)
+            if route is not None:
+                route_cache.record("route_snapped_hits")
+                return route
 
-            full_geojson = self._fetch_full_route_from_ors(origin, destination)
-            if not full_geojson:
+        route_cache.record("route_misses")
+        return None
+
+    def _get_snapped_route(
+        self, origin: tuple, destination: tuple, snap_meters: float
+    ) -> dict:
+        """Finds a cached route whose endpoints are near the requested ones."""
+        route_cache = get_route_cache()
+        indexed = route_cache.get_many(neighbour_snap_keys(origin, snap_meters))
+        entries = [entry for cell in indexed.values() for entry in cell]
+
+        while entries:
+            entry = closest_snapped_entry(entries, origin, destination, snap_meters)
+            if entry is None:
                 return None
+            route = route_cache.get(entry[2])
+            if route is not None:
+                return splice_route_ends(
+                    route, tuple(entry[0]), tuple(entry[1]), origin, destination
+                )
+            entries.remove(entry)
+        return None
 
-            simplified = self._simplify_geojson(full_geojson)
+    def _cache_route(
+        self, origin: tuple, destination: tuple, full_geojson: dict
+    ) -> dict:
+        """Simplifies a full ORS response and caches the result."""
+        route_cache = get_route_cache()
+        cache_key = route_cache_key(origin, destination)
+        simplified = self._simplify_geojson(full_geojson)
+        route_cache.set(cache_key, simplified, timeout=ROUTE_CACHE_TIMEOUT)
 
-            cache.set(cache_key, simplified, timeout=60 * 60 * 24)
+        snap_meters = settings.ROUTE_CACHE_SNAP_METERS
+        if snap_meters > 0:
+            index_key = snap_index_key(snap_cell(origin, snap_meters), snap_meters)
+            entries = [
+                entry
+                for entry in route_cache.get(index_key) or []
+                if entry[2] != cache_key
+            ]
+            entries.append([list(origin), list(destination), cache_key])
+            route_cache.set(
+                index_key,
+                entries[-SNAP_INDEX_MAX_ENTRIES:],
+                timeout=ROUTE_CACHE_TIMEOUT,
+            )
 
-            return simplified
+        return simplified
 
-        except ORSException as e:
-            logger.error(f"Error fetching route: {e}", exc_info=True)
-            raise ValidationError("Failed to fetch route from OpenRouteService")
+    def get_route_geometry(
+        self,
+        origin: tuple,
+        destination: tuple,
+        route_data: dict,
+        geometry_format: str = "geojson",
+        tolerance: float = 0,
+        precision: int = 5,
+        route_key: Optional[str] = None,
+    ) -> dict:
+        """Returns the route geometry in the requested output format.
 
-    def _fetch_full_route_from_ors(self, origin: tuple, destination: tuple) -> dict:
-        """Fetches the full route from OpenRouteService.
+        Simplified and encoded geometries are cached next to the route, so
+        they are computed once per cache entry rather than per request.
 
         Args:
             origin (tuple): The starting point as a tuple of (longitude, latitude).
             destination (tuple): The destination point as a tuple of (longitude, latitude).
+            route_data (dict): The route returned by get_route.
+            geometry_format (str): One of "geojson", "simplified" or "polyline".
+            tolerance (float): The simplification tolerance in meters.
+            precision (int): The encoded polyline precision, 5 or 6.
+            route_key (str): The cache key of route_data, when it is not the
+                direct route between origin and destination.
 
         Returns:
-            dict: The route data in GeoJSON format.
+            dict: A GeoJSON LineString, or an EncodedPolyline geometry.
         """
-        try:
-            response = self.client.directions(
-                coordinates=[origin, destination],
-                profile="driving-hgv",
-                format="geojson",
-            )
-            return response
-        except Exception as e:
-            logger.error(f"OpenRouteService request failed: {e}")
-            raise ORSException(str(e))
+        geometry = route_data.get("geometry")
+        if geometry_format == "geojson" or not geometry:
+            return geometry
+
+        if geometry_format == "simplified":
+            suffix = f"simplified_{tolerance:g}"
+        else:
+            suffix = f"polyline_{precision}"
+        route_key = route_key or route_cache_key(origin, destination)
+        cache_key = f"{route_key}_geometry_{suffix}"
+
+        route_cache = get_route_cache()
+        cached_geometry = route_cache.get(cache_key)
+        if cached_geometry is not None:
+            return cached_geometry
+
+        if geometry_format == "simplified":
+            formatted = {
+                "type": "LineString",
+                "coordinates": simplify_coordinates(geometry["coordinates"], tolerance),
+            }
+        else:
+            formatted = {
+                "type": "EncodedPolyline",
+                "polyline": encode_polyline(geometry["coordinates"], precision),
+                "precision": precision,
+            }
+
+        route_cache.set(cache_key, formatted, timeout=ROUTE_CACHE_TIMEOUT)
+
+        return formatted
 
     def _simplify_geojson(self, geojson: dict) -> dict:
         """Simplifies the GeoJSON response from OpenRouteService.
@@ -97,3 +280,169 @@ class OpenRouteServiceClient:
         except (KeyError, IndexError, TypeError) as e:
             logger.error(f"Malformed ORS response: missing expected keys - {e}")
             raise ORSException(str(e))
+
+
+class SessionClient(openrouteservice.Client):
+    """openrouteservice.Client that sends its requests through a given session.
+
+    The base client always opens a session of its own; this one closes it
+    and uses the session it was constructed with instead.
+    """
+
+    def __init__(self, session: requests.Session, **kwargs):
+        super().__init__(**kwargs)
+        self._session.close()
+        self._session = session
+
+    @property
+    def session(self) -> requests.Session:
+        return self._session
+
+
+class OpenRouteServiceClient(BaseOpenRouteServiceClient):
+    def __init__(self):
+        # Share one pooled keep-alive session across clients so TLS
+        # connections to ORS are reused between requests.
+        self.client = SessionClient(
+            session=get_http_session(),
+            key=config("OPENROUTESERVICE_API_KEY"),
+            base_url=settings.ORS_BASE_URL,
+            timeout=settings.ORS_TIMEOUT_SECONDS,
+        )
+
+    def get_route(self, origin: tuple, destination: tuple) -> dict:
+        """Fetches the route between two points using OpenRouteService.
+
+        Args:
+            origin (tuple): The starting point as a tuple of (longitude, latitude).
+            destination (tuple): The destination point as a tuple of (longitude, latitude).
+
+        Returns:
+            dict: The route data in GeoJSON format.
+        """
+        try:
+            with timed("ors_get_route", cache="hit") as timing:
+                cached_response = self._get_cached_route(origin, destination)
+
+                if cached_response is not None:
+                    return cached_response
+
+                timing.labels["cache"] = "miss"
+                full_geojson = self._fetch_full_route_from_ors(origin, destination)
+                if not full_geojson:
+                    return None
+
+                return self._cache_route(origin, destination, full_geojson)
+
+        except ORSException as e:
+            logger.error(f"Error fetching route: {e}", exc_info=True)
+            raise ValidationError("Failed to fetch route from OpenRouteService")
+
+    def _fetch_full_route_from_ors(self, origin: tuple, destination: tuple) -> dict:
+        """Fetches the full route from OpenRouteService.
+
+        Args:
+            origin (tuple): The starting point as a tuple of (longitude, latitude).
+            destination (tuple): The destination point as a tuple of (longitude, latitude).
+
+        Returns:
+            dict: The route data in GeoJSON format.
+        """
+        try:
+            response = self.client.directions(
+                coordinates=[origin, destination],
+                profile="driving-hgv",
+                format="geojson",
+            )
+            return response
+        except Exception as e:
+            logger.error(f"OpenRouteService request failed: {e}")
+            raise ORSException(str(e))
+
+
+class AsyncOpenRouteServiceClient(BaseOpenRouteServiceClient):
+    """asyncio variant of OpenRouteServiceClient for async views.
+
+    Requests go through a pooled httpx.AsyncClient per event loop, so many
+    slow ORS calls can be in flight without holding a thread each. Route
+    cache reads and writes block on SQLite and run in worker threads. Like
+    the openrouteservice client, 429 and 503 responses are retried with
+    jittered backoff for up to ORS_RETRY_TIMEOUT_SECONDS.
+    """
+
+    def __init__(self, http_client=None):
+        self.api_key = config("OPENROUTESERVICE_API_KEY")
+        self.http_client = http_client
+
+    async def get_route(self, origin: tuple, destination: tuple) -> dict:
+        """Fetches the route between two points using OpenRouteService.
+
+        Args:
+            origin (tuple): The starting point as a tuple of (longitude, latitude).
+            destination (tuple): The destination point as a tuple of (longitude, latitude).
+
+        Returns:
+            dict: The route data in GeoJSON format.
+        """
+        try:
+            with timed("ors_get_route", cache="hit") as timing:
+                cached_response = await sync_to_async(
+                    self._get_cached_route, thread_sensitive=False
+                )(origin, destination)
+
+                if cached_response is not None:
+                    return cached_response
+
+                timing.labels["cache"] = "miss"
+                full_geojson = await self._fetch_full_route_from_ors(
+                    origin, destination
+                )
+                if not full_geojson:
+                    return None
+
+                return await sync_to_async(self._cache_route, thread_sensitive=False)(
+                    origin, destination, full_geojson
+                )
+
+        except ORSException as e:
+            logger.error(f"Error fetching route: {e}", exc_info=True)
+            raise ValidationError("Failed to fetch route from OpenRouteService")
+
+    async def _fetch_full_route_from_ors(
+        self, origin: tuple, destination: tuple
+    ) -> dict:
+        """Fetches the full route from OpenRouteService.
+
+        Args:
+            origin (tuple): The starting point as a tuple of (longitude, latitude).
+            destination (tuple): The destination point as a tuple of (longitude, latitude).
+
+        Returns:
+            dict: The route data in GeoJSON format.
+        """
+        try:
+            http_client = self.http_client or await get_async_http_client()
+            started = time.monotonic()
+            retry = 0
+            while True:
+                response = await http_client.post(
+                    DIRECTIONS_PATH,
+                    json={"coordinates": [list(origin), list(destination)]},
+                    headers={"Authorization": self.api_key},
+                )
+                if response.status_code not in ORS_RETRIABLE_STATUSES:
+                    break
+                retry += 1
+                delay = ors_retry_delay_seconds(retry)
+                if time.monotonic() - started + delay > ORS_RETRY_TIMEOUT_SECONDS:
+                    break
+                logger.warning(
+                    f"OpenRouteService returned {response.status_code}; "
+                    f"retry {retry} in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"OpenRouteService request failed: {e}")
+            raise ORSException(str(e))
@@ -0,0 +1,82 @@
+from typing import List, Sequence
+
+import numpy as np
+
+from fuel_stops.constants import EARTH_RADIUS_METERS
+
+
+def simplify_coordinates(
+    coordinates: Sequence[Sequence[float]], tolerance: float
+) -> List[List[float]]:
+    """Simplifies a line with the Douglas-Peucker algorithm.
+
+    Coordinates are projected to a local equirectangular frame so the
+    tolerance can be given in meters.
+
+    Args:
+        coordinates (Sequence): The (lon, lat) pairs of the line.
+        tolerance (float): The maximum allowed deviation in meters.
+
+    Returns:
+        List[List[float]]: The retained (lon, lat) pairs, endpoints included.
+    """
+    points = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+    if len(points) < 3 or tolerance <= 0:
+        return points.tolist()
+
+    meters_per_degree = np.radians(1) * EARTH_RADIUS_METERS
+    lons, lats = points[:, 0], points[:, 1]
+
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        # Local frame at the chord's first point, scaled at its mid-latitude
+        # as in RouteModel.project, so distances are meters at any longitude.
+        scale = np.cos(np.radians((lats[first] + lats[last]) / 2)) * meters_per_degree
+        dx = (lons[last] - lons[first]) * scale
+        dy = (lats[last] - lats[first]) * meters_per_degree
+        rel_x = (lons[first + 1 : last] - lons[first]) * scale
+        rel_y = (lats[first + 1 : last] - lats[first]) * meters_per_degree
+        length2 = dx * dx + dy * dy
+        if length2 > 0:
+            distances = np.abs(rel_x * dy - rel_y * dx) / np.sqrt(length2)
+        else:
+            distances = np.hypot(rel_x, rel_y)
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            index = first + 1 + farthest
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+
+    return points[keep].tolist()
+
+
+def encode_polyline(coordinates: Sequence[Sequence[float]], precision: int = 5) -> str:
+    """Encodes (lon, lat) pairs with Google's encoded polyline algorithm.
+
+    Args:
+        coordinates (Sequence): The (lon, lat) pairs of the line.
+        precision (int): Decimal places kept, 5 for Google maps or 6 for OSRM.
+
+    Returns:
+        str: The encoded polyline, in (lat, lon) order as the format requires.
+    """
+    factor = 10**precision
+    chunks = []
+    previous_lat = previous_lon = 0
+    for lon, lat in coordinates:
+        lat_units = int(round(lat * factor))
+        lon_units = int(round(lon * factor))
+        for delta in (lat_units - previous_lat, lon_units - previous_lon):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                chunks.append(chr((0x20 | (value & 0x1F)) + 63))
+                value >>= 5
+            chunks.append(chr(value + 63))
+        previous_lat, previous_lon = lat_units, lon_units
+    return "".join(chunks)
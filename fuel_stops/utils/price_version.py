@@ -0,0 +1,58 @@
+import time
+
+from django.db import transaction
+from django.db.models import F
+
+from fuel_stops.models import FuelPriceVersion
+
+PRICE_VERSION_ID = 1
+
+
+def get_price_version() -> str:
+    """Returns the current fuel price snapshot version.
+
+    The version lives in a single database row, so every worker on every
+    host sees the same value. Until the first price write creates the row,
+    the version is "0"; bumping never issues that value again.
+    """
+    version = (
+        FuelPriceVersion.objects.filter(pk=PRICE_VERSION_ID)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return str(version or 0)
+
+
+def bump_price_version() -> str:
+    """Issues a new price snapshot version after FuelStop rows change.
+
+    Call it inside the transaction writing the prices, so the new version
+    commits or rolls back together with them.
+    """
+    with transaction.atomic():
+        updated = FuelPriceVersion.objects.filter(pk=PRICE_VERSION_ID).update(
+            version=F("version") + 1
+        )
+        if not updated:
+            # Seeded from the clock so a recreated row never reuses a version.
+            FuelPriceVersion.objects.get_or_create(
+                pk=PRICE_VERSION_ID, defaults={"version": time.time_ns()}
+            )
+        return lock_price_version()
+
+
+def lock_price_version() -> str:
+    """Returns the price version, locking it until the transaction ends.
+
+    Price writes wait for the lock, so work done under it, such as
+    building the fuel stop grid, reads one consistent price snapshot.
+    """
+    version = (
+        FuelPriceVersion.objects.select_for_update()
+        .filter(pk=PRICE_VERSION_ID)
+        .values_list("version", flat=True)
+        .first()
+    )
+    if version is None:
+        return bump_price_version()
+    return str(version)
@@ -0,0 +1,420 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+_route_cache = None
+_route_cache_config = None
+_route_cache_lock = threading.Lock()
+
+
+# Tables, indexes and the triggers keeping route_cache_size.bytes equal to
+# SUM(route_cache.size), created idempotently when a connection opens.
+SQLITE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS route_cache ("
+    "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+    "expires_at REAL, accessed_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS route_cache_accessed_at ON route_cache (accessed_at)",
+    "CREATE INDEX IF NOT EXISTS route_cache_expires_at ON route_cache (expires_at)",
+    "CREATE TABLE IF NOT EXISTS route_cache_stats ("
+    "name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS route_cache_size ("
+    "id INTEGER PRIMARY KEY CHECK (id = 1), bytes INTEGER NOT NULL)",
+    # Files written before the running total existed are summed once.
+    "INSERT OR IGNORE INTO route_cache_size (id, bytes) "
+    "SELECT 1, COALESCE(SUM(size), 0) FROM route_cache",
+    "CREATE TRIGGER IF NOT EXISTS route_cache_size_insert AFTER INSERT ON route_cache "
+    "BEGIN UPDATE route_cache_size SET bytes = bytes + NEW.size WHERE id = 1; END",
+    "CREATE TRIGGER IF NOT EXISTS route_cache_size_delete AFTER DELETE ON route_cache "
+    "BEGIN UPDATE route_cache_size SET bytes = bytes - OLD.size WHERE id = 1; END",
+    "CREATE TRIGGER IF NOT EXISTS route_cache_size_update "
+    "AFTER UPDATE OF size ON route_cache BEGIN UPDATE route_cache_size "
+    "SET bytes = bytes - OLD.size + NEW.size WHERE id = 1; END",
+)
+
+
+# Key prefixes of the values sharing the cache, counted separately so each
+# kind gets its own hit rate. Plan keys embed their route's key, so they are
+# matched first; geometry keys are their route's key plus "_geometry_".
+KEY_PREFIXES = (
+    ("fuel_plan_", "plan"),
+    ("ors_snap_", "snap_index"),
+    ("ors_route_", "route"),
+)
+
+
+def key_kind(key: str) -> str:
+    """Returns the kind of value cached under a key, e.g. "route" or "plan"."""
+    for prefix, kind in KEY_PREFIXES:
+        if key.startswith(prefix):
+            if kind == "route" and "_geometry_" in key:
+                return "geometry"
+            return kind
+    return "other"
+
+
+def lookup_counters(found: Iterable[str], missing: Iterable[str]) -> Dict[str, int]:
+    """Counts hits and misses in total and per kind of cached value."""
+    counters: Dict[str, int] = {}
+    for outcome, keys in (("hits", found), ("misses", missing)):
+        for key in keys:
+            for name in (outcome, f"{outcome}_{key_kind(key)}"):
+                counters[name] = counters.get(name, 0) + 1
+    return counters
+
+
+def dumps(value) -> bytes:
+    """Serializes and compresses a cache value."""
+    return zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def loads(data: bytes):
+    """Decompresses and deserializes a cache value."""
+    return pickle.loads(zlib.decompress(data))
+
+
+class BaseRouteCache:
+    """Interface for the pluggable route cache behind OpenRouteServiceClient.
+
+    Backends store compressed values and count hits, misses and evictions,
+    with hits and misses also counted per kind of key (see key_kind).
+    """
+
+    def get(self, key: str):
+        """Returns the cached value for the key, or None on a miss."""
+        raise NotImplementedError
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, object]:
+        """Returns the cached values for the keys that are present."""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set(self, key: str, value, timeout: Optional[int] = None):
+        """Caches a value, expiring after timeout seconds when given."""
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        """Removes a key from the cache."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Removes every entry and resets the counters."""
+        raise NotImplementedError
+
+    def record(self, name: str, amount: int = 1):
+        """Adds to a named counter reported by stats()."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the hit, miss and eviction counters and the cache size."""
+        raise NotImplementedError
+
+
+class SQLiteRouteCache(BaseRouteCache):
+    """Route cache in a SQLite file shared by every worker on the host.
+
+    Entries survive restarts and deploys. Once the compressed values exceed
+    max_bytes, the least recently used entries are evicted. Reads take no
+    write lock in the common case, so workers do not serialize on hits:
+    an entry's access time is only refreshed once it is touch_seconds old,
+    and counters are kept per process and added to the shared totals in
+    the file at most every stats_flush_seconds. Triggers keep a running
+    total of the stored bytes, so eviction never sums the table.
+    """
+
+    def __init__(
+        self,
+        location: Optional[str] = None,
+        max_bytes: int = 256 * 1024 * 1024,
+        touch_seconds: float = 60,
+        stats_flush_seconds: float = 10,
+        **options,
+    ):
+        self.path = (
+            Path(location)
+            if location
+            else Path(settings.BASE_DIR) / "data" / "route_cache.sqlite3"
+        )
+        self.max_bytes = max_bytes
+        self.touch_seconds = touch_seconds
+        self.stats_flush_seconds = stats_flush_seconds
+        self._local = threading.local()
+        self._pending: Dict[str, int] = {}
+        self._pending_lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns this thread's connection, reopening it after a fork."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            if getattr(self._local, "pid", None) not in (None, os.getpid()):
+                # Counts inherited from the parent are the parent's to flush.
+                with self._pending_lock:
+                    self._pending.clear()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                for statement in SQLITE_SCHEMA:
+                    connection.execute(statement)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _increment(self, connection: sqlite3.Connection, name: str, amount: int = 1):
+        connection.execute(
+            "INSERT INTO route_cache_stats (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    def _count(self, name: str, amount: int = 1):
+        self._count_many({name: amount})
+
+    def _count_many(self, counters: Dict[str, int]):
+        """Counts in process, flushing to the file once the interval passed."""
+        with self._pending_lock:
+            for name, amount in counters.items():
+                self._pending[name] = self._pending.get(name, 0) + amount
+            due = time.monotonic() - self._flushed_at >= self.stats_flush_seconds
+        if due:
+            self.flush_stats()
+
+    def flush_stats(self):
+        """Adds this process's pending counters to the shared totals."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            self._flushed_at = time.monotonic()
+        pending = {name: amount for name, amount in pending.items() if amount}
+        if not pending:
+            return
+        connection = self._connection()
+        with connection:
+            for name, amount in pending.items():
+                self._increment(connection, name, amount)
+
+    def _touch(self, connection: sqlite3.Connection, keys: List[str], now: float):
+        if keys:
+            with connection:
+                connection.executemany(
+                    "UPDATE route_cache SET accessed_at = ? WHERE key = ?",
+                    [(now, key) for key in keys],
+                )
+
+    def get(self, key: str):
+        connection = self._connection()
+        now = time.time()
+        row = connection.execute(
+            "SELECT value, expires_at, accessed_at FROM route_cache WHERE key = ?",
+            (key,),
+        ).fetchone()
+
+        if row is None or (row[1] is not None and row[1] <= now):
+            if row is not None:
+                with connection:
+                    connection.execute(
+                        "DELETE FROM route_cache WHERE key = ? AND expires_at <= ?",
+                        (key, now),
+                    )
+            self._count_many(lookup_counters([], [key]))
+            return None
+
+        if now - row[2] >= self.touch_seconds:
+            self._touch(connection, [key], now)
+        self._count_many(lookup_counters([key], []))
+        return loads(row[0])
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, object]:
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        connection = self._connection()
+        now = time.time()
+        rows = connection.execute(
+            "SELECT key, value, accessed_at FROM route_cache WHERE key IN ({}) "
+            "AND (expires_at IS NULL OR expires_at > ?)".format(
+                ", ".join("?" * len(keys))
+            ),
+            (*keys, now),
+        ).fetchall()
+
+        self._touch(
+            connection,
+            [
+                key
+                for key, _, accessed_at in rows
+                if now - accessed_at >= self.touch_seconds
+            ],
+            now,
+        )
+        found = {key for key, _, _ in rows}
+        self._count_many(
+            lookup_counters(found, [key for key in keys if key not in found])
+        )
+
+        return {key: loads(value) for key, value, _ in rows}
+
+    def set(self, key: str, value, timeout: Optional[int] = None):
+        connection = self._connection()
+        data = dumps(value)
+        now = time.time()
+        expires_at = now + timeout if timeout else None
+
+        with connection:
+            connection.execute(
+                "INSERT INTO route_cache (key, value, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET "
+                "value = excluded.value, size = excluded.size, "
+                "expires_at = excluded.expires_at, accessed_at = excluded.accessed_at",
+                (key, data, len(data), expires_at, now),
+            )
+            self._evict(connection, now)
+
+    def _evict(self, connection: sqlite3.Connection, now: float):
+        """Drops expired entries, then least recently used ones over budget."""
+        expired = connection.execute(
+            "DELETE FROM route_cache WHERE expires_at <= ?", (now,)
+        ).rowcount
+        total_bytes = self._total_bytes(connection)
+
+        evicted = 0
+        if total_bytes > self.max_bytes:
+            for key, size in connection.execute(
+                "SELECT key, size FROM route_cache ORDER BY accessed_at"
+            ):
+                if total_bytes <= self.max_bytes:
+                    break
+                connection.execute("DELETE FROM route_cache WHERE key = ?", (key,))
+                total_bytes -= size
+                evicted += 1
+
+        if expired or evicted:
+            self._increment(connection, "evictions", expired + evicted)
+
+    @staticmethod
+    def _total_bytes(connection: sqlite3.Connection) -> int:
+        return connection.execute(
+            "SELECT bytes FROM route_cache_size WHERE id = 1"
+        ).fetchone()[0]
+
+    def delete(self, key: str):
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM route_cache WHERE key = ?", (key,))
+
+    def clear(self):
+        connection = self._connection()
+        with self._pending_lock:
+            self._pending.clear()
+        with connection:
+            connection.execute("DELETE FROM route_cache")
+            connection.execute("DELETE FROM route_cache_stats")
+
+    def record(self, name: str, amount: int = 1):
+        self._count(name, amount)
+
+    def stats(self) -> Dict[str, int]:
+        self.flush_stats()
+        connection = self._connection()
+        counters = dict(
+            connection.execute("SELECT name, value FROM route_cache_stats").fetchall()
+        )
+        entries = connection.execute("SELECT COUNT(*) FROM route_cache").fetchone()[0]
+        return {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            **counters,
+            "entries": entries,
+            "bytes": self._total_bytes(connection),
+            "max_bytes": self.max_bytes,
+        }
+
+
+class DjangoRouteCache(BaseRouteCache):
+    """Route cache on top of a Django cache alias.
+
+    Pointing the alias at a Redis-compatible cache backend shares routes
+    across hosts. The backend handles eviction, so only hits and misses are
+    counted, per process.
+    """
+
+    def __init__(self, location: str = "default", **options):
+        if location not in settings.CACHES:
+            raise ImproperlyConfigured(
+                f"ROUTE_CACHE LOCATION {location!r} is not a CACHES alias; "
+                "DjangoRouteCache needs the name of a configured Django cache."
+            )
+        self.cache = caches[location]
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str, amount: int = 1):
+        self._count_many({name: amount})
+
+    def _count_many(self, counters: Dict[str, int]):
+        with self._lock:
+            for name, amount in counters.items():
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    def get(self, key: str):
+        data = self.cache.get(key)
+        if data is None:
+            self._count_many(lookup_counters([], [key]))
+            return None
+        self._count_many(lookup_counters([key], []))
+        return loads(data)
+
+    def set(self, key: str, value, timeout: Optional[int] = None):
+        self.cache.set(key, dumps(value), timeout=timeout)
+
+    def delete(self, key: str):
+        self.cache.delete(key)
+
+    def clear(self):
+        self.cache.clear()
+        with self._lock:
+            self.counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def record(self, name: str, amount: int = 1):
+        self._count(name, amount)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+
+def get_route_cache() -> BaseRouteCache:
+    """Returns the route cache configured by settings.ROUTE_CACHE."""
+    global _route_cache, _route_cache_config
+    config = dict(settings.ROUTE_CACHE)
+    if _route_cache is None or _route_cache_config != config:
+        with _route_cache_lock:
+            if _route_cache is None or _route_cache_config != config:
+                backend = import_string(config["BACKEND"])
+                options = {
+                    key.lower(): value
+                    for key, value in config.items()
+                    if key != "BACKEND"
+                }
+                # Without a LOCATION each backend uses its own default.
+                if not options.get("location"):
+                    options.pop("location", None)
+                _route_cache = backend(**options)
+                _route_cache_config = config
+    return _route_cache
@@ -0,0 +1,153 @@
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from fuel_stops.constants import EARTH_RADIUS_METERS
+
+# Upper bound on point/segment pairs evaluated at once by project().
+PROJECTION_CHUNK_PAIRS = 2_000_000
+
+
+def haversine_meters_array(lon1, lat1, lon2, lat2) -> np.ndarray:
+    """Vectorized great-circle distance in meters between coordinate arrays."""
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = np.radians(np.asarray(lon2) - np.asarray(lon1))
+    a = np.sin(d_phi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class RouteModel:
+    """Linear-referenced route built from ORS geometry and step distances.
+
+    Holds cumulative distance arrays for the route vertices and the ORS
+    steps so positions along the route can be resolved with searchsorted
+    instead of walking the steps one dict at a time.
+    """
+
+    def __init__(
+        self,
+        coordinates: Sequence[Sequence[float]],
+        step_distances: Optional[Sequence[float]] = None,
+    ):
+        self.coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        lons = self.coordinates[:, 0]
+        lats = self.coordinates[:, 1]
+
+        self.segment_lengths = haversine_meters_array(
+            lons[:-1], lats[:-1], lons[1:], lats[1:]
+        )
+        self.cumulative = np.concatenate(([0.0], np.cumsum(self.segment_lengths)))
+        self.bearings = self._bearings(lons, lats)
+
+        self.step_distances = np.asarray(
+            step_distances if step_distances is not None else [], dtype=float
+        )
+        self.step_ends = np.cumsum(self.step_distances)
+        self.step_starts = self.step_ends - self.step_distances
+
+    @classmethod
+    def from_route_data(cls, route_data: dict) -> "RouteModel":
+        """Builds a model from the simplified route returned by get_route."""
+        geometry = route_data.get("geometry") or {}
+        return cls(
+            geometry.get("coordinates", []),
+            [step["distance"] for step in route_data.get("steps", [])],
+        )
+
+    @property
+    def length(self) -> float:
+        """Length of the route geometry in meters."""
+        return float(self.cumulative[-1]) if len(self.cumulative) else 0.0
+
+    @staticmethod
+    def _bearings(lons: np.ndarray, lats: np.ndarray) -> np.ndarray:
+        """Initial bearing of each segment in degrees clockwise from north."""
+        phi1 = np.radians(lats[:-1])
+        phi2 = np.radians(lats[1:])
+        d_lambda = np.radians(lons[1:] - lons[:-1])
+        y = np.sin(d_lambda) * np.cos(phi2)
+        x = np.cos(phi1) * np.sin(phi2) - np.sin(phi1) * np.cos(phi2) * np.cos(d_lambda)
+        return np.degrees(np.arctan2(y, x)) % 360
+
+    def refuel_step_indices(self, range_meters: float) -> np.ndarray:
+        """Finds the steps at which a full-tank-at-each-refuel truck refuels.
+
+        A refuel happens before step k when the distance driven since the last
+        refuel, including step k, would exceed the range. This mirrors the
+        greedy optimizer's step loop with one searchsorted per refuel.
+
+        Args:
+            range_meters (float): The vehicle range in meters.
+
+        Returns:
+            np.ndarray: Indices of the steps preceded by a refuel.
+        """
+        indices = []
+        base = 0.0
+        previous = -1
+        while True:
+            index = int(np.searchsorted(self.step_ends, base + range_meters, "right"))
+            index = max(index, previous + 1)
+            if index >= len(self.step_ends):
+                break
+            indices.append(index)
+            base = self.step_starts[index]
+            previous = index
+        return np.asarray(indices, dtype=int)
+
+    def interpolate(self, distances) -> np.ndarray:
+        """Returns the (lon, lat) positions at the given distances along the route."""
+        distances = np.clip(np.asarray(distances, dtype=float), 0.0, self.length)
+        lons = np.interp(distances, self.cumulative, self.coordinates[:, 0])
+        lats = np.interp(distances, self.cumulative, self.coordinates[:, 1])
+        return np.column_stack((lons, lats))
+
+    def project(self, points) -> Tuple[np.ndarray, np.ndarray]:
+        """Projects many points onto the route at once.
+
+        Each segment is treated as planar in a local equirectangular frame,
+        which is accurate for the short segments ORS returns.
+
+        Args:
+            points: An (n, 2) array-like of (lon, lat) pairs.
+
+        Returns:
+            tuple: Distances along the route and perpendicular offsets from
+            the route, both in meters.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        if len(self.coordinates) < 2 or not len(points):
+            return np.zeros(len(points)), np.full(len(points), np.inf)
+
+        start = self.coordinates[:-1]
+        end = self.coordinates[1:]
+        scale = np.cos(np.radians((start[:, 1] + end[:, 1]) / 2))
+        meters_per_degree = np.radians(1) * EARTH_RADIUS_METERS
+        seg_x = (end[:, 0] - start[:, 0]) * scale * meters_per_degree
+        seg_y = (end[:, 1] - start[:, 1]) * meters_per_degree
+        seg_len2 = seg_x**2 + seg_y**2
+
+        along = np.empty(len(points))
+        offsets = np.empty(len(points))
+        chunk = max(1, PROJECTION_CHUNK_PAIRS // len(seg_x))
+        for first in range(0, len(points), chunk):
+            block = points[first : first + chunk]
+            rel_x = (block[:, :1] - start[:, 0]) * scale * meters_per_degree
+            rel_y = (block[:, 1:] - start[:, 1]) * meters_per_degree
+            with np.errstate(invalid="ignore", divide="ignore"):
+                t = np.where(
+                    seg_len2 > 0, (rel_x * seg_x + rel_y * seg_y) / seg_len2, 0.0
+                )
+            t = np.clip(t, 0.0, 1.0)
+            dist2 = (rel_x - t * seg_x) ** 2 + (rel_y - t * seg_y) ** 2
+            nearest = np.argmin(dist2, axis=1)
+            rows = np.arange(len(block))
+            along[first : first + chunk] = (
+                self.cumulative[nearest]
+                + t[rows, nearest] * self.segment_lengths[nearest]
+            )
+            offsets[first : first + chunk] = np.sqrt(dist2[rows, nearest])
+
+        return along, offsets
@@ -0,0 +1,119 @@
+from math import ceil, cos, degrees, floor, radians
+from typing import List, Optional, Tuple
+
+from fuel_stops.constants import EARTH_RADIUS_METERS
+from fuel_stops.utils.geo import haversine_meters
+from fuel_stops.utils.spatial_index import MAX_LATITUDE
+
+# Cached routes remembered per origin cell; the oldest are dropped first.
+SNAP_INDEX_MAX_ENTRIES = 50
+
+
+def snap_cell(point: tuple, snap_meters: float) -> Tuple[int, int]:
+    """Quantizes a (lon, lat) point to a grid cell about snap_meters wide."""
+    cell_degrees = degrees(snap_meters / EARTH_RADIUS_METERS)
+    return floor(point[0] / cell_degrees), floor(point[1] / cell_degrees)
+
+
+def snap_index_key(cell: Tuple[int, int], snap_meters: float) -> str:
+    """Builds the cache key of the snap index entry for an origin cell."""
+    return f"ors_snap_{snap_meters:g}_{cell[0]}_{cell[1]}"
+
+
+def neighbour_snap_keys(point: tuple, snap_meters: float) -> List[str]:
+    """Returns the snap index keys of every cell within snap_meters of a point.
+
+    Cells are square in degrees, so they narrow with latitude and more of
+    them are searched east and west to cover the same distance.
+    """
+    cell_degrees = degrees(snap_meters / EARTH_RADIUS_METERS)
+    x, y = snap_cell(point, snap_meters)
+    widest_lat = min(abs(point[1]) + cell_degrees, MAX_LATITUDE)
+    reach_x = ceil(1 / cos(radians(widest_lat)))
+    return [
+        snap_index_key((x + dx, y + dy), snap_meters)
+        for dx in range(-reach_x, reach_x + 1)
+        for dy in (-1, 0, 1)
+    ]
+
+
+def closest_snapped_entry(
+    entries: List[list], origin: tuple, destination: tuple, snap_meters: float
+) -> Optional[list]:
+    """Picks the indexed route whose endpoints are both within snap_meters.
+
+    Args:
+        entries (List[list]): Snap index entries of [origin, destination, key].
+        origin (tuple): The requested origin as (longitude, latitude).
+        destination (tuple): The requested destination as (longitude, latitude).
+        snap_meters (float): The maximum distance between matching endpoints.
+
+    Returns:
+        Optional[list]: The entry with the smallest combined endpoint distance.
+    """
+    best = None
+    best_distance = None
+    for entry in entries:
+        origin_gap = haversine_meters(*origin, *entry[0])
+        destination_gap = haversine_meters(*destination, *entry[1])
+        if origin_gap > snap_meters or destination_gap > snap_meters:
+            continue
+        if best is None or origin_gap + destination_gap < best_distance:
+            best = entry
+            best_distance = origin_gap + destination_gap
+    return best
+
+
+def splice_route_ends(
+    route: dict,
+    cached_origin: tuple,
+    cached_destination: tuple,
+    origin: tuple,
+    destination: tuple,
+) -> dict:
+    """Adapts a cached route to nearby endpoints.
+
+    A straight stub is added at each end, joining the requested endpoint to
+    the cached one. Its length is added to the first and last steps and to
+    the totals. Its duration uses the route's average speed.
+
+    Args:
+        route (dict): The simplified route cached for the nearby endpoints.
+        cached_origin (tuple): The origin the route was fetched for.
+        cached_destination (tuple): The destination the route was fetched for.
+        origin (tuple): The requested origin as (longitude, latitude).
+        destination (tuple): The requested destination as (longitude, latitude).
+
+    Returns:
+        dict: A copy of the route running between the requested endpoints.
+    """
+    head = haversine_meters(*origin, *cached_origin)
+    tail = haversine_meters(*cached_destination, *destination)
+    total_distance = route.get("total_distance") or 0
+    seconds_per_meter = (
+        route.get("total_duration", 0) / total_distance if total_distance else 0
+    )
+
+    steps = [dict(step) for step in route.get("steps", [])]
+    if steps:
+        steps[0]["distance"] += head
+        steps[0]["duration"] += head * seconds_per_meter
+        steps[-1]["distance"] += tail
+        steps[-1]["duration"] += tail * seconds_per_meter
+
+    spliced = dict(route, steps=steps)
+    spliced["total_distance"] = total_distance + head + tail
+    spliced["total_duration"] = (
+        route.get("total_duration", 0) + (head + tail) * seconds_per_meter
+    )
+
+    geometry = route.get("geometry")
+    if geometry and geometry.get("coordinates"):
+        coordinates = list(geometry["coordinates"])
+        if head > 0:
+            coordinates.insert(0, list(origin))
+        if tail > 0:
+            coordinates.append(list(destination))
+        spliced["geometry"] = dict(geometry, coordinates=coordinates)
+
+    return spliced
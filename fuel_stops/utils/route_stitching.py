@@ -0,0 +1,44 @@
+from typing import List
+
+
+def stitch_routes(legs: List[dict]) -> dict:
+    """Joins consecutive leg routes into one route.
+
+    Steps are concatenated in order, so step distances stay linear-referenced
+    from the start of the first leg. Where a leg starts on the vertex the
+    previous leg ended on, the repeated vertex is dropped from the geometry.
+
+    Args:
+        legs (List[dict]): The simplified routes returned by get_route, in
+            travel order.
+
+    Returns:
+        dict: A simplified route covering every leg, with per-leg totals
+        under "legs".
+    """
+    if len(legs) == 1:
+        return legs[0]
+
+    steps = []
+    coordinates = []
+    leg_summaries = []
+    for leg in legs:
+        steps.extend(leg.get("steps", []))
+        leg_coordinates = (leg.get("geometry") or {}).get("coordinates", [])
+        if coordinates and leg_coordinates and coordinates[-1] == leg_coordinates[0]:
+            leg_coordinates = leg_coordinates[1:]
+        coordinates.extend(leg_coordinates)
+        leg_summaries.append(
+            {
+                "total_distance": leg.get("total_distance", 0),
+                "total_duration": leg.get("total_duration", 0),
+            }
+        )
+
+    return {
+        "total_distance": sum(leg["total_distance"] for leg in leg_summaries),
+        "total_duration": sum(leg["total_duration"] for leg in leg_summaries),
+        "steps": steps,
+        "geometry": {"type": "LineString", "coordinates": coordinates},
+        "legs": leg_summaries,
+    }
@@ -0,0 +1,202 @@
+import copy
+import logging
+import threading
+from collections import defaultdict
+from math import ceil, cos, degrees, floor, radians
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from fuel_stops.constants import EARTH_RADIUS_METERS
+from fuel_stops.models import FuelStop
+from fuel_stops.utils.geo import haversine_meters
+from fuel_stops.utils.price_version import get_price_version
+from fuel_stops.utils.route_model import (
+    PROJECTION_CHUNK_PAIRS,
+    RouteModel,
+    haversine_meters_array,
+)
+
+logger = logging.getLogger(__name__)
+
+# Latitude used to bound longitude spans near the poles.
+MAX_LATITUDE = 89.9
+
+_index = None
+_index_version = None
+_index_lock = threading.Lock()
+
+
+class FuelStopSpatialIndex:
+    """In-memory uniform lon/lat grid of fuel stops.
+
+    Each cell keeps its stops sorted by price, so a cheapest-within-radius
+    query only scans the cells overlapping the search circle and stops
+    reading a cell as soon as it can no longer beat the best match found.
+    """
+
+    def __init__(self, fuel_stops: Iterable[FuelStop], cell_degrees: float = 1.0):
+        self.cell_degrees = cell_degrees
+        self.cells: Dict[Tuple[int, int], List[tuple]] = defaultdict(list)
+        self.size = 0
+
+        for fuel_stop in fuel_stops:
+            lon, lat = fuel_stop.point.x, fuel_stop.point.y
+            self.cells[self._cell(lon, lat)].append(
+                (fuel_stop.retail_price, fuel_stop.pk or 0, lon, lat, fuel_stop)
+            )
+            self.size += 1
+
+        for entries in self.cells.values():
+            entries.sort(key=lambda entry: (entry[0], entry[1]))
+
+    @classmethod
+    def from_database(cls, cell_degrees: float = 1.0) -> "FuelStopSpatialIndex":
+        """Builds an index over every FuelStop row."""
+        fuel_stops = FuelStop.objects.only(
+            "id", "truckstop_name", "retail_price", "point"
+        ).iterator()
+        return cls(fuel_stops, cell_degrees=cell_degrees)
+
+    def _cell(self, lon: float, lat: float) -> Tuple[int, int]:
+        return floor(lon / self.cell_degrees), floor(lat / self.cell_degrees)
+
+    def cheapest_within(self, point: tuple, within: float) -> Optional[FuelStop]:
+        """Finds the cheapest fuel stop within a radius of the given point.
+
+        Distances are great-circle distances, which agree with the PostGIS
+        geography lookup to within a fraction of a percent.
+
+        Args:
+            point (tuple): The search centre as (longitude, latitude).
+            within (float): The search radius in meters.
+
+        Returns:
+            Optional[FuelStop]: The cheapest fuel stop in range, or None.
+        """
+        lon, lat = point
+        lat_delta = degrees(within / EARTH_RADIUS_METERS)
+        widest_lat = min(abs(lat) + lat_delta, MAX_LATITUDE)
+        lon_delta = min(lat_delta / cos(radians(widest_lat)), 180.0)
+
+        min_x, min_y = self._cell(lon - lon_delta, lat - lat_delta)
+        max_x, max_y = self._cell(lon + lon_delta, lat + lat_delta)
+
+        best = None
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                for entry in self.cells.get((x, y), ()):
+                    if best is not None and (entry[0], entry[1]) >= (
+                        best[0],
+                        best[1],
+                    ):
+                        break
+                    if haversine_meters(lon, lat, entry[2], entry[3]) <= within:
+                        best = entry
+                        break
+
+        return best[4] if best else None
+
+    def near_route(self, route_model: RouteModel, within: float) -> List[FuelStop]:
+        """Finds every fuel stop within a distance of the route.
+
+        The cells around the route are gathered with array operations and the
+        stops in them are projected onto the route in one batch.
+
+        Args:
+            route_model (RouteModel): The route to search along.
+            within (float): The corridor half-width in meters.
+
+        Returns:
+            List[FuelStop]: Copies of the matching stops, annotated with
+            ``distance_along`` and ordered along the route.
+        """
+        if not len(route_model.coordinates):
+            return []
+
+        cell_meters = radians(self.cell_degrees) * EARTH_RADIUS_METERS
+        samples = route_model.interpolate(
+            np.arange(0.0, route_model.length + cell_meters, cell_meters / 2)
+        )
+        lat_delta = degrees(within / EARTH_RADIUS_METERS)
+        widest_lat = min(float(np.abs(samples[:, 1]).max()) + lat_delta, MAX_LATITUDE)
+        lon_delta = lat_delta / cos(radians(widest_lat))
+        reach_x = ceil(lon_delta / self.cell_degrees)
+        reach_y = ceil(lat_delta / self.cell_degrees)
+
+        base_cells = np.unique(
+            np.floor(samples / self.cell_degrees).astype(int), axis=0
+        )
+        offsets = np.array(
+            [
+                (dx, dy)
+                for dx in range(-reach_x, reach_x + 1)
+                for dy in range(-reach_y, reach_y + 1)
+            ]
+        )
+        cells = np.unique(
+            (base_cells[:, None, :] + offsets[None, :, :]).reshape(-1, 2), axis=0
+        )
+
+        entries = [
+            entry for x, y in cells for entry in self.cells.get((int(x), int(y)), ())
+        ]
+        if not entries:
+            return []
+
+        # Cheap prefilter against route samples spaced about one corridor
+        # width apart before the exact projection onto every segment.
+        spacing = max(within, 1000.0)
+        probes = route_model.interpolate(
+            np.arange(0.0, route_model.length + spacing, spacing)
+        )
+        positions = np.array([(entry[2], entry[3]) for entry in entries])
+        nearest_probe = np.empty(len(entries))
+        chunk = max(1, PROJECTION_CHUNK_PAIRS // len(probes))
+        for first in range(0, len(entries), chunk):
+            block = positions[first : first + chunk]
+            nearest_probe[first : first + chunk] = haversine_meters_array(
+                block[:, :1], block[:, 1:], probes[:, 0], probes[:, 1]
+            ).min(axis=1)
+        keep = np.flatnonzero(nearest_probe <= within + spacing)
+        if not len(keep):
+            return []
+
+        entries = [entries[i] for i in keep]
+        along, offsets_m = route_model.project(positions[keep])
+        candidates = []
+        for entry, distance_along, offset in zip(entries, along, offsets_m):
+            if offset <= within:
+                candidate = copy.copy(entry[4])
+                candidate.distance_along = float(distance_along)
+                candidates.append(candidate)
+        candidates.sort(key=lambda candidate: candidate.distance_along)
+        return candidates
+
+
+def get_spatial_index() -> FuelStopSpatialIndex:
+    """Returns the process-wide fuel stop index.
+
+    The index is built on first use and rebuilt once the fuel price version
+    changes, so it never answers from stale rows.
+    """
+    global _index, _index_version
+    version = get_price_version()
+    if _index is None or _index_version != version:
+        with _index_lock:
+            if _index is None or _index_version != version:
+                _index = FuelStopSpatialIndex.from_database(
+                    cell_degrees=settings.FUEL_STOP_INDEX_CELL_DEGREES
+                )
+                _index_version = version
+                logger.info(f"Built fuel stop spatial index with {_index.size} stops")
+    return _index
+
+
+def reset_spatial_index():
+    """Drops the process-wide index so the next lookup rebuilds it."""
+    global _index, _index_version
+    with _index_lock:
+        _index = None
+        _index_version = None
@@ -0,0 +1,234 @@
+import random
+from decimal import Decimal
+from typing import List, Optional, Tuple
+
+import numpy as np
+from django.contrib.gis.geos import Point
+
+from fuel_stops.constants import EARTH_RADIUS_METERS, MILES_TO_METERS
+from fuel_stops.models import FuelStop
+from fuel_stops.utils.route_model import haversine_meters_array
+
+# Bounding box of the contiguous United States as (min_lon, min_lat, max_lon, max_lat).
+CONTIGUOUS_US_BBOX = (-124.0, 25.0, -67.0, 49.0)
+
+# Average driving speed used for synthetic step durations.
+SYNTHETIC_SPEED_METERS_PER_SECOND = 25.0
+
+
+def synthetic_fuel_stops(
+    count: int,
+    seed: int = 0,
+    bbox: Tuple[float, float, float, float] = CONTIGUOUS_US_BBOX,
+    min_price: Decimal = Decimal("3.000"),
+    max_price: Decimal = Decimal("5.000"),
+) -> List[FuelStop]:
+    """Generates unsaved fuel stops scattered uniformly over a bounding box.
+
+    Stops get sequential primary keys so they can be indexed without a
+    database.
+
+    Args:
+        count (int): The number of fuel stops to generate.
+        seed (int): The random seed.
+        bbox (tuple): (min_lon, min_lat, max_lon, max_lat) to scatter over.
+        min_price (Decimal): The lowest retail price.
+        max_price (Decimal): The highest retail price.
+
+    Returns:
+        List[FuelStop]: The generated fuel stops.
+    """
+    rng = np.random.default_rng(seed)
+    min_lon, min_lat, max_lon, max_lat = bbox
+    lons = rng.uniform(min_lon, max_lon, count).tolist()
+    lats = rng.uniform(min_lat, max_lat, count).tolist()
+    mills = rng.integers(
+        int(min_price * 1000), int(max_price * 1000), count, endpoint=True
+    ).tolist()
+
+    return [
+        FuelStop(
+            id=pk,
+            opis_truckstop=pk,
+            truckstop_name=f"Synthetic Stop {pk}",
+            address=f"{pk} Synthetic Rd",
+            city="Synthetic",
+            state="US",
+            rack_id=pk,
+            retail_price=Decimal(price) / 1000,
+            point=Point(lon, lat, srid=4326),
+        )
+        for pk, lon, lat, price in zip(range(1, count + 1), lons, lats, mills)
+    ]
+
+
+def synthetic_route_coordinates(
+    miles: float,
+    vertices: int,
+    seed: int = 0,
+    bbox: Tuple[float, float, float, float] = CONTIGUOUS_US_BBOX,
+) -> np.ndarray:
+    """Generates a meandering route of roughly the given length.
+
+    The route is a random walk with a slowly drifting heading that bounces
+    off the edges of the bounding box, so long routes stay over land where
+    synthetic fuel stops are scattered.
+
+    Args:
+        miles (float): The approximate route length in miles.
+        vertices (int): The number of route vertices.
+        seed (int): The random seed.
+        bbox (tuple): (min_lon, min_lat, max_lon, max_lat) to stay within.
+
+    Returns:
+        np.ndarray: A (vertices, 2) array of (longitude, latitude) pairs.
+    """
+    rng = np.random.default_rng(seed)
+    min_lon, min_lat, max_lon, max_lat = bbox
+    segment_degrees = np.degrees(
+        miles * MILES_TO_METERS / max(vertices - 1, 1) / EARTH_RADIUS_METERS
+    )
+    headings = rng.uniform(0, 2 * np.pi) + np.cumsum(
+        rng.normal(0, 0.05, max(vertices - 1, 0))
+    )
+
+    coordinates = np.empty((vertices, 2))
+    lon = rng.uniform(min_lon + 5, max_lon - 5)
+    lat = rng.uniform(min_lat + 5, max_lat - 5)
+    coordinates[0] = lon, lat
+    for index, heading in enumerate(headings, start=1):
+        lon += segment_degrees * np.cos(heading) / np.cos(np.radians(lat))
+        lat += segment_degrees * np.sin(heading)
+        if not min_lon <= lon <= max_lon:
+            lon = min(max(lon, min_lon), max_lon)
+            headings[index:] = np.pi - headings[index:]
+        if not min_lat <= lat <= max_lat:
+            lat = min(max(lat, min_lat), max_lat)
+            headings[index:] = -headings[index:]
+        coordinates[index] = lon, lat
+    return coordinates
+
+
+def route_coordinates_between(
+    origin: tuple, destination: tuple, vertices: int, seed: int = 0
+) -> np.ndarray:
+    """Generates a gently winding route between two (lon, lat) points.
+
+    Vertices follow the straight line between the endpoints with a smooth
+    sideways sway, so the route starts and ends exactly at the endpoints.
+
+    Args:
+        origin (tuple): The start as (longitude, latitude).
+        destination (tuple): The end as (longitude, latitude).
+        vertices (int): The number of route vertices, at least 2.
+        seed (int): The random seed.
+
+    Returns:
+        np.ndarray: A (vertices, 2) array of (longitude, latitude) pairs.
+    """
+    rng = np.random.default_rng(seed)
+    start = np.asarray(origin, dtype=float)
+    delta = np.asarray(destination, dtype=float) - start
+    fractions = np.linspace(0.0, 1.0, max(vertices, 2))
+
+    normal = np.array([-delta[1], delta[0]])
+    sway = np.sin(np.pi * fractions * rng.integers(1, 4)) * rng.uniform(0.02, 0.08)
+    return start + np.outer(fractions, delta) + np.outer(sway, normal)
+
+
+def ors_response_from_coordinates(
+    coordinates: np.ndarray, steps: int, seed: int = 0
+) -> dict:
+    """Wraps route coordinates in an ORS directions GeoJSON response.
+
+    The response has the same shape as ``client.directions(format="geojson")``
+    so it can be fed to _simplify_geojson and the route cache.
+
+    Args:
+        coordinates (np.ndarray): A (vertices, 2) array of (lon, lat) pairs.
+        steps (int): The number of ORS steps to split the route into, at
+            most vertices - 1.
+        seed (int): The random seed for the step boundaries.
+
+    Returns:
+        dict: The ORS GeoJSON FeatureCollection.
+    """
+    vertices = len(coordinates)
+    steps = max(1, min(steps, vertices - 1))
+    segment_lengths = haversine_meters_array(
+        coordinates[:-1, 0], coordinates[:-1, 1], coordinates[1:, 0], coordinates[1:, 1]
+    )
+    cumulative = np.concatenate(([0.0], np.cumsum(segment_lengths)))
+
+    rng = random.Random(seed)
+    boundaries = sorted(rng.sample(range(1, vertices - 1), steps - 1))
+    way_points = list(zip([0] + boundaries, boundaries + [vertices - 1]))
+
+    ors_steps = []
+    for number, (first, last) in enumerate(way_points):
+        distance = float(cumulative[last] - cumulative[first])
+        ors_steps.append(
+            {
+                "distance": round(distance, 1),
+                "duration": round(distance / SYNTHETIC_SPEED_METERS_PER_SECOND, 1),
+                "type": 6 if number < steps - 1 else 10,
+                "instruction": f"Continue on Synthetic Route {number}",
+                "name": f"Synthetic Route {number}",
+                "way_points": [first, last],
+            }
+        )
+
+    total_distance = round(float(cumulative[-1]), 1)
+    total_duration = round(total_distance / SYNTHETIC_SPEED_METERS_PER_SECOND, 1)
+    bbox = [*coordinates.min(axis=0).tolist(), *coordinates.max(axis=0).tolist()]
+    return {
+        "type": "FeatureCollection",
+        "bbox": bbox,
+        "features": [
+            {
+                "type": "Feature",
+                "bbox": bbox,
+                "properties": {
+                    "segments": [
+                        {
+                            "distance": total_distance,
+                            "duration": total_duration,
+                            "steps": ors_steps,
+                        }
+                    ],
+                    "summary": {
+                        "distance": total_distance,
+                        "duration": total_duration,
+                    },
+                    "way_points": [0, vertices - 1],
+                },
+                "geometry": {
+                    "type": "LineString",
+                    "coordinates": np.round(coordinates, 6).tolist(),
+                },
+            }
+        ],
+    }
+
+
+def synthetic_ors_response(
+    miles: float,
+    steps: int,
+    seed: int = 0,
+    vertices: Optional[int] = None,
+) -> dict:
+    """Generates an ORS directions GeoJSON response for a synthetic route.
+
+    Args:
+        miles (float): The approximate route length in miles.
+        steps (int): The number of ORS steps to split the route into.
+        seed (int): The random seed.
+        vertices (int): The number of route vertices, ten per mile and at
+            least one per step by default.
+
+    Returns:
+        dict: The ORS GeoJSON FeatureCollection.
+    """
+    vertices = vertices or max(int(miles * 10), steps + 1)
+    coordinates = synthetic_route_coordinates(miles, vertices, seed=seed)
+    return ors_response_from_coordinates(coordinates, steps, seed=seed)
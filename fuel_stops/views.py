@@ -1,48 +1,117 @@
+import json
 import logging
-from decimal import Decimal
+import time
+from typing import Iterable
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
-from fuel_stops.constants import MPG, VEHICLE_RANGE_MILES
-from fuel_stops.serializers import OptimalFuelStopRouteSerializer
-from fuel_stops.services.route_optimizer_service import RouteOptimizerService
-from fuel_stops.utils.open_route_service import OpenRouteServiceClient
+from fuel_stops.constants import ROUTE_CACHE_TIMEOUT
+from fuel_stops.renderers import NDJSONRenderer, get_json_renderer_class
+from fuel_stops.serializers import (
+    OptimalFuelStopRouteSerializer,
+    VehicleSweepSerializer,
+)
+from fuel_stops.services.trip_planner_service import (
+    BatchTripPlannerService,
+    TripPlannerService,
+    plan_etag,
+)
+from fuel_stops.services.vehicle_sweep_service import VehicleSweepService
+from fuel_stops.utils.metrics import get_metrics_registry
+from fuel_stops.utils.open_route_service import (
+    AsyncOpenRouteServiceClient,
+    OpenRouteServiceClient,
+)
+from fuel_stops.utils.price_version import get_price_version
 
 logger = logging.getLogger(__name__)
 
 
+def ndjson_response(records: Iterable[dict]) -> StreamingHttpResponse:
+    """Streams records as NDJSON, ending with an error record on failure."""
+
+    def lines():
+        try:
+            yield from records
+        except ValidationError as e:
+            logger.error(f"Error optimizing fuel stops mid-stream: {e}")
+            yield {"type": "error", "error": "Route optimization failed"}
+
+    renderer = NDJSONRenderer()
+    response = StreamingHttpResponse(
+        renderer.iter_lines(lines()), content_type=renderer.media_type
+    )
+    # Ask nginx-style proxies to pass lines through as they are produced.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 class OptimalFuelStopRouteAPIView(APIView):
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
+
+    def get(self, request):
+        """Cacheable variant of post taking the trip as query parameters.
+
+        The strong ETag covers the route, the plan options and the price
+        version, so a matching If-None-Match is answered with 304 without
+        planning.
+        """
+        serializer = OptimalFuelStopRouteSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        validated_data = serializer.validated_data
+        price_version = get_price_version()
+        etag = plan_etag(
+            validated_data, price_version, request.accepted_renderer.format
+        )
+
+        # If-None-Match uses the weak comparison, so W/ prefixes are ignored.
+        if_none_match = {
+            tag.removeprefix("W/")
+            for tag in parse_etags(request.headers.get("If-None-Match", ""))
+        }
+        if etag in if_none_match or "*" in if_none_match:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            try:
+                planner = TripPlannerService(OpenRouteServiceClient())
+                plan = planner.plan_trip(validated_data, price_version)
+            except ValidationError as e:
+                logger.error(f"Error optimizing fuel stops: {e}")
+                return Response(
+                    {"error": "Route optimization failed"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+            response = Response(plan, status=status.HTTP_200_OK)
+
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=ROUTE_CACHE_TIMEOUT)
+        patch_vary_headers(response, ["Accept"])
+        return response
+
     def post(self, request):
         serializer = OptimalFuelStopRouteSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
         validated_data = serializer.validated_data
-        start_lon = validated_data["start_lon"]
-        start_lat = validated_data["start_lat"]
-        end_lon = validated_data["end_lon"]
-        end_lat = validated_data["end_lat"]
 
         try:
-            ors_client = OpenRouteServiceClient()
-            route_data = ors_client.get_route(
-                (start_lon, start_lat), (end_lon, end_lat)
-            )
-
-            optimizer = RouteOptimizerService(
-                start=(start_lon, start_lat),
-                steps=route_data.get("steps", []),
-                vehicle_range_miles=VEHICLE_RANGE_MILES,
-                mpg=MPG,
-            )
-            fuel_stops, total_cost = optimizer.compute_optimal_stops()
-
-            map_data = optimizer.generate_map_geojson(
-                route_data.get("geometry"), fuel_stops
-            )
+            planner = TripPlannerService(OpenRouteServiceClient())
+            if isinstance(request.accepted_renderer, NDJSONRenderer):
+                route_data = planner.fetch_route(validated_data)
+                return ndjson_response(planner.iter_plan(validated_data, route_data))
+            plan = planner.plan_trip(validated_data)
         except ValidationError as e:
             logger.error(f"Error optimizing fuel stops: {e}")
             return Response(
@@ -50,11 +119,143 @@ class OptimalFuelStopRouteAPIView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+        return Response(plan, status=status.HTTP_200_OK)
+
+
+class OptimalFuelStopRouteBatchAPIView(APIView):
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
+
+    def post(self, request):
+        serializer = OptimalFuelStopRouteSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=settings.FUEL_STOPS_BATCH_MAX_TRIPS,
+        )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        started = time.perf_counter()
+        batch_planner = BatchTripPlannerService(
+            client_factory=OpenRouteServiceClient,
+            concurrency=settings.FUEL_STOPS_BATCH_CONCURRENCY,
+        )
+        if isinstance(request.accepted_renderer, NDJSONRenderer):
+            return ndjson_response(
+                self.iter_records(batch_planner, serializer.validated_data, started)
+            )
+        results = batch_planner.plan(serializer.validated_data)
+
         return Response(
             {
-                "total_cost": total_cost.quantize(Decimal("0.00")),
-                "fuel_stops": fuel_stops,
-                "map_data": map_data,
+                "results": results,
+                "total_ms": round((time.perf_counter() - started) * 1000, 3),
             },
             status=status.HTTP_200_OK,
         )
+
+    @staticmethod
+    def iter_records(batch_planner, trips, started):
+        for entry in batch_planner.iter_results(trips):
+            yield {"type": "result", **entry}
+        yield {
+            "type": "total",
+            "total_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+
+
+class VehicleSweepAPIView(APIView):
+    def post(self, request):
+        """Plans one trip for every vehicle profile in the request.
+
+        The route and its candidate stations are fetched once, and all
+        profiles are evaluated against them in a single pass.
+        """
+        serializer = VehicleSweepSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        validated_data = serializer.validated_data
+
+        try:
+            sweep = VehicleSweepService(OpenRouteServiceClient()).sweep(
+                validated_data, validated_data["profiles"]
+            )
+        except ValidationError as e:
+            logger.error(f"Error sweeping vehicle profiles: {e}")
+            return Response(
+                {"error": "Route optimization failed"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        return Response(sweep, status=status.HTTP_200_OK)
+
+
+async def optimal_fuel_stop_route_async(request):
+    """Async variant of OptimalFuelStopRouteAPIView.post for ASGI servers.
+
+    The ORS call is awaited on the pooled async HTTP client, while planning
+    and every route cache access run in worker threads.
+    """
+    if request.method != "POST":
+        return JsonResponse(
+            {"error": "Method not allowed."},
+            status=status.HTTP_405_METHOD_NOT_ALLOWED,
+        )
+
+    try:
+        data = json.loads(request.body or b"{}")
+    except json.JSONDecodeError:
+        return JsonResponse(
+            {"error": "Request body must be valid JSON."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    serializer = OptimalFuelStopRouteSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    validated_data = serializer.validated_data
+
+    try:
+        ors_client = AsyncOpenRouteServiceClient()
+        planner = TripPlannerService(ors_client)
+        price_version = await sync_to_async(get_price_version)()
+        # Route cache reads and writes block on SQLite, so they run in
+        # worker threads like planning does.
+        plan = await sync_to_async(planner.get_cached_plan, thread_sensitive=False)(
+            validated_data, price_version
+        )
+
+        if plan is None:
+            route_data = await planner.fetch_route_async(validated_data)
+
+            plan = await sync_to_async(planner.plan)(validated_data, route_data)
+            await sync_to_async(planner.cache_plan, thread_sensitive=False)(
+                validated_data, plan, price_version
+            )
+    except ValidationError as e:
+        logger.error(f"Error optimizing fuel stops: {e}")
+        return JsonResponse(
+            {"error": "Route optimization failed"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    renderer = get_json_renderer_class()()
+    return HttpResponse(
+        renderer.render(plan),
+        content_type=renderer.media_type,
+        status=status.HTTP_200_OK,
+    )
+
+
+# Django 3.2's csrf_exempt decorator is not async-aware.
+optimal_fuel_stop_route_async.csrf_exempt = True
+
+
+def metrics(request):
+    """Exposes the phase and request latency histograms for Prometheus."""
+    return HttpResponse(
+        get_metrics_registry().render_prometheus(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )